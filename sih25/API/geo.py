@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Geospatial helpers for ARGO tools
+Batch great-circle distance kernels used for radius filtering
+"""
+
+import logging
+from math import radians, cos
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Optional Numba acceleration - falls back to NumPy when not installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.0
+
+# Hops shorter than this (|dlat| + |dlon|, ~600 km) use the equirectangular distance,
+# within 0.5% of haversine at ARGO drift scales
+_SHORT_ARC_RAD = 0.1
+
+# Margins for the cheap equirectangular pre-check; points between them get full haversine
+_INNER_MARGIN = 0.9
+_OUTER_MARGIN = 1.1
+
+
+def _haversine_mask_loop(lons, lats, lon0, lat0, radius_km):
+    """Scalar-loop haversine radius test, compiled by Numba when available"""
+    n = lons.size
+    out = np.empty(n, np.bool_)
+    lon0_r = np.radians(lon0)
+    lat0_r = np.radians(lat0)
+    cos_lat0 = np.cos(lat0_r)
+    for i in range(n):
+        lat_r = np.radians(lats[i])
+        dlat = lat_r - lat0_r
+        dlon = np.radians(lons[i]) - lon0_r
+        a = np.sin(dlat / 2) ** 2 + cos_lat0 * np.cos(lat_r) * np.sin(dlon / 2) ** 2
+        out[i] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)) <= radius_km
+    return out
+
+
+def _haversine_mask_numpy(lons, lats, lon0, lat0, radius_km):
+    """Vectorized NumPy haversine radius test"""
+    lat0_r = np.radians(lat0)
+    lat_r = np.radians(lats)
+    dlat = lat_r - lat0_r
+    dlon = np.radians(lons) - np.radians(lon0)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat0_r) * np.cos(lat_r) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)) <= radius_km
+
+
+if NUMBA_AVAILABLE:
+    _haversine_mask_kernel = njit(cache=True, fastmath=True)(_haversine_mask_loop)
+else:
+    _haversine_mask_kernel = _haversine_mask_numpy
+
+
+def haversine_mask(lons, lats, lon0: float, lat0: float, radius_km: float) -> np.ndarray:
+    """
+    Boolean mask of points within radius_km of (lon0, lat0)
+
+    Points trivially inside or outside the radius are classified with a flat-earth
+    distance bound (no trig per point); only those near the boundary go through
+    the full haversine kernel.
+
+    Args:
+        lons: Sequence of longitudes in decimal degrees
+        lats: Sequence of latitudes in decimal degrees
+        lon0: Longitude of the search center
+        lat0: Latitude of the search center
+        radius_km: Search radius in kilometers
+
+    Returns:
+        Boolean array, True where the point lies within the radius
+    """
+    lons = np.ascontiguousarray(lons, dtype=np.float64)
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lon0, lat0, radius_km = float(lon0), float(lat0), float(radius_km)
+
+    # Parallels are widest at the equatorward edge of the search band and narrowest
+    # at the poleward edge, giving upper and lower bounds on the east-west distance
+    band_deg = radius_km / KM_PER_DEGREE
+    cos_wide = cos(radians(max(abs(lat0) - band_deg, 0.0)))
+    cos_narrow = cos(radians(min(abs(lat0) + band_deg, 90.0)))
+
+    dlat_km = np.abs(lats - lat0) * KM_PER_DEGREE
+    dlon_km = np.abs((lons - lon0 + 180.0) % 360.0 - 180.0) * KM_PER_DEGREE
+    dlat_sq = dlat_km * dlat_km
+
+    definite_in = dlat_sq + (dlon_km * cos_wide) ** 2 < (_INNER_MARGIN * radius_km) ** 2
+    definite_out = dlat_sq + (dlon_km * cos_narrow) ** 2 > (_OUTER_MARGIN * radius_km) ** 2
+
+    mask = definite_in.copy()
+    boundary = ~(definite_in | definite_out)
+    if boundary.any():
+        mask[boundary] = _haversine_mask_kernel(
+            np.ascontiguousarray(lons[boundary]),
+            np.ascontiguousarray(lats[boundary]),
+            lon0, lat0, radius_km
+        )
+    return mask
+
+
+def consecutive_distances_km(lats, lons) -> np.ndarray:
+    """
+    Great-circle distance between each point and the next
+
+    Args:
+        lats: Sequence of latitudes in decimal degrees
+        lons: Sequence of longitudes in decimal degrees
+
+    Returns:
+        Array of len(lats) - 1 distances in kilometers
+    """
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    dlat = lat[1:] - lat[:-1]
+    dlon = lon[1:] - lon[:-1]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _fast_movements_loop(lats, lons, seconds, present, max_speed_kmh):
+    """Fused single-pass distance + speed scan, compiled by Numba when available
+
+    Short hops use the equirectangular approximation; long ones full haversine.
+    """
+    n_pairs = max(lats.size - 1, 0)
+    idx = np.empty(n_pairs, np.int64)
+    dist = np.empty(n_pairs, np.float64)
+    speed = np.empty(n_pairs, np.float64)
+    count = 0
+    for i in range(n_pairs):
+        if not (present[i] and present[i + 1]):
+            continue
+        dt = seconds[i + 1] - seconds[i]
+        if dt <= 0:
+            continue
+        lat1 = np.radians(lats[i])
+        lat2 = np.radians(lats[i + 1])
+        dlat = lat2 - lat1
+        dlon = (np.radians(lons[i + 1] - lons[i]) + np.pi) % (2 * np.pi) - np.pi
+        if abs(dlat) + abs(dlon) <= _SHORT_ARC_RAD:
+            x = dlon * np.cos(0.5 * (lat1 + lat2))
+            d = EARTH_RADIUS_KM * np.sqrt(dlat * dlat + x * x)
+        else:
+            a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+            d = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+        v = d * 3600.0 / dt
+        if v > max_speed_kmh:
+            idx[count] = i
+            dist[count] = d
+            speed[count] = v
+            count += 1
+    return idx[:count], dist[:count], speed[:count]
+
+
+def _fast_movements_numpy(lats, lons, seconds, present, max_speed_kmh):
+    """Vectorized NumPy distance + speed scan"""
+    lat = np.radians(lats)
+    dlat = np.diff(lat)
+    dlon = (np.diff(np.radians(lons)) + np.pi) % (2 * np.pi) - np.pi
+    distance = EARTH_RADIUS_KM * np.hypot(dlat, dlon * np.cos(0.5 * (lat[1:] + lat[:-1])))
+
+    # Full haversine only for the (rare) long hops
+    long_arc = np.abs(dlat) + np.abs(dlon) > _SHORT_ARC_RAD
+    if long_arc.any():
+        starts = np.flatnonzero(long_arc)
+        pair_lats = np.stack([lats[starts], lats[starts + 1]], axis=1).ravel()
+        pair_lons = np.stack([lons[starts], lons[starts + 1]], axis=1).ravel()
+        distance[starts] = consecutive_distances_km(pair_lats, pair_lons)[::2]
+
+    dt = np.diff(seconds)
+    valid = present[1:] & present[:-1] & (dt > 0)
+    speed = np.divide(distance * 3600.0, dt, out=np.zeros_like(distance), where=valid)
+    idx = np.flatnonzero(valid & (speed > max_speed_kmh))
+    return idx, distance[idx], speed[idx]
+
+
+if NUMBA_AVAILABLE:
+    _fast_movements_kernel = njit(cache=True, fastmath=True)(_fast_movements_loop)
+else:
+    _fast_movements_kernel = _fast_movements_numpy
+
+
+def find_fast_movements(
+    lats, lons, seconds, present, max_speed_kmh: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Consecutive point pairs whose implied speed exceeds max_speed_kmh
+
+    Args:
+        lats: Latitudes in decimal degrees
+        lons: Longitudes in decimal degrees
+        seconds: Timestamps as seconds since the epoch
+        present: Boolean mask of points with a usable position and time
+        max_speed_kmh: Speed threshold in km/h
+
+    Returns:
+        Tuple of (pair start indices, distances in km, speeds in km/h); pairs with a
+        missing point or non-increasing time are skipped
+    """
+    return _fast_movements_kernel(
+        np.ascontiguousarray(lats, dtype=np.float64),
+        np.ascontiguousarray(lons, dtype=np.float64),
+        np.ascontiguousarray(seconds, dtype=np.float64),
+        np.ascontiguousarray(present, dtype=np.bool_),
+        float(max_speed_kmh)
+    )
@@ -10,7 +10,10 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional, List
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_mcp import FastApiMCP
 
@@ -77,6 +80,63 @@ app.add_middleware(
 )
 
 
+# Responses with more rows than this are streamed in chunks of _STREAM_CHUNK_ROWS
+_STREAM_MIN_ROWS = 1000
+_STREAM_CHUNK_ROWS = 500
+
+
+def _orjson_default(obj):
+    """Serialize nested pydantic models (e.g. warnings, profile summaries) by field"""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _stream_json(response: ToolResponse, key: Optional[str], rows: list):
+    """Yield a ToolResponse as JSON fragments, serializing rows chunk by chunk
+
+    Runs in Starlette's threadpool, so serialization overlaps with sending
+    earlier chunks instead of blocking the event loop.
+    """
+    envelope = {name: value for name, value in response.__dict__.items() if name != "data"}
+    yield _dumps(envelope)[:-1] + b',"data":'
+
+    if key is None:
+        yield b'['
+    else:
+        rest = {k: v for k, v in response.data.items() if k != key}
+        yield _dumps(rest)[:-1] + (b',' if rest else b'') + _dumps(key) + b':['
+
+    for start in range(0, len(rows), _STREAM_CHUNK_ROWS):
+        chunk = _dumps(rows[start:start + _STREAM_CHUNK_ROWS])[1:-1]
+        yield b',' + chunk if start else chunk
+
+    yield b']}}' if key is not None else b']}'
+
+
+def _json_response(response: ToolResponse) -> Response:
+    """Serialize a ToolResponse with orjson, bypassing FastAPI's response-model
+    re-validation and jsonable_encoder for result-heavy tools
+
+    Large row lists (data itself, or a list inside data) are streamed.
+    """
+    data = response.data
+    key, rows = None, None
+    if isinstance(data, list):
+        rows = data
+    elif isinstance(data, dict):
+        key = next((k for k, v in data.items() if isinstance(v, list) and len(v) > _STREAM_MIN_ROWS), None)
+        rows = data[key] if key is not None else None
+
+    if rows is None or len(rows) <= _STREAM_MIN_ROWS:
+        return Response(content=_dumps(response), media_type="application/json")
+    return StreamingResponse(_stream_json(response, key, rows), media_type="application/json")
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -206,7 +266,7 @@ async def list_profiles_tool(
     if not isinstance(response.metadata, dict) or response.metadata is None:
         response.metadata = {}
     response.metadata.update(safety_metadata)
-    return response
+    return _json_response(response)
 
 
 @app.post("/tools/get_profile_details",
@@ -274,7 +334,7 @@ async def search_floats_near_tool(
 
     # Add safety metadata
     response.metadata.update(safety_metadata)
-    return response
+    return _json_response(response)
 
 
 @app.post("/tools/get_profile_statistics",
@@ -322,12 +382,12 @@ async def semantic_search_tool(
     similarity_threshold: float = 0.5
 ) -> ToolResponse:
     """Perform semantic search on profile metadata"""
-    return await vector_search_tools.semantic_search_profiles(
+    return _json_response(await vector_search_tools.semantic_search_profiles(
         query=query,
         limit=limit,
         region_filter=region_filter,
         similarity_threshold=similarity_threshold
-    )
+    ))
 
 
 @app.post("/tools/find_similar_profiles",
@@ -339,11 +399,11 @@ async def find_similar_profiles_tool(
     limit: int = 10
 ) -> ToolResponse:
     """Find profiles similar to a given profile"""
-    return await vector_search_tools.find_similar_profiles(
+    return _json_response(await vector_search_tools.find_similar_profiles(
         profile_id=profile_id,
         similarity_threshold=similarity_threshold,
         limit=limit
-    )
+    ))
 
 
 @app.post("/tools/search_by_description",
@@ -356,12 +416,12 @@ async def search_by_description_tool(
     limit: int = 10
 ) -> ToolResponse:
     """Search profiles by comprehensive description"""
-    return await vector_search_tools.search_by_description(
+    return _json_response(await vector_search_tools.search_by_description(
         description=description,
         region=region,
         season=season,
         limit=limit
-    )
+    ))
 
 
 @app.post("/tools/hybrid_search",
@@ -381,14 +441,14 @@ async def hybrid_search_tool(
     lat_range = (min_lat, max_lat) if min_lat is not None and max_lat is not None else None
     lon_range = (min_lon, max_lon) if min_lon is not None and max_lon is not None else None
 
-    return await vector_search_tools.hybrid_search(
+    return _json_response(await vector_search_tools.hybrid_search(
         query=query,
         lat_range=lat_range,
         lon_range=lon_range,
         parameters=parameters,
         limit=limit,
         vector_weight=vector_weight
-    )
+    ))
 
 from fastapi import UploadFile, File
 
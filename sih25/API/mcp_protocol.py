@@ -4,8 +4,10 @@ MCP Protocol Enhancement Module
 Adds additional MCP-specific functionality and utilities for AI Agent integration
 """
 
+import re
 import logging
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional
 from datetime import datetime
 
 from fastapi import HTTPException
@@ -14,6 +16,99 @@ from sih25.API.models import ToolResponse
 
 logger = logging.getLogger(__name__)
 
+# Static reference text, built once; the per-parameter entries are shared, treat them as read-only
+_PARAMETER_MEANINGS: Mapping[str, Dict[str, str]] = MappingProxyType({
+    'TEMP': {
+        'name': 'Temperature',
+        'units': '°C (degrees Celsius)',
+        'meaning': 'Seawater temperature measured in situ',
+        'typical_range': '-2 to 35°C'
+    },
+    'PSAL': {
+        'name': 'Practical Salinity',
+        'units': 'PSU (Practical Salinity Units)',
+        'meaning': 'Salinity of seawater based on conductivity',
+        'typical_range': '30 to 37 PSU'
+    },
+    'PRES': {
+        'name': 'Pressure',
+        'units': 'dbar (decibar)',
+        'meaning': 'Water pressure, approximately equal to depth in meters',
+        'typical_range': '0 to 2000+ dbar'
+    },
+    'DOXY': {
+        'name': 'Dissolved Oxygen',
+        'units': 'μmol/kg (micromoles per kilogram)',
+        'meaning': 'Concentration of dissolved oxygen in seawater',
+        'typical_range': '0 to 400 μmol/kg'
+    },
+    'CHLA': {
+        'name': 'Chlorophyll-a',
+        'units': 'mg/m³ (milligrams per cubic meter)',
+        'meaning': 'Concentration of chlorophyll-a, indicator of phytoplankton',
+        'typical_range': '0 to 10 mg/m³'
+    }
+})
+
+_UNKNOWN_PARAMETER = MappingProxyType({
+    'units': 'Unknown',
+    'meaning': 'Standard ARGO parameter',
+    'typical_range': 'Varies'
+})
+
+_SCIENTIFIC_CONTEXT_BASE = MappingProxyType({
+    "argo_program_info": "ARGO is an international program providing real-time ocean observations",
+    "data_standards": "Data follows ARGO quality control standards with QC flags"
+})
+
+# Warning/error explanations: precompiled case-insensitive rules, checked in precedence order
+_WARNING_RULES = (
+    (re.compile(r"^(?=.*real-time)(?=.*delayed)", re.IGNORECASE | re.DOTALL),
+     "Real-time data hasn't undergone full quality control. Delayed-mode data is preferred for scientific analysis."),
+    (re.compile(r"qc|quality", re.IGNORECASE),
+     "Some data points have quality control flags indicating potential issues. This is normal but worth noting."),
+    (re.compile(r"gap", re.IGNORECASE),
+     "There are missing time periods in the data. This could affect temporal analysis."),
+    (re.compile(r"movement|speed", re.IGNORECASE),
+     "The float appears to have moved unusually fast, which might indicate a data processing error."),
+)
+_DEFAULT_WARNING_EXPLANATION = "This warning provides information about potential data quality considerations."
+
+_VALIDATION_ERROR = re.compile(r"validation", re.IGNORECASE)
+_ERROR_RULES = (
+    (re.compile(r"not found", re.IGNORECASE),
+     "The requested data (profile, float, etc.) doesn't exist in the database."),
+    (re.compile(r"timeout|performance", re.IGNORECASE),
+     "The query is too complex or large. Try reducing the search area, time range, or result count."),
+)
+_DEFAULT_ERROR_EXPLANATION = "An unexpected error occurred. Please try again or contact support."
+
+# Fields shown to the LLM as a sample of list results, per record type
+_SAMPLE_FIELDS = {
+    'ProfileSummary': ('profile_id', 'float_wmo_id', 'timestamp', 'latitude', 'longitude', 'data_mode', 'parameters_available'),
+    'FloatSummary': ('wmo_id', 'status', 'deployment_date', 'last_contact', 'total_profiles'),
+    'VariableStats': ('profile_id', 'variable', 'count', 'mean', 'std', 'min_value', 'max_value'),
+    'Profile': ('float_id', 'lat', 'lon', 'depth', 'temperature', 'salinity', 'date'),
+}
+
+
+def _sample_record(record: Any) -> Any:
+    """Project a record onto its whitelisted fields (public attributes for unknown types)"""
+    fields = _SAMPLE_FIELDS.get(type(record).__name__)
+    if fields is not None:
+        return {field: getattr(record, field, None) for field in fields}
+    if hasattr(record, '__dict__'):
+        return {key: value for key, value in vars(record).items() if not key.startswith('_')}
+    return str(record)
+
+
+def _classify(message: str, rules, default: str) -> str:
+    """Return the explanation of the first rule matching message"""
+    for pattern, explanation in rules:
+        if pattern.search(message):
+            return explanation
+    return default
+
 
 class MCPProtocolHandler:
     """
@@ -54,7 +149,7 @@ class MCPProtocolHandler:
                 formatted["data_summary"] = {
                     "type": "list",
                     "count": len(tool_response.data),
-                    "sample_record": tool_response.data[0].__dict__ if hasattr(tool_response.data[0], '__dict__') else str(tool_response.data[0])
+                    "sample_record": _sample_record(tool_response.data[0])
                 }
 
                 # Generate natural language summary
@@ -119,11 +214,7 @@ class MCPProtocolHandler:
 
     def _add_scientific_context(self, data: Any) -> Dict[str, Any]:
         """Add scientific context and unit information"""
-        context = {
-            "argo_program_info": "ARGO is an international program providing real-time ocean observations",
-            "data_standards": "Data follows ARGO quality control standards with QC flags",
-            "units_and_meanings": {}
-        }
+        context = {**_SCIENTIFIC_CONTEXT_BASE, "units_and_meanings": {}}
 
         # Add parameter-specific context
         if hasattr(data, '__iter__') and not isinstance(data, str):
@@ -141,81 +232,21 @@ class MCPProtocolHandler:
 
     def _get_parameter_meanings(self, parameters: List[str]) -> Dict[str, Dict[str, str]]:
         """Get scientific meanings and units for parameters"""
-        meanings = {
-            'TEMP': {
-                'name': 'Temperature',
-                'units': '°C (degrees Celsius)',
-                'meaning': 'Seawater temperature measured in situ',
-                'typical_range': '-2 to 35°C'
-            },
-            'PSAL': {
-                'name': 'Practical Salinity',
-                'units': 'PSU (Practical Salinity Units)',
-                'meaning': 'Salinity of seawater based on conductivity',
-                'typical_range': '30 to 37 PSU'
-            },
-            'PRES': {
-                'name': 'Pressure',
-                'units': 'dbar (decibar)',
-                'meaning': 'Water pressure, approximately equal to depth in meters',
-                'typical_range': '0 to 2000+ dbar'
-            },
-            'DOXY': {
-                'name': 'Dissolved Oxygen',
-                'units': 'μmol/kg (micromoles per kilogram)',
-                'meaning': 'Concentration of dissolved oxygen in seawater',
-                'typical_range': '0 to 400 μmol/kg'
-            },
-            'CHLA': {
-                'name': 'Chlorophyll-a',
-                'units': 'mg/m³ (milligrams per cubic meter)',
-                'meaning': 'Concentration of chlorophyll-a, indicator of phytoplankton',
-                'typical_range': '0 to 10 mg/m³'
-            }
+        return {
+            param: _PARAMETER_MEANINGS.get(param) or {'name': param, **_UNKNOWN_PARAMETER}
+            for param in parameters
         }
 
-        return {param: meanings.get(param, {
-            'name': param,
-            'units': 'Unknown',
-            'meaning': 'Standard ARGO parameter',
-            'typical_range': 'Varies'
-        }) for param in parameters}
-
     def _explain_warning(self, warning) -> str:
         """Provide user-friendly explanation of warnings"""
-        message = warning.message.lower()
-
-        if "real-time" in message and "delayed" in message:
-            return "Real-time data hasn't undergone full quality control. Delayed-mode data is preferred for scientific analysis."
-
-        elif "qc" in message or "quality" in message:
-            return "Some data points have quality control flags indicating potential issues. This is normal but worth noting."
-
-        elif "gap" in message:
-            return "There are missing time periods in the data. This could affect temporal analysis."
-
-        elif "movement" in message or "speed" in message:
-            return "The float appears to have moved unusually fast, which might indicate a data processing error."
-
-        else:
-            return "This warning provides information about potential data quality considerations."
+        return _classify(warning.message, _WARNING_RULES, _DEFAULT_WARNING_EXPLANATION)
 
     def _explain_error(self, error: Dict[str, Any]) -> str:
         """Provide user-friendly explanation of errors"""
-        error_type = error.get("error", "").lower()
-        message = error.get("message", "").lower()
-
-        if "validation" in error_type:
+        if _VALIDATION_ERROR.search(error.get("error", "")):
             return "The request parameters don't meet safety or format requirements. Please check the input values."
 
-        elif "not found" in message:
-            return "The requested data (profile, float, etc.) doesn't exist in the database."
-
-        elif "timeout" in message or "performance" in message:
-            return "The query is too complex or large. Try reducing the search area, time range, or result count."
-
-        else:
-            return "An unexpected error occurred. Please try again or contact support."
+        return _classify(error.get("message", ""), _ERROR_RULES, _DEFAULT_ERROR_EXPLANATION)
 
     def generate_tool_descriptions(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the geospatial kernels
+Checks the radius mask and the fast-movement scan against a scalar haversine
+"""
+
+from math import radians, sin, cos, asin, sqrt
+
+import numpy as np
+import pytest
+
+from sih25.API import geo
+
+# Both implementations of each kernel; the loop versions are also run under Numba when installed
+MASK_KERNELS = [
+    pytest.param(geo._haversine_mask_numpy, id="numpy"),
+    pytest.param(geo._haversine_mask_loop, id="loop"),
+]
+MOVEMENT_KERNELS = [
+    pytest.param(geo._fast_movements_numpy, id="numpy"),
+    pytest.param(geo._fast_movements_loop, id="loop"),
+]
+if geo.NUMBA_AVAILABLE:
+    MASK_KERNELS.append(pytest.param(geo.njit(geo._haversine_mask_loop), id="numba"))
+    MOVEMENT_KERNELS.append(pytest.param(geo.njit(geo._fast_movements_loop), id="numba"))
+
+# (lon0, lat0, radius_km): equator, high latitude, pole, antimeridian, wide radius
+CENTERS = [
+    (0.0, 0.0, 200.0),
+    (-55.0, 72.0, 300.0),
+    (10.0, 89.5, 500.0),
+    (0.0, -89.9, 150.0),
+    (179.8, 10.0, 250.0),
+    (-179.9, -65.0, 400.0),
+    (60.0, 30.0, 2000.0),
+]
+
+
+def scalar_haversine_km(lat1, lon1, lat2, lon2):
+    """Reference great-circle distance"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * geo.EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def points_around(lon0, lat0, radius_km, n=4000, seed=0):
+    """Random points out to twice the radius, plus a ring straddling the margin bands"""
+    rng = np.random.default_rng(seed)
+    spread = 2 * radius_km / geo.KM_PER_DEGREE
+    lats = np.clip(lat0 + rng.uniform(-spread, spread, n), -90.0, 90.0)
+    lons = lon0 + rng.uniform(-1, 1, n) * min(spread / max(cos(radians(lat0)), 0.01), 180.0)
+
+    # Destination points at fractions of the radius around the inner/outer margins
+    bearings = rng.uniform(0, 2 * np.pi, n)
+    fractions = rng.choice([0.85, 0.9, 0.95, 0.999, 1.001, 1.05, 1.1, 1.15], n)
+    delta = fractions * radius_km / geo.EARTH_RADIUS_KM
+    lat0_r, lon0_r = radians(lat0), radians(lon0)
+    ring_lats = np.arcsin(np.sin(lat0_r) * np.cos(delta) + np.cos(lat0_r) * np.sin(delta) * np.cos(bearings))
+    ring_lons = lon0_r + np.arctan2(
+        np.sin(bearings) * np.sin(delta) * np.cos(lat0_r),
+        np.cos(delta) - np.sin(lat0_r) * np.sin(ring_lats)
+    )
+
+    # Wrap longitudes into [-180, 180) so antimeridian neighbours sit on the far side
+    all_lons = (np.concatenate([lons, np.degrees(ring_lons)]) + 180.0) % 360.0 - 180.0
+    all_lats = np.concatenate([lats, np.degrees(ring_lats)])
+    return all_lons, all_lats
+
+
+def expected_mask(lons, lats, lon0, lat0, radius_km):
+    distances = np.array([scalar_haversine_km(lat0, lon0, lat, lon) for lon, lat in zip(lons, lats)])
+    # Points within float noise of the radius could go either way
+    decidable = np.abs(distances - radius_km) > 1e-6
+    return distances <= radius_km, decidable
+
+
+@pytest.mark.parametrize("kernel", MASK_KERNELS)
+@pytest.mark.parametrize("lon0, lat0, radius_km", CENTERS)
+def test_haversine_mask_matches_scalar(monkeypatch, kernel, lon0, lat0, radius_km):
+    monkeypatch.setattr(geo, "_haversine_mask_kernel", kernel)
+    lons, lats = points_around(lon0, lat0, radius_km)
+
+    mask = geo.haversine_mask(lons, lats, lon0, lat0, radius_km)
+    expected, decidable = expected_mask(lons, lats, lon0, lat0, radius_km)
+
+    assert mask.dtype == np.bool_
+    np.testing.assert_array_equal(mask[decidable], expected[decidable])
+
+
+@pytest.mark.parametrize("kernel", MASK_KERNELS)
+@pytest.mark.parametrize("lon0, lat0, radius_km", CENTERS)
+def test_haversine_kernel_matches_scalar(kernel, lon0, lat0, radius_km):
+    """The full kernel alone, without the equirectangular pre-check"""
+    lons, lats = points_around(lon0, lat0, radius_km, n=500, seed=1)
+
+    mask = kernel(lons, lats, lon0, lat0, radius_km)
+    expected, decidable = expected_mask(lons, lats, lon0, lat0, radius_km)
+
+    np.testing.assert_array_equal(mask[decidable], expected[decidable])
+
+
+def test_haversine_mask_empty():
+    assert geo.haversine_mask([], [], 0.0, 0.0, 100.0).size == 0
+
+
+def test_consecutive_distances_match_scalar():
+    lats = [0.0, 0.0, 89.9, -89.9, 10.0, 10.0]
+    lons = [0.0, 1.0, 45.0, -135.0, 179.9, -179.9]
+    expected = [scalar_haversine_km(lats[i], lons[i], lats[i + 1], lons[i + 1]) for i in range(len(lats) - 1)]
+
+    np.testing.assert_allclose(geo.consecutive_distances_km(lats, lons), expected, rtol=1e-9)
+
+
+def track(seed=2, n=3000):
+    """A drifting track with short hops, jumps across the antimeridian and over the pole"""
+    rng = np.random.default_rng(seed)
+    lats = np.clip(np.cumsum(rng.normal(0, 0.3, n)) + rng.choice([0.0, 85.0, -80.0], n), -90.0, 90.0)
+    lons = (np.cumsum(rng.normal(0, 0.5, n)) + 178.0 + 180.0) % 360.0 - 180.0
+    # Occasional long jumps exercise the full-haversine branch
+    jumps = rng.random(n) < 0.05
+    lons[jumps] = rng.uniform(-180, 180, jumps.sum())
+    seconds = np.cumsum(rng.choice([-60.0, 0.0, 3600.0, 86400.0], n, p=[0.02, 0.02, 0.48, 0.48]))
+    present = rng.random(n) > 0.05
+    return lats, lons, seconds, present
+
+
+def expected_movements(lats, lons, seconds, present, max_speed_kmh):
+    idx, dist, speed = [], [], []
+    for i in range(len(lats) - 1):
+        dt = seconds[i + 1] - seconds[i]
+        if not (present[i] and present[i + 1]) or dt <= 0:
+            continue
+        d = scalar_haversine_km(lats[i], lons[i], lats[i + 1], lons[i + 1])
+        v = d * 3600.0 / dt
+        if v > max_speed_kmh:
+            idx.append(i)
+            dist.append(d)
+            speed.append(v)
+    return np.array(idx, dtype=np.int64), np.array(dist), np.array(speed)
+
+
+@pytest.mark.parametrize("kernel", MOVEMENT_KERNELS)
+def test_find_fast_movements_matches_scalar(monkeypatch, kernel):
+    monkeypatch.setattr(geo, "_fast_movements_kernel", kernel)
+    lats, lons, seconds, present = track()
+    max_speed_kmh = 3.0
+
+    idx, dist, speed = geo.find_fast_movements(lats, lons, seconds, present, max_speed_kmh)
+    exp_idx, exp_dist, exp_speed = expected_movements(lats, lons, seconds, present, max_speed_kmh)
+
+    # Short hops use the equirectangular distance (within 0.5%), so speeds right at the
+    # threshold may be classified differently; everything else must agree exactly
+    near_threshold = set(np.flatnonzero(np.isclose(
+        [scalar_haversine_km(lats[i], lons[i], lats[i + 1], lons[i + 1]) * 3600.0 / max(seconds[i + 1] - seconds[i], 1e-9)
+         for i in range(len(lats) - 1)],
+        max_speed_kmh, rtol=0.01
+    )))
+    assert set(idx) - near_threshold == set(exp_idx) - near_threshold
+
+    common, at, exp_at = np.intersect1d(idx, exp_idx, return_indices=True)
+    assert common.size > 100
+    np.testing.assert_allclose(dist[at], exp_dist[exp_at], rtol=5e-3)
+    np.testing.assert_allclose(speed[at], exp_speed[exp_at], rtol=5e-3)
+
+
+@pytest.mark.parametrize("kernel", MOVEMENT_KERNELS)
+def test_find_fast_movements_antimeridian_and_pole(monkeypatch, kernel):
+    monkeypatch.setattr(geo, "_fast_movements_kernel", kernel)
+    lats = [10.0, 10.0, 89.95, 89.95, 0.0]
+    lons = [179.95, -179.95, 0.0, 180.0, 0.0]
+    seconds = [0.0, 3600.0, 7200.0, 10800.0, 14400.0]
+    present = [True] * 5
+
+    idx, dist, speed = geo.find_fast_movements(lats, lons, seconds, present, 0.0)
+
+    expected = [scalar_haversine_km(lats[i], lons[i], lats[i + 1], lons[i + 1]) for i in range(4)]
+    np.testing.assert_array_equal(idx, [0, 1, 2, 3])
+    np.testing.assert_allclose(dist, expected, rtol=5e-3)
+    # ~11 km across the antimeridian, not ~39,000 km the long way round
+    assert dist[0] < 12.0
+    np.testing.assert_allclose(speed, dist, rtol=1e-12)
+
+
+@pytest.mark.parametrize("kernel", MOVEMENT_KERNELS)
+def test_find_fast_movements_short_input(monkeypatch, kernel):
+    monkeypatch.setattr(geo, "_fast_movements_kernel", kernel)
+    for n in (0, 1):
+        idx, dist, speed = geo.find_fast_movements([0.0] * n, [0.0] * n, [0.0] * n, [True] * n, 1.0)
+        assert idx.size == dist.size == speed.size == 0
@@ -0,0 +1,182 @@
+"""
+Query Caches for Vector Search Tools
+Thread-safe TTL + LRU exact-match cache and an embedding-similarity cache
+for semantic search results
+"""
+
+import os
+import json
+import time
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class QueryCache:
+    """LRU cache with per-entry TTL expiry"""
+
+    def __init__(self, max_size: int = 2000, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        query: str,
+        limit: int,
+        where_filters: Optional[Dict[str, Any]] = None,
+        distance_threshold: Optional[float] = None
+    ) -> bytes:
+        """Build a cache key from the normalized query, limit, metadata filters and threshold"""
+        return (
+            hashlib.blake2b(query.strip().lower().encode()).digest()
+            + json.dumps([where_filters, distance_threshold], sort_keys=True).encode()
+            + struct.pack("i", limit)
+        )
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expiry_ts, value = entry
+            if expiry_ts < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class SemanticCache:
+    """Approximate cache that matches paraphrased queries by embedding cosine similarity"""
+
+    def __init__(self, threshold: float = 0.95, capacity: int = 4096):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._embeddings: Optional[np.ndarray] = None  # (capacity, dim) unit vectors
+        self._contexts = np.zeros(capacity, dtype=np.int64)
+        self._values: List[Any] = [None] * capacity
+        self._size = 0
+        self._next_slot = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_context(
+        limit: int,
+        where_filters: Optional[Dict[str, Any]] = None,
+        distance_threshold: Optional[float] = None
+    ) -> int:
+        """Hash the non-query search arguments; only entries with the same context can match"""
+        digest = hashlib.blake2b(
+            json.dumps([where_filters, distance_threshold], sort_keys=True).encode() + struct.pack("i", limit),
+            digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding: List[float], context: int) -> Optional[Any]:
+        """Return the value of the most similar cached query above the threshold, if any"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._size == 0 or self._embeddings.shape[1] != vector.size:
+                self.misses += 1
+                return None
+
+            similarities = self._embeddings[:self._size] @ vector
+            similarities[self._contexts[:self._size] != context] = -1.0
+            best = int(np.argmax(similarities))
+
+            if similarities[best] >= self.threshold:
+                self.hits += 1
+                return self._values[best]
+
+            self.misses += 1
+            return None
+
+    def put(self, embedding: List[float], context: int, value: Any) -> None:
+        """Store a value, overwriting the oldest entry (FIFO) when full"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            # (Re)allocate on first use or if the embedding model changed dimension
+            if self._embeddings is None or self._embeddings.shape[1] != vector.size:
+                self._embeddings = np.zeros((self.capacity, vector.size), dtype=np.float32)
+                self._values = [None] * self.capacity
+                self._size = 0
+                self._next_slot = 0
+
+            slot = self._next_slot
+            self._embeddings[slot] = vector
+            self._contexts[slot] = context
+            self._values[slot] = value
+            self._next_slot = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._values = [None] * self.capacity
+            self._size = 0
+            self._next_slot = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics"""
+        with self._lock:
+            return {
+                "size": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def create_query_cache() -> QueryCache:
+    """Create a query cache configured from environment variables"""
+    return QueryCache(
+        max_size=int(os.getenv("VECTOR_CACHE_MAX_SIZE", "2000")),
+        ttl_seconds=float(os.getenv("VECTOR_CACHE_TTL", "300"))
+    )
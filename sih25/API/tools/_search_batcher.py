@@ -0,0 +1,84 @@
+"""
+Search Batcher for Vector Search Tools
+Coalesces concurrent semantic searches into shared vector store calls
+"""
+
+import json
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# batch_fn(queries, query_embeddings, **options) -> one match list per query
+BatchSearchFn = Callable[..., Awaitable[List[List[Dict[str, Any]]]]]
+
+
+class SearchBatcher:
+    """Micro-batches searches arriving within a short window into one call per option group"""
+
+    def __init__(self, batch_fn: BatchSearchFn, window_seconds: float = 0.005, max_batch_size: int = 16):
+        self.batch_fn = batch_fn
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, Optional[List[float]], Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()  # Strong references so in-flight groups aren't garbage collected
+
+    async def search(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]] = None,
+        **options: Any
+    ) -> List[Dict[str, Any]]:
+        """Queue a search and wait for its batched result
+
+        Searches are only batched with others that share identical options
+        (limit, filters, thresholds).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, query_embedding, options, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Group pending searches by options and dispatch one call per group"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+
+        groups: Dict[str, list] = {}
+        for item in pending:
+            groups.setdefault(json.dumps(item[2], sort_keys=True), []).append(item)
+
+        for items in groups.values():
+            task = asyncio.ensure_future(self._run_group(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_group(self, items: list) -> None:
+        """Execute one grouped search and resolve each caller's future"""
+        try:
+            results = await self.batch_fn(
+                [query for query, _, _, _ in items],
+                [embedding for _, embedding, _, _ in items],
+                **items[0][2]
+            )
+        except Exception as e:
+            logger.error(f"Batched search failed: {e}")
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), matches in zip(items, results):
+            if not future.done():
+                future.set_result(matches)
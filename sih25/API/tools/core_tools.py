@@ -5,11 +5,14 @@ Provides secure, validated database access with ARGO protocol compliance
 """
 
 import time
+import asyncio
 import logging
 from datetime import datetime
+from itertools import chain
 from typing import List, Dict, Any, Optional
-from math import radians, cos, sin, asin, sqrt
+from math import radians, cos
 
+import numpy as np
 from fastapi import HTTPException
 from pydantic import ValidationError
 
@@ -21,9 +24,18 @@ from sih25.API.models import (
     DataMode, QCFlag
 )
 from sih25.API.validation import argo_validator
+from sih25.API.geo import haversine_mask
 
 logger = logging.getLogger(__name__)
 
+# Precomputed enum lookups - plain dict access is cheaper than Enum.__call__ per row
+_DATAMODE_MAP = {mode.value: mode for mode in DataMode}
+_QCFLAG_MAP = {flag.value: flag for flag in QCFlag}
+
+# Bounding-box approximation constants (1 degree ≈ 111 km at equator)
+_DEG_PER_KM = 1 / 111.0
+_MIN_COS_LAT = 1e-6
+
 
 class ARGOTools:
     """Core MCP tools for ARGO data access"""
@@ -45,31 +57,26 @@ class ARGOTools:
             if result and hasattr(result, '__iter__') and not isinstance(result, str):
                 if isinstance(result, list):
                     # For list results (profiles, floats, etc.)
-                    validated_result, validation_warnings = argo_validator.validate_data_mode_preference(
-                        [{"data_mode": getattr(item, 'data_mode', 'R'),
-                          "timestamp": getattr(item, 'timestamp', None),
-                          "profile_id": getattr(item, 'profile_id', getattr(item, 'wmo_id', None))}
-                         for item in result if hasattr(item, '__dict__')]
-                    )
-                    warnings.extend(validation_warnings)
+                    # Project items once; every validator reads only the keys it needs
+                    records = [
+                        {"data_mode": getattr(item, 'data_mode', 'R'),
+                         "timestamp": getattr(item, 'timestamp', None),
+                         "latitude": getattr(item, 'latitude', None),
+                         "longitude": getattr(item, 'longitude', None),
+                         "profile_id": getattr(item, 'profile_id', getattr(item, 'wmo_id', None))}
+                        for item in result if hasattr(item, '__dict__')
+                    ]
+
+                    # Validators are CPU-bound, so run them on worker threads concurrently
+                    validations = [asyncio.to_thread(argo_validator.validate_data_mode_preference, records)]
 
                     # Add temporal and spatial consistency checks
                     if len(result) > 1:
-                        temporal_warnings = argo_validator.validate_temporal_consistency(
-                            [{"timestamp": getattr(item, 'timestamp', None),
-                              "profile_id": getattr(item, 'profile_id', getattr(item, 'wmo_id', None))}
-                             for item in result if hasattr(item, '__dict__')]
-                        )
-                        warnings.extend(temporal_warnings)
-
-                        spatial_warnings = argo_validator.validate_spatial_consistency(
-                            [{"latitude": getattr(item, 'latitude', None),
-                              "longitude": getattr(item, 'longitude', None),
-                              "timestamp": getattr(item, 'timestamp', None),
-                              "profile_id": getattr(item, 'profile_id', getattr(item, 'wmo_id', None))}
-                             for item in result if hasattr(item, '__dict__')]
-                        )
-                        warnings.extend(spatial_warnings)
+                        validations.append(asyncio.to_thread(argo_validator.validate_temporal_consistency, records))
+                        validations.append(asyncio.to_thread(argo_validator.validate_spatial_consistency, records))
+
+                    (validated_result, validation_warnings), *consistency_warnings = await asyncio.gather(*validations)
+                    warnings.extend(chain(validation_warnings, *consistency_warnings))
 
             # Add data provenance to metadata
             metadata = {
@@ -102,19 +109,6 @@ class ARGOTools:
             ))
             return ToolResponse(success=False, errors=errors)
 
-    def _haversine_distance(self, lon1: float, lat1: float, lon2: float, lat2: float) -> float:
-        """Calculate the great circle distance between two points on Earth in kilometers"""
-        # Convert decimal degrees to radians
-        lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-
-        # Haversine formula
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371  # Radius of earth in kilometers
-        return c * r
-
     async def list_profiles(
         self,
         region: BoundingBox,
@@ -168,7 +162,8 @@ class ARGOTools:
         LIMIT $7
         """
 
-        results = await db_manager.fetch_with_retry(
+        # Stream rows so summaries are built while the rest of the batch arrives
+        rows = db_manager.fetch_stream_with_retry(
             query,
             region.min_lat, region.max_lat,
             region.min_lon, region.max_lon,
@@ -177,18 +172,19 @@ class ARGOTools:
         )
 
         profiles = []
-        for row in results:
+        async for row in rows:
             # Convert asyncpg.Record to dict to access values
             row_dict = dict(row)
 
-            profiles.append(ProfileSummary(
+            # Rows come from the typed DB schema, so skip Pydantic validation
+            profiles.append(ProfileSummary.model_construct(
                 profile_id=row_dict['profile_id'],
                 float_wmo_id=row_dict['float_wmo_id'],
                 timestamp=row_dict['timestamp'],
                 latitude=row_dict['latitude'],
                 longitude=row_dict['longitude'],
-                data_mode=DataMode(row_dict['data_mode']) if row_dict['data_mode'] else DataMode.REAL_TIME,
-                position_qc=QCFlag(row_dict['position_qc']) if row_dict['position_qc'] is not None else QCFlag.NO_QC,
+                data_mode=_DATAMODE_MAP.get(row_dict['data_mode'], DataMode.REAL_TIME),
+                position_qc=_QCFLAG_MAP.get(row_dict['position_qc'], QCFlag.NO_QC),
                 parameters_available=row_dict['parameters'] or [],
                 depth_range={
                     "min": float(row_dict['min_depth']) if row_dict['min_depth'] is not None else 0.0,
@@ -234,60 +230,55 @@ class ARGOTools:
 
         profile_row = dict(profile_result[0])
 
-        # Get observations summary
+        # Get observations summary, aggregated entirely in SQL
         observations_query = """
+        WITH per_qc AS (
+            SELECT qc_flag, COUNT(*) as qc_count
+            FROM observations
+            WHERE profile_id = $1 AND qc_flag IS NOT NULL
+            GROUP BY qc_flag
+        ),
+        agg AS (
+            SELECT
+                COUNT(*) as obs_count,
+                ARRAY_AGG(DISTINCT parameter) FILTER (WHERE parameter IS NOT NULL) as parameters,
+                MIN(depth) as min_depth,
+                MAX(depth) as max_depth
+            FROM observations
+            WHERE profile_id = $1
+        )
         SELECT
-            COUNT(*) as obs_count,
-            ARRAY_AGG(DISTINCT parameter) as parameters,
-            MIN(depth) as min_depth,
-            MAX(depth) as max_depth,
-            parameter,
-            qc_flag,
-            COUNT(*) as qc_count
-        FROM observations
-        WHERE profile_id = $1
-        GROUP BY parameter, qc_flag
+            agg.obs_count,
+            agg.parameters,
+            agg.min_depth,
+            agg.max_depth,
+            (SELECT ARRAY_AGG(qc_flag ORDER BY qc_flag) FROM per_qc) as qc_flags,
+            (SELECT ARRAY_AGG(qc_count ORDER BY qc_flag) FROM per_qc) as qc_counts
+        FROM agg
         """
 
-        obs_results = await db_manager.fetch_with_retry(observations_query, profile_id)
-
-        # Process observations data
-        total_observations = 0
-        parameters = set()
-        min_depth = float('inf')
-        max_depth = float('-inf')
-        qc_summary = {}
-
-        for row in obs_results:
-            row_dict = dict(row)
-            total_observations += row_dict['qc_count']
-            parameters.add(row_dict['parameter'])
-
-            if row_dict['min_depth'] is not None:
-                min_depth = min(min_depth, row_dict['min_depth'])
-            if row_dict['max_depth'] is not None:
-                max_depth = max(max_depth, row_dict['max_depth'])
-
-            qc_flag = row_dict['qc_flag']
-            if qc_flag is not None:
-                qc_summary[str(qc_flag)] = qc_summary.get(str(qc_flag), 0) + row_dict['qc_count']
+        obs_result = await db_manager.fetch_with_retry(observations_query, profile_id)
+        obs_row = dict(obs_result[0])
 
-        # Handle edge cases
-        if min_depth == float('inf'):
-            min_depth = 0.0
-        if max_depth == float('-inf'):
-            max_depth = 0.0
+        total_observations = obs_row['obs_count']
+        parameters = obs_row['parameters'] or []
+        min_depth = obs_row['min_depth'] if obs_row['min_depth'] is not None else 0.0
+        max_depth = obs_row['max_depth'] if obs_row['max_depth'] is not None else 0.0
+        qc_summary = {
+            str(qc_flag): qc_count
+            for qc_flag, qc_count in zip(obs_row['qc_flags'] or [], obs_row['qc_counts'] or [])
+        }
 
-        return ProfileDetail(
+        return ProfileDetail.model_construct(
             profile_id=profile_row['profile_id'],
             float_wmo_id=profile_row['float_wmo_id'],
             timestamp=profile_row['timestamp'],
             latitude=profile_row['latitude'],
             longitude=profile_row['longitude'],
-            data_mode=DataMode(profile_row['data_mode']) if profile_row['data_mode'] else DataMode.REAL_TIME,
-            position_qc=QCFlag(profile_row['position_qc']) if profile_row['position_qc'] is not None else QCFlag.NO_QC,
+            data_mode=_DATAMODE_MAP.get(profile_row['data_mode'], DataMode.REAL_TIME),
+            position_qc=_QCFLAG_MAP.get(profile_row['position_qc'], QCFlag.NO_QC),
             observations_count=total_observations,
-            parameters=list(parameters),
+            parameters=parameters,
             depth_range={"min": float(min_depth), "max": float(max_depth)},
             data_provenance={
                 "deployment_info": profile_row.get('deployment_info', {}),
@@ -320,8 +311,10 @@ class ARGOTools:
 
         # Get all floats with their latest profiles within a larger bounding box first
         # Use approximate bounding box (1 degree ≈ 111 km at equator)
-        lat_delta = radius_km / 111.0
-        lon_delta = radius_km / (111.0 * cos(radians(lat)))
+        # Clamp cos(lat) and the longitude span so the box stays bounded near the poles
+        cos_lat = max(cos(radians(lat)), _MIN_COS_LAT)
+        lat_delta = radius_km * _DEG_PER_KM
+        lon_delta = min(radius_km * _DEG_PER_KM / cos_lat, 180.0)
 
         query = """
         WITH latest_profiles AS (
@@ -364,23 +357,25 @@ class ARGOTools:
             max_results * 2  # Get more results to filter by actual distance
         )
 
-        # Filter by actual distance and create summaries
-        floats_within_radius = []
-        for row in results:
-            row_dict = dict(row)
-
-            if row_dict['latitude'] is None or row_dict['longitude'] is None:
-                continue
+        candidates = [
+            dict(row) for row in results
+            if row['latitude'] is not None and row['longitude'] is not None
+        ]
 
-            distance = self._haversine_distance(
-                lon, lat,
-                row_dict['longitude'], row_dict['latitude']
-            )
+        # Filter by actual distance in one batch pass and create summaries
+        within_radius = haversine_mask(
+            [row_dict['longitude'] for row_dict in candidates],
+            [row_dict['latitude'] for row_dict in candidates],
+            lon, lat, radius_km
+        )
 
-            if distance <= radius_km:
+        floats_within_radius = []
+        for row_dict, is_within in zip(candidates, within_radius):
+            if is_within:
                 deployment_info = row_dict.get('deployment_info', {}) or {}
                 pi_details = row_dict.get('pi_details', {}) or {}
 
+                # deployment_date comes from free-form JSONB, so keep validation here
                 floats_within_radius.append(FloatSummary(
                     wmo_id=row_dict['wmo_id'],
                     deployment_date=deployment_info.get('deployment_date'),
@@ -417,69 +412,48 @@ class ARGOTools:
         if not profile_result:
             raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
 
-        data_mode = DataMode(profile_result[0]['data_mode']) if profile_result[0]['data_mode'] else DataMode.REAL_TIME
+        data_mode = _DATAMODE_MAP.get(profile_result[0]['data_mode'], DataMode.REAL_TIME)
 
-        # Get variable statistics
-        stats_query = """
+        # Pull the variable's observations as arrays via binary COPY; NULLs become
+        # NaN / -1 so every row keeps a fixed width
+        observations_query = """
         SELECT
-            COUNT(*) as count,
-            AVG(value) as mean,
-            STDDEV(value) as std,
-            MIN(value) as min_value,
-            MAX(value) as max_value,
-            MIN(depth) as min_depth,
-            MAX(depth) as max_depth,
-            qc_flag,
-            COUNT(*) as qc_count
+            COALESCE(value, 'NaN'::float8) as value,
+            COALESCE(depth, 'NaN'::float8) as depth,
+            COALESCE(qc_flag, -1) as qc_flag
         FROM observations
         WHERE profile_id = $1 AND parameter = $2
-        GROUP BY qc_flag
         """
 
-        stats_results = await db_manager.fetch_with_retry(stats_query, profile_id, variable)
+        arrays = await db_manager.copy_query_to_numpy(
+            observations_query, profile_id, variable,
+            columns={"value": "f8", "depth": "f8", "qc_flag": "i4"}
+        )
+        values, depths, qc_flags = arrays["value"], arrays["depth"], arrays["qc_flag"]
 
-        if not stats_results:
+        total_count = int(values.size)
+        if total_count == 0:
             raise HTTPException(status_code=404, detail=f"Variable {variable} not found in profile {profile_id}")
 
-        # Aggregate statistics
-        total_count = 0
-        qc_summary = {}
-        values_for_stats = []
-        min_depth = float('inf')
-        max_depth = float('-inf')
-
-        for row in stats_results:
-            row_dict = dict(row)
-            total_count += row_dict['count']
-            qc_flag = row_dict['qc_flag']
-
-            if qc_flag is not None:
-                qc_summary[str(qc_flag)] = row_dict['qc_count']
-
-            if row_dict['min_depth'] is not None:
-                min_depth = min(min_depth, row_dict['min_depth'])
-            if row_dict['max_depth'] is not None:
-                max_depth = max(max_depth, row_dict['max_depth'])
-
-        # Get overall statistics (for good quality data only per ARGO standards)
-        overall_stats_query = """
-        SELECT
-            AVG(value) as mean,
-            STDDEV(value) as std,
-            MIN(value) as min_value,
-            MAX(value) as max_value
-        FROM observations
-        WHERE profile_id = $1 AND parameter = $2 AND qc_flag IN (1, 2)  -- ARGO QC: Only good and probably good data
-        """
-
-        overall_result = await db_manager.fetch_with_retry(overall_stats_query, profile_id, variable)
-        overall_dict = dict(overall_result[0]) if overall_result else {}
-
-        # Handle edge cases
-        if min_depth == float('inf'):
-            min_depth = 0.0
-        if max_depth == float('-inf'):
-            max_depth = 0.0
+        # QC flag counts
+        flags, flag_counts = np.unique(qc_flags[qc_flags >= 0], return_counts=True)
+        qc_summary = {str(flag): int(count) for flag, count in zip(flags, flag_counts)}
+
+        # Depth range across all observations
+        known_depths = depths[~np.isnan(depths)]
+        min_depth = float(known_depths.min()) if known_depths.size else 0.0
+        max_depth = float(known_depths.max()) if known_depths.size else 0.0
+
+        # Overall statistics (for good quality data only per ARGO standards)
+        good_values = values[np.isin(qc_flags, (1, 2)) & ~np.isnan(values)]
+        overall_dict = {}
+        if good_values.size:
+            overall_dict = {
+                "mean": good_values.mean(),
+                "std": good_values.std(ddof=1) if good_values.size > 1 else None,  # Sample stddev, as Postgres STDDEV
+                "min_value": good_values.min(),
+                "max_value": good_values.max()
+            }
 
         return VariableStats(
             profile_id=profile_id,
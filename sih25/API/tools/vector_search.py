@@ -3,19 +3,58 @@ Vector Search Tools for MCP Integration
 Provides semantic search capabilities for the ARGO AI agent
 """
 
+import time
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from dataclasses import dataclass
+from functools import lru_cache
 import json
 
 from pydantic import BaseModel, Field
 
 from sih25.DATAOPS.METADATA.vector_store import get_vector_store
 from sih25.API.models import ToolResponse
+from sih25.API.tools._query_cache import SemanticCache, create_query_cache
+from sih25.API.tools._search_batcher import SearchBatcher
 
 logger = logging.getLogger(__name__)
 
 
+# Static per-tool metadata; ToolResponse copies dicts on validation, so sharing is safe
+_TOOL_META_SEMANTIC = {"tool": "semantic_search_profiles"}
+_TOOL_META_SIMILAR = {"tool": "find_similar_profiles"}
+_TOOL_META_DESCRIPTION = {"tool": "search_by_description"}
+_TOOL_META_HYBRID = {"tool": "hybrid_search"}
+_TOOL_META_STATS = {"tool": "get_vector_store_stats"}
+
+# Timestamps only change once per second, so the ISO string is cached per second
+_NOW_CACHE = {"second": 0, "iso": ""}
+
+
+def _iso_now_cached() -> str:
+    """Current local time as an ISO string, recomputed at most once per second"""
+    second = int(time.time())
+    if _NOW_CACHE["second"] != second:
+        _NOW_CACHE["iso"] = datetime.fromtimestamp(second).isoformat()
+        _NOW_CACHE["second"] = second
+    return _NOW_CACHE["iso"]
+
+
+def _trunc(text: str, max_length: int) -> str:
+    """Truncate text to max_length characters, appending an ellipsis when cut"""
+    return text if len(text) <= max_length else text[:max_length] + "..."
+
+
+_loads = json.loads
+
+
+@lru_cache(maxsize=1024)
+def _parse_params(parameters_json: str) -> Tuple[str, ...]:
+    """Parse a metadata parameters JSON string; the same few strings recur across profiles"""
+    return tuple(_loads(parameters_json or "[]"))
+
+
 class VectorSearchQuery(BaseModel):
     """Vector search query parameters"""
     query: str = Field(..., description="Natural language search query")
@@ -25,8 +64,9 @@ class VectorSearchQuery(BaseModel):
     time_filter: Optional[str] = Field(None, description="Filter by time period")
 
 
-class ProfileMatch(BaseModel):
-    """Vector search result"""
+@dataclass(frozen=True, slots=True)
+class ProfileMatch:
+    """Vector search result (slotted; inbound validation stays on the pydantic models)"""
     profile_id: str
     similarity_score: float
     metadata: Dict[str, Any]
@@ -37,13 +77,87 @@ class ProfileMatch(BaseModel):
 class VectorSearchTools:
     """Vector search tools for AI agent"""
 
-    def __init__(self):
+    def __init__(self, semantic_cache_threshold: float = 0.95, quantization: Optional[str] = None):
         self.vector_store = None
+        self.quantization = quantization
+        self.query_cache = create_query_cache()
+        self.semantic_cache = SemanticCache(threshold=semantic_cache_threshold)
+        self.search_batcher = SearchBatcher(self._batch_search)
 
     async def _ensure_vector_store(self):
         """Ensure vector store is initialized"""
         if self.vector_store is None:
-            self.vector_store = await get_vector_store()
+            self.vector_store = await get_vector_store(quantization=self.quantization)
+            self.vector_store.on_change.append(self._invalidate_caches)
+
+    def _invalidate_caches(self, profile_ids: List[str]) -> None:
+        """Drop cached search results after the vector store changes
+
+        Newly added profiles can enter any cached result set, so everything is
+        invalidated rather than only entries containing profile_ids.
+        """
+        self.query_cache.invalidate_all()
+        self.semantic_cache.clear()
+        logger.info(f"Vector search caches invalidated ({len(profile_ids)} profiles changed)")
+
+    async def _batch_search(
+        self,
+        queries: List[str],
+        query_embeddings: List[Optional[List[float]]],
+        **options: Any
+    ) -> List[List[Dict[str, Any]]]:
+        """Send a coalesced group of searches to the vector store in one call"""
+        return await self.vector_store.batch_search(
+            queries=queries,
+            query_embeddings=query_embeddings,
+            **options
+        )
+
+    async def _semantic_search(
+        self,
+        query: str,
+        limit: int,
+        where_filters: Optional[Dict[str, Any]] = None,
+        similarity_threshold: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Run a vector store semantic search, serving repeat queries from the cache"""
+        # Similarity is 1 - distance, so the threshold is applied as a max distance
+        distance_threshold = 1 - similarity_threshold if similarity_threshold is not None else None
+
+        cache_key = self.query_cache.make_key(query, limit, where_filters, distance_threshold)
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Fall back to the approximate cache, which catches paraphrased queries
+        context = self.semantic_cache.make_context(limit, where_filters, distance_threshold)
+        try:
+            query_embedding = await self.vector_store.embed_query(query)
+        except Exception as e:
+            logger.warning(f"Query embedding failed, skipping semantic cache: {e}")
+            query_embedding = None
+
+        if query_embedding is not None:
+            cached = self.semantic_cache.get(query_embedding, context)
+            if cached is not None:
+                self.query_cache.put(cache_key, cached)
+                return cached
+
+        # Concurrent cache misses are coalesced into one vector store query
+        matches = await self.search_batcher.search(
+            query=query,
+            query_embedding=query_embedding,
+            limit=limit,
+            where_filters=where_filters,
+            distance_threshold=distance_threshold
+        )
+
+        # Empty results may come from a swallowed search error, so don't cache them
+        if matches:
+            self.query_cache.put(cache_key, matches)
+            if query_embedding is not None:
+                self.semantic_cache.put(query_embedding, context, matches)
+        return matches
 
     async def semantic_search_profiles(
         self,
@@ -72,22 +186,17 @@ class VectorSearchTools:
             if region_filter:
                 where_filters["region"] = region_filter.lower()
 
-            # Perform semantic search
-            matches = await self.vector_store.semantic_search(
+            # Perform semantic search; matches below the threshold are dropped by the vector store
+            matches = await self._semantic_search(
                 query=query,
                 limit=limit,
-                where_filters=where_filters if where_filters else None
+                where_filters=where_filters if where_filters else None,
+                similarity_threshold=similarity_threshold
             )
 
-            # Filter by similarity threshold
-            filtered_matches = [
-                match for match in matches
-                if match["similarity"] >= similarity_threshold
-            ]
-
             # Format results for AI agent
             results = []
-            for match in filtered_matches:
+            for match in matches:
                 profile_data = {
                     "profile_id": match["profile_id"],
                     "similarity_score": round(match["similarity"], 3),
@@ -98,8 +207,8 @@ class VectorSearchTools:
                     },
                     "timestamp": match["metadata"].get("timestamp", ""),
                     "region": match["metadata"].get("region", "unknown"),
-                    "parameters": __import__('json').loads(match["metadata"].get("parameters", "[]")),
-                    "summary": match["summary"][:200] + "..." if len(match["summary"]) > 200 else match["summary"],
+                    "parameters": list(_parse_params(match["metadata"].get("parameters", "[]"))),
+                    "summary": _trunc(match["summary"], 200),
                     "match_reason": f"Semantic similarity: {match['similarity']:.1%}"
                 }
                 results.append(profile_data)
@@ -112,9 +221,8 @@ class VectorSearchTools:
                     "search_type": "semantic",
                     "profiles": results
                 },
-                metadata={
-                    "tool": "semantic_search_profiles",
-                    "search_time": datetime.now().isoformat(),
+                metadata=_TOOL_META_SEMANTIC | {
+                    "search_time": _iso_now_cached(),
                     "filters_applied": where_filters,
                     "similarity_threshold": similarity_threshold
                 }
@@ -125,7 +233,7 @@ class VectorSearchTools:
             return ToolResponse(
                 success=False,
                 errors=[{"error": "search_failed", "message": str(e)}],
-                metadata={"tool": "semantic_search_profiles"}
+                metadata=_TOOL_META_SEMANTIC
             )
 
     async def find_similar_profiles(
@@ -152,26 +260,26 @@ class VectorSearchTools:
             matches = await self.vector_store.find_similar_profiles(
                 profile_id=profile_id,
                 similarity_threshold=similarity_threshold,
-                limit=limit
+                limit=limit,
+                exclude_ids=[profile_id]
             )
 
-            # Format results (exclude the original profile)
+            # Format results
             results = []
             for match in matches:
-                if match["profile_id"] != profile_id:
-                    profile_data = {
-                        "profile_id": match["profile_id"],
-                        "similarity_score": round(match["similarity"], 3),
-                        "float_id": match["metadata"].get("float_id", "unknown"),
-                        "location": {
-                            "latitude": match["metadata"].get("latitude", 0.0),
-                            "longitude": match["metadata"].get("longitude", 0.0)
-                        },
-                        "timestamp": match["metadata"].get("timestamp", ""),
-                        "region": match["metadata"].get("region", "unknown"),
-                        "match_reason": f"Profile similarity: {match['similarity']:.1%}"
-                    }
-                    results.append(profile_data)
+                profile_data = {
+                    "profile_id": match["profile_id"],
+                    "similarity_score": round(match["similarity"], 3),
+                    "float_id": match["metadata"].get("float_id", "unknown"),
+                    "location": {
+                        "latitude": match["metadata"].get("latitude", 0.0),
+                        "longitude": match["metadata"].get("longitude", 0.0)
+                    },
+                    "timestamp": match["metadata"].get("timestamp", ""),
+                    "region": match["metadata"].get("region", "unknown"),
+                    "match_reason": f"Profile similarity: {match['similarity']:.1%}"
+                }
+                results.append(profile_data)
 
             return ToolResponse(
                 success=True,
@@ -181,9 +289,8 @@ class VectorSearchTools:
                     "search_type": "similarity",
                     "similar_profiles": results
                 },
-                metadata={
-                    "tool": "find_similar_profiles",
-                    "search_time": datetime.now().isoformat(),
+                metadata=_TOOL_META_SIMILAR | {
+                    "search_time": _iso_now_cached(),
                     "similarity_threshold": similarity_threshold
                 }
             )
@@ -193,7 +300,7 @@ class VectorSearchTools:
             return ToolResponse(
                 success=False,
                 errors=[{"error": "similarity_search_failed", "message": str(e)}],
-                metadata={"tool": "find_similar_profiles"}
+                metadata=_TOOL_META_SIMILAR
             )
 
     async def search_by_description(
@@ -225,15 +332,17 @@ class VectorSearchTools:
             if season:
                 enhanced_query += f" during {season}"
 
-            # Build metadata filters
+            # Build metadata filters (stored region/season are lowercase)
+            region_lc = region.lower() if region else None
+            season_lc = season.lower() if season else None
             where_filters = {}
-            if region:
-                where_filters["region"] = region.lower()
-            if season:
-                where_filters["season"] = season.lower()
+            if region_lc:
+                where_filters["region"] = region_lc
+            if season_lc:
+                where_filters["season"] = season_lc
 
             # Perform search
-            matches = await self.vector_store.semantic_search(
+            matches = await self._semantic_search(
                 query=enhanced_query,
                 limit=limit,
                 where_filters=where_filters if where_filters else None
@@ -254,11 +363,11 @@ class VectorSearchTools:
                     "timestamp": metadata.get("timestamp", ""),
                     "region": metadata.get("region", "unknown"),
                     "season": metadata.get("season", "unknown"),
-                    "summary": match["summary"][:150] + "..." if len(match["summary"]) > 150 else match["summary"],
+                    "summary": _trunc(match["summary"], 150),
                     "context_match": {
                         "description_relevance": match["similarity"],
-                        "region_match": region.lower() == metadata.get("region", "").lower() if region else None,
-                        "season_match": season == metadata.get("season") if season else None
+                        "region_match": region_lc == metadata.get("region") if region_lc else None,
+                        "season_match": season_lc == metadata.get("season") if season_lc else None
                     }
                 }
                 results.append(profile_data)
@@ -272,9 +381,8 @@ class VectorSearchTools:
                     "search_type": "description_based",
                     "profiles": results
                 },
-                metadata={
-                    "tool": "search_by_description",
-                    "search_time": datetime.now().isoformat(),
+                metadata=_TOOL_META_DESCRIPTION | {
+                    "search_time": _iso_now_cached(),
                     "filters": {"region": region, "season": season}
                 }
             )
@@ -284,7 +392,7 @@ class VectorSearchTools:
             return ToolResponse(
                 success=False,
                 errors=[{"error": "description_search_failed", "message": str(e)}],
-                metadata={"tool": "search_by_description"}
+                metadata=_TOOL_META_DESCRIPTION
             )
 
     async def hybrid_search(
@@ -314,73 +422,56 @@ class VectorSearchTools:
         """
         try:
             await self._ensure_vector_store()
-            # Get semantic matches first
-            semantic_matches = await self.vector_store.semantic_search(
+
+            # Push geographic and parameter filters down into the vector store query
+            conditions = []
+            if lat_range:
+                conditions += [{"latitude": {"$gte": lat_range[0]}}, {"latitude": {"$lte": lat_range[1]}}]
+            if lon_range:
+                conditions += [{"longitude": {"$gte": lon_range[0]}}, {"longitude": {"$lte": lon_range[1]}}]
+            if parameters:
+                # has_<PARAM> keys are written at ingestion; collections ingested before that
+                # need `python -m sih25.DATAOPS.METADATA.vector_store backfill-parameter-flags`
+                conditions += [{f"has_{param}": True} for param in parameters]
+
+            where_filters = None
+            if len(conditions) == 1:
+                where_filters = conditions[0]
+            elif conditions:
+                where_filters = {"$and": conditions}
+
+            # Every match already satisfies the structured filters
+            semantic_matches = await self._semantic_search(
                 query=query,
-                limit=limit * 2  # Get more candidates for filtering
+                limit=limit,
+                where_filters=where_filters
             )
 
-            # Apply structured filters
-            filtered_results = []
-            for match in semantic_matches:
-                metadata = match["metadata"]
-
-                # Apply geographic filters
-                if lat_range:
-                    lat = metadata.get("latitude", 0.0)
-                    if not (lat_range[0] <= lat <= lat_range[1]):
-                        continue
-
-                if lon_range:
-                    lon = metadata.get("longitude", 0.0)
-                    if not (lon_range[0] <= lon <= lon_range[1]):
-                        continue
-
-                # Apply parameter filter
-                if parameters:
-                    profile_params = json.loads(metadata.get("parameters", "[]"))
-                    if not all(param in profile_params for param in parameters):
-                        continue
-
-                # Calculate hybrid score
-                semantic_score = match["similarity"]
-
-                # Add structured relevance bonuses
-                structured_score = 0.0
-                if lat_range or lon_range:
-                    # Geographic relevance bonus
-                    structured_score += 0.1
-                if parameters:
-                    # Parameter match bonus
-                    structured_score += 0.1
-
-                # Combine scores
-                hybrid_score = (vector_weight * semantic_score +
-                              (1 - vector_weight) * structured_score)
-
-                match["hybrid_score"] = hybrid_score
-                filtered_results.append(match)
-
-            # Sort by hybrid score and limit results
-            filtered_results.sort(key=lambda x: x["hybrid_score"], reverse=True)
-            final_results = filtered_results[:limit]
+            # Structured relevance bonuses: geographic and parameter matches. The bonus is the
+            # same for every match, so the store's nearest-first order is already hybrid order
+            structured_score = 0.1 * bool(lat_range or lon_range) + 0.1 * bool(parameters)
+            structured_part = (1 - vector_weight) * structured_score
+            final_results = [
+                (vector_weight * match["similarity"] + structured_part, match)
+                for match in semantic_matches[:limit]
+            ]
 
             # Format for response
             results = []
-            for match in final_results:
+            for hybrid_score, match in final_results:
                 metadata = match["metadata"]
                 profile_data = {
                     "profile_id": match["profile_id"],
-                    "hybrid_score": round(match["hybrid_score"], 3),
+                    "hybrid_score": round(hybrid_score, 3),
                     "semantic_score": round(match["similarity"], 3),
                     "float_id": metadata.get("float_id", "unknown"),
                     "location": {
                         "latitude": metadata.get("latitude", 0.0),
                         "longitude": metadata.get("longitude", 0.0)
                     },
-                    "parameters": json.loads(metadata.get("parameters", "[]")),
+                    "parameters": list(_parse_params(metadata.get("parameters", "[]"))),
                     "region": metadata.get("region", "unknown"),
-                    "summary": match["summary"][:120] + "..." if len(match["summary"]) > 120 else match["summary"]}
+                    "summary": _trunc(match["summary"], 120)}
                 results.append(profile_data)
 
             return ToolResponse(
@@ -392,9 +483,8 @@ class VectorSearchTools:
                     "vector_weight": vector_weight,
                     "profiles": results
                 },
-                metadata={
-                    "tool": "hybrid_search",
-                    "search_time": datetime.now().isoformat(),
+                metadata=_TOOL_META_HYBRID | {
+                    "search_time": _iso_now_cached(),
                     "filters": {
                         "lat_range": lat_range,
                         "lon_range": lon_range,
@@ -409,7 +499,7 @@ class VectorSearchTools:
             return ToolResponse(
                 success=False,
                 errors=[{"error": "hybrid_search_failed", "message": str(e)}],
-                metadata={"tool": "hybrid_search"}
+                metadata=_TOOL_META_HYBRID
             )
 
     async def get_vector_store_stats(self) -> ToolResponse:
@@ -421,9 +511,8 @@ class VectorSearchTools:
             return ToolResponse(
                 success=True,
                 data=stats,
-                metadata={
-                    "tool": "get_vector_store_stats",
-                    "retrieved_at": datetime.now().isoformat()
+                metadata=_TOOL_META_STATS | {
+                    "retrieved_at": _iso_now_cached()
                 }
             )
 
@@ -432,7 +521,7 @@ class VectorSearchTools:
             return ToolResponse(
                 success=False,
                 errors=[{"error": "stats_failed", "message": str(e)}],
-                metadata={"tool": "get_vector_store_stats"}
+                metadata=_TOOL_META_STATS
             )
 
 
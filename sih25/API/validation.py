@@ -5,13 +5,53 @@ Enforces scientific standards and data quality protocols for ARGO oceanographic
 """
 
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 
 from sih25.API.models import DataMode, QCFlag, DataQualityWarning
+from sih25.API.geo import find_fast_movements
 
 logger = logging.getLogger(__name__)
 
+_DATA_MODES = {mode.value: mode for mode in DataMode}
+
+# Sentinel codes for records without an integer QC flag
+_QC_MISSING = -1
+_QC_OTHER = -2
+
+_RAPID_SAMPLING_SECONDS = timedelta(hours=6).total_seconds()
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# ISO timestamp strings recur across validators and requests; parse each once
+_parse_iso = lru_cache(maxsize=65536)(datetime.fromisoformat)
+
+
+def _to_datetime(value: Any) -> Any:
+    """Parse ISO timestamp strings (cached); other values pass through"""
+    return _parse_iso(value) if isinstance(value, str) else value
+
+
+def _warn(**fields: Any) -> DataQualityWarning:
+    """Build a warning from internally produced fields, skipping Pydantic validation"""
+    return DataQualityWarning.model_construct(**fields)
+
+
+def _or_nan(value: Optional[float]) -> float:
+    """Map a missing numeric value to NaN"""
+    return np.nan if value is None else value
+
+
+def _epoch_seconds(timestamp: datetime) -> float:
+    """Seconds since the Unix epoch for naive (assumed UTC) or aware datetimes"""
+    return (timestamp - (_EPOCH if timestamp.tzinfo is None else _EPOCH_UTC)).total_seconds()
+
 
 class ARGOProtocolValidator:
     """
@@ -62,6 +102,21 @@ class ARGOProtocolValidator:
         'PH_IN_SITU_TOTAL': {'min': 7.0, 'max': 8.5, 'units': 'pH units'}
     }
 
+    # Per-record warnings beyond this are summarized instead of listed
+    MAX_DETAIL_WARNINGS = 1000
+
+    # Static part of the provenance block added to every response
+    PROVENANCE_BASE = MappingProxyType({
+        "argo_compliance": True,
+        "qc_standards": "ARGO Data Management Team",
+        "data_source": "SIH25 MCP Tool Server",
+        "quality_control": MappingProxyType({
+            "qc_flag_filtering": "Bad data (QC=4) excluded",
+            "data_mode_preference": "Delayed > Adjusted > Real-time",
+            "parameter_validation": "ARGO standard ranges applied"
+        })
+    })
+
     def __init__(self):
         self.logger = logger
 
@@ -76,51 +131,50 @@ class ARGOProtocolValidator:
             Tuple of (filtered_data, warnings)
         """
         warnings = []
-        good_data = []
-        bad_data_count = 0
-        questionable_data_count = 0
 
-        for record in data:
-            qc_flag = record.get('qc_flag')
-
-            if qc_flag is None:
+        # Flag codes as one int array; missing and non-integer flags get sentinel codes
+        flags = np.fromiter(
+            (_QC_MISSING if flag is None else flag if isinstance(flag, int) else _QC_OTHER
+             for flag in (record.get('qc_flag') for record in data)),
+            dtype=np.int64, count=len(data)
+        )
+        bad = flags == QCFlag.BAD
+        questionable = flags == QCFlag.PROBABLY_BAD
+        missing = flags == _QC_MISSING
+        bad_data_count = int(bad.sum())
+        questionable_data_count = int(questionable.sum())
+
+        # Only records without flags or with questionable flags get per-record warnings
+        for i in np.flatnonzero(missing | questionable).tolist():
+            record = data[i]
+            if missing[i]:
                 # No QC flag - include with warning
-                warnings.append(DataQualityWarning(
+                warnings.append(_warn(
                     message="Data without QC flags detected",
                     affected_data={"record_id": record.get('id', 'unknown')},
                     recommendation="Use caution - QC status unknown"
                 ))
-                good_data.append(record)
-                continue
-
-            qc_flag_enum = QCFlag(qc_flag) if isinstance(qc_flag, int) else qc_flag
-
-            if qc_flag_enum == QCFlag.BAD:
-                bad_data_count += 1
-                # Skip bad data entirely
-                continue
-
-            elif qc_flag_enum == QCFlag.PROBABLY_BAD:
-                questionable_data_count += 1
+            else:
                 # Include but warn about questionable data
-                warnings.append(DataQualityWarning(
+                warnings.append(_warn(
                     message="Questionable quality data included",
-                    affected_data={"qc_flag": qc_flag, "record_id": record.get('id', 'unknown')},
+                    affected_data={"qc_flag": record['qc_flag'], "record_id": record.get('id', 'unknown')},
                     recommendation="Consider filtering out if high precision required"
                 ))
 
-            good_data.append(record)
+        # Skip bad data entirely
+        good_data = [data[i] for i in np.flatnonzero(~bad).tolist()] if bad_data_count else list(data)
 
         # Add summary warnings
         if bad_data_count > 0:
-            warnings.append(DataQualityWarning(
+            warnings.append(_warn(
                 message=f"Filtered out {bad_data_count} records with bad QC flags",
                 affected_data={"filtered_count": bad_data_count},
                 recommendation="Bad quality data excluded per ARGO standards"
             ))
 
         if questionable_data_count > 0:
-            warnings.append(DataQualityWarning(
+            warnings.append(_warn(
                 message=f"Dataset includes {questionable_data_count} records with questionable QC",
                 affected_data={"questionable_count": questionable_data_count},
                 recommendation="Review data quality requirements for your use case"
@@ -140,42 +194,34 @@ class ARGOProtocolValidator:
         """
         warnings = []
 
-        # Sort by data mode priority and timestamp
-        def sort_key(profile):
+        # One pass: resolve each profile's (priority, timestamp) sort key and count modes
+        priorities = self.DATA_MODE_PRIORITY
+        keys = [None] * len(profiles)
+        mode_counts = {}
+        for i, profile in enumerate(profiles):
             data_mode = profile.get('data_mode', DataMode.REAL_TIME)
-            if isinstance(data_mode, str):
-                data_mode = DataMode(data_mode)
+            if not isinstance(data_mode, DataMode):
+                data_mode = _DATA_MODES.get(data_mode) or DataMode(data_mode)
 
             # Priority: higher data mode priority, then newer timestamp
-            timestamp = profile.get('timestamp', datetime.min)
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp)
+            timestamp = _to_datetime(profile.get('timestamp', datetime.min))
 
-            return (
-                self.DATA_MODE_PRIORITY.get(data_mode, 0),
-                timestamp
-            )
-
-        sorted_profiles = sorted(profiles, key=sort_key, reverse=True)
-
-        # Check data mode distribution
-        mode_counts = {}
-        for profile in profiles:
-            data_mode = profile.get('data_mode', DataMode.REAL_TIME)
-            if isinstance(data_mode, str):
-                data_mode = DataMode(data_mode)
+            keys[i] = (priorities.get(data_mode, 0), timestamp)
             mode_counts[data_mode.value] = mode_counts.get(data_mode.value, 0) + 1
 
+        order = sorted(range(len(profiles)), key=keys.__getitem__, reverse=True)
+        sorted_profiles = [profiles[i] for i in order]
+
         # Generate warnings based on data mode distribution
         if mode_counts.get('R', 0) > mode_counts.get('D', 0):
-            warnings.append(DataQualityWarning(
+            warnings.append(_warn(
                 message="Dataset contains more real-time than delayed-mode data",
                 affected_data={"mode_distribution": mode_counts},
                 recommendation="Delayed-mode data preferred for scientific analysis"
             ))
 
         if 'D' not in mode_counts:
-            warnings.append(DataQualityWarning(
+            warnings.append(_warn(
                 message="No delayed-mode data available",
                 affected_data={"available_modes": list(mode_counts.keys())},
                 recommendation="Results may have lower accuracy without delayed-mode processing"
@@ -194,42 +240,48 @@ class ARGOProtocolValidator:
             Tuple of (validated_observations, warnings)
         """
         warnings = []
-        valid_observations = []
-        outlier_count = 0
-
-        for obs in observations:
-            parameter = obs.get('parameter')
-            value = obs.get('value')
-
-            if parameter not in self.PARAMETER_RANGES or value is None:
-                valid_observations.append(obs)
-                continue
-
-            param_range = self.PARAMETER_RANGES[parameter]
-
-            if not (param_range['min'] <= value <= param_range['max']):
-                outlier_count += 1
-                warnings.append(DataQualityWarning(
-                    message=f"Parameter {parameter} value outside expected range",
-                    affected_data={
-                        "parameter": parameter,
-                        "value": value,
-                        "expected_range": f"{param_range['min']}-{param_range['max']} {param_range['units']}",
-                        "observation_id": obs.get('id', 'unknown')
-                    },
-                    recommendation="Verify measurement accuracy or check for instrument errors"
-                ))
 
-            valid_observations.append(obs)
+        # Structure-of-arrays: integer parameter index (-1 = unchecked) and value per observation
+        n = len(observations)
+        param_idx = np.fromiter(
+            (_PARAM_IDX.get(obs.get('parameter'), -1) if obs.get('value') is not None else -1
+             for obs in observations),
+            dtype=np.intp, count=n
+        )
+        values = np.fromiter(
+            (obs['value'] if idx >= 0 else 0.0 for obs, idx in zip(observations, param_idx.tolist())),
+            dtype=np.float64, count=n
+        )
+
+        # One range check over all observations, bounds gathered by parameter index;
+        # NaN counts as out of range
+        in_range = (values >= _PARAM_LO[param_idx]) & (values <= _PARAM_HI[param_idx])
+        outliers = np.flatnonzero((param_idx >= 0) & ~in_range)
+
+        # Only outliers reach Python-level warning construction, capped at MAX_DETAIL_WARNINGS
+        detailed = outliers[:self.MAX_DETAIL_WARNINGS]
+        for i, k in zip(detailed.tolist(), param_idx[detailed].tolist()):
+            obs = observations[i]
+            warnings.append(_warn(
+                message=_RANGE_MESSAGES[k],
+                affected_data={
+                    **_RANGE_AFFECTED[k],
+                    "value": obs['value'],
+                    "observation_id": obs.get('id', 'unknown')
+                },
+                recommendation="Verify measurement accuracy or check for instrument errors"
+            ))
 
+        outlier_count = int(outliers.size)
         if outlier_count > 0:
-            warnings.append(DataQualityWarning(
+            warnings.append(_warn(
                 message=f"Found {outlier_count} observations with values outside expected ranges",
-                affected_data={"outlier_count": outlier_count},
+                affected_data={"outlier_count": outlier_count, "detailed_warnings": int(detailed.size)},
                 recommendation="Review outliers for potential data quality issues"
             ))
 
-        return valid_observations, warnings
+        # Range violations are reported, not filtered
+        return list(observations), warnings
 
     def validate_temporal_consistency(self, profiles: List[Dict[str, Any]]) -> List[DataQualityWarning]:
         """
@@ -246,36 +298,35 @@ class ARGOProtocolValidator:
         if len(profiles) < 2:
             return warnings
 
-        # Sort by timestamp
-        sorted_profiles = sorted(profiles, key=lambda p: p.get('timestamp', datetime.min))
-
-        # Check for suspiciously rapid sampling
-        for i in range(1, len(sorted_profiles)):
-            current_time = sorted_profiles[i].get('timestamp')
-            previous_time = sorted_profiles[i-1].get('timestamp')
-
-            if current_time and previous_time:
-                time_diff = current_time - previous_time
-
-                # ARGO floats typically cycle every 10 days
-                if time_diff < timedelta(hours=6):
-                    warnings.append(DataQualityWarning(
-                        message="Unusually rapid profile sampling detected",
-                        affected_data={
-                            "profile_1": sorted_profiles[i-1].get('profile_id'),
-                            "profile_2": sorted_profiles[i].get('profile_id'),
-                            "time_diff_hours": time_diff.total_seconds() / 3600
-                        },
-                        recommendation="Verify profile timestamps for potential data issues"
-                    ))
+        # Sort by timestamp (ISO strings parsed once, through the shared cache)
+        timestamps = [_to_datetime(p.get('timestamp', datetime.min)) for p in profiles]
+        seconds = np.fromiter((_epoch_seconds(t) for t in timestamps), dtype=np.float64, count=len(timestamps))
+        order = np.argsort(seconds, kind='stable').tolist()
+        sorted_profiles = [profiles[i] for i in order]
+        sorted_times = [timestamps[i] for i in order]
+
+        # Check for suspiciously rapid sampling: all gaps in one diff
+        # (ARGO floats typically cycle every 10 days)
+        gaps = np.diff(seconds[order])
+        for i in np.flatnonzero(gaps < _RAPID_SAMPLING_SECONDS).tolist():
+            time_diff = sorted_times[i + 1] - sorted_times[i]
+            warnings.append(_warn(
+                message="Unusually rapid profile sampling detected",
+                affected_data={
+                    "profile_1": sorted_profiles[i].get('profile_id'),
+                    "profile_2": sorted_profiles[i + 1].get('profile_id'),
+                    "time_diff_hours": time_diff.total_seconds() / 3600
+                },
+                recommendation="Verify profile timestamps for potential data issues"
+            ))
 
         # Check for data gaps
-        total_timespan = sorted_profiles[-1].get('timestamp') - sorted_profiles[0].get('timestamp')
+        total_timespan = sorted_times[-1] - sorted_times[0]
         expected_profiles = total_timespan.days / 10  # Expected ~10-day cycle
         actual_profiles = len(profiles)
 
         if actual_profiles < expected_profiles * 0.5:  # Less than 50% of expected profiles
-            warnings.append(DataQualityWarning(
+            warnings.append(_warn(
                 message="Significant data gaps detected in time series",
                 affected_data={
                     "timespan_days": total_timespan.days,
@@ -303,49 +354,40 @@ class ARGOProtocolValidator:
             return warnings
 
         # Check for impossible movements (floats drift, don't teleport)
-        for i in range(1, len(profiles)):
-            current = profiles[i]
-            previous = profiles[i-1]
-
-            curr_lat = current.get('latitude')
-            curr_lon = current.get('longitude')
-            curr_time = current.get('timestamp')
-
-            prev_lat = previous.get('latitude')
-            prev_lon = previous.get('longitude')
-            prev_time = previous.get('timestamp')
-
-            if all([curr_lat, curr_lon, curr_time, prev_lat, prev_lon, prev_time]):
-                # Calculate distance using haversine formula (simplified)
-                from math import radians, cos, sin, asin, sqrt
-
-                def haversine(lon1, lat1, lon2, lat2):
-                    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-                    dlon = lon2 - lon1
-                    dlat = lat2 - lat1
-                    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                    c = 2 * asin(sqrt(a))
-                    r = 6371  # Earth radius in km
-                    return c * r
-
-                distance_km = haversine(prev_lon, prev_lat, curr_lon, curr_lat)
-                time_diff = curr_time - prev_time
-
-                if time_diff.total_seconds() > 0:
-                    speed_kmh = distance_km / (time_diff.total_seconds() / 3600)
-
-                    # ARGO floats typically drift at ~0.1-1 km/h
-                    if speed_kmh > 5.0:  # Suspiciously fast movement
-                        warnings.append(DataQualityWarning(
-                            message="Unusually rapid float movement detected",
-                            affected_data={
-                                "profile_1": previous.get('profile_id'),
-                                "profile_2": current.get('profile_id'),
-                                "distance_km": round(distance_km, 2),
-                                "speed_kmh": round(speed_kmh, 2)
-                            },
-                            recommendation="Verify position accuracy or check for data processing errors"
-                        ))
+        n = len(profiles)
+        # Missing coordinates become NaN; 0.0 is a valid equator/prime-meridian position
+        lats = np.fromiter((_or_nan(p.get('latitude')) for p in profiles), dtype=np.float64, count=n)
+        lons = np.fromiter((_or_nan(p.get('longitude')) for p in profiles), dtype=np.float64, count=n)
+        has_time = np.fromiter((p.get('timestamp') is not None for p in profiles), dtype=bool, count=n)
+        present = np.isfinite(lats) & np.isfinite(lons) & has_time
+        seconds = np.fromiter(
+            (_epoch_seconds(p['timestamp']) if present[i] else np.nan for i, p in enumerate(profiles)),
+            dtype=np.float64, count=n
+        )
+
+        # ARGO floats typically drift at ~0.1-1 km/h; flag suspiciously fast movement
+        # (pairs missing a position or time are skipped)
+        fast_idx, distance_km, speed_kmh = find_fast_movements(lats, lons, seconds, present, 5.0)
+
+        cap = self.MAX_DETAIL_WARNINGS
+        for i, distance, speed in zip(fast_idx[:cap].tolist(), distance_km[:cap].tolist(), speed_kmh[:cap].tolist()):
+            warnings.append(_warn(
+                message="Unusually rapid float movement detected",
+                affected_data={
+                    "profile_1": profiles[i].get('profile_id'),
+                    "profile_2": profiles[i + 1].get('profile_id'),
+                    "distance_km": round(distance, 2),
+                    "speed_kmh": round(speed, 2)
+                },
+                recommendation="Verify position accuracy or check for data processing errors"
+            ))
+
+        if fast_idx.size > cap:
+            warnings.append(_warn(
+                message=f"Found {fast_idx.size} unusually rapid float movements",
+                affected_data={"movement_count": int(fast_idx.size), "detailed_warnings": cap},
+                recommendation="Verify position accuracy or check for data processing errors"
+            ))
 
         return warnings
 
@@ -361,26 +403,32 @@ class ARGOProtocolValidator:
             Enhanced data with provenance
         """
         provenance = {
-            "argo_compliance": True,
-            "qc_standards": "ARGO Data Management Team",
-            "processing_timestamp": datetime.utcnow().isoformat(),
-            "data_source": "SIH25 MCP Tool Server",
-            "quality_control": {
-                "qc_flag_filtering": "Bad data (QC=4) excluded",
-                "data_mode_preference": "Delayed > Adjusted > Real-time",
-                "parameter_validation": "ARGO standard ranges applied"
-            },
+            **self.PROVENANCE_BASE,
+            "quality_control": dict(self.PROVENANCE_BASE["quality_control"]),
+            "processing_timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
             "processing_steps": processing_info
         }
 
         # Add to existing provenance or create new
-        if 'data_provenance' in data:
-            data['data_provenance'].update(provenance)
-        else:
-            data['data_provenance'] = provenance
+        data.setdefault('data_provenance', {}).update(provenance)
 
         return data
 
 
+# Integer-indexed parameter range tables for the vectorized range check
+_PARAM_IDX = {name: i for i, name in enumerate(ARGOProtocolValidator.PARAMETER_RANGES)}
+_PARAM_LO = np.array([r['min'] for r in ARGOProtocolValidator.PARAMETER_RANGES.values()], dtype=np.float64)
+_PARAM_HI = np.array([r['max'] for r in ARGOProtocolValidator.PARAMETER_RANGES.values()], dtype=np.float64)
+
+# Prebuilt per-parameter warning text, indexed like _PARAM_IDX
+_RANGE_MESSAGES = [
+    f"Parameter {name} value outside expected range" for name in ARGOProtocolValidator.PARAMETER_RANGES
+]
+_RANGE_AFFECTED = [
+    {"parameter": name, "expected_range": f"{r['min']}-{r['max']} {r['units']}"}
+    for name, r in ARGOProtocolValidator.PARAMETER_RANGES.items()
+]
+
+
 # Global validator instance
 argo_validator = ARGOProtocolValidator()
\ No newline at end of file
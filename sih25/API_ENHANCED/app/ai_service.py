@@ -2,14 +2,32 @@
 AI Service for FloatChat - Enhanced with Natural Language to SQL and Pipecat Integration
 """
 import os
+import re
+import asyncio
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from openai import AsyncOpenAI
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from .crud import get_profiles
+from sqlalchemy import select, text
+from .models import Profile
 from .rag import retrieve, summarize
 import json
 
+# Row cap on generated SQL, applied by wrapping it in an outer SELECT
+_MAX_DYNAMIC_ROWS = 1000
+
+# Generated SQL cache; bump the schema version whenever the profiles schema changes
+_SQL_CACHE_SIZE = 1024
+_SQL_SCHEMA_VERSION = "profiles-v1"
+_WHITESPACE = re.compile(r'\s+')
+
+# Generated SQL must be a single SELECT over profiles, with no statement separators or comments
+_SAFE_SQL = re.compile(r'^\s*SELECT\b[\s\S]*\bprofiles\b', re.IGNORECASE)
+_UNSAFE_SQL = re.compile(r';|--|/\*')
+
+# Intent keys that bound the data-context query
+_BBOX_KEYS = ('lat_min', 'lat_max', 'lon_min', 'lon_max')
+
 class FloatChatAI:
     def __init__(self):
         # Use the proper OpenAI configuration from environment
@@ -25,6 +43,7 @@ class FloatChatAI:
             base_url=openai_base_url  # Use hyperbolic.xyz or other provider
         )
         self.model = openai_model
+        self._sql_cache: "OrderedDict[tuple, str]" = OrderedDict()
 
         # Enhanced system prompt from Pipecat voice pipeline
         self.system_prompt = """You are FloatChat, an expert oceanographic data assistant specializing in ARGO float measurements. You have deep knowledge of ocean science and help users discover and understand ocean data through natural conversation.
@@ -39,8 +58,8 @@ class FloatChatAI:
 ### Database Schema:
 Table: profiles
 - lat (Float) - latitude, lon (Float) - longitude
-- depth (Integer), temperature (Float), salinity (Float)
-- month (BigInteger), year (BigInteger)
+- depth (SmallInteger), temperature (Float), salinity (Float)
+- month (SmallInteger), year (SmallInteger)
 
 ### Ocean Regions:
 - **Equatorial** (-5° to 5°): High temperature, strong currents
@@ -56,7 +75,16 @@ Table: profiles
 Remember: You can dynamically query the database and provide intelligent, contextual responses."""
 
     async def natural_language_to_sql(self, query: str) -> Optional[str]:
-        """Convert natural language to SQL using existing AI models"""
+        """Convert natural language to SQL using existing AI models
+
+        Results are cached (LRU) by normalized query text, model and schema version.
+        """
+        cache_key = (_SQL_SCHEMA_VERSION, self.model, _WHITESPACE.sub(' ', query.strip().lower()))
+        cached = self._sql_cache.get(cache_key)
+        if cached is not None:
+            self._sql_cache.move_to_end(cache_key)
+            return cached
+
         try:
             sql_prompt = f"""Convert this natural language query about ocean data into a precise SQL query.
 
@@ -77,10 +105,13 @@ Return only the SQL query, no explanation."""
             )
 
             sql_query = response.choices[0].message.content.strip()
-            sql_query = sql_query.replace("```sql", "").replace("```", "").strip()
+            sql_query = sql_query.replace("```sql", "").replace("```", "").strip().rstrip(';').rstrip()
 
             # Validate SQL
-            if sql_query.upper().startswith("SELECT") and "profiles" in sql_query.lower():
+            if _SAFE_SQL.match(sql_query) and not _UNSAFE_SQL.search(sql_query):
+                self._sql_cache[cache_key] = sql_query
+                if len(self._sql_cache) > _SQL_CACHE_SIZE:
+                    self._sql_cache.popitem(last=False)
                 return sql_query
             return None
 
@@ -89,17 +120,26 @@ Return only the SQL query, no explanation."""
             return None
 
     async def execute_dynamic_query(self, db: Session, sql_query: str) -> Dict[str, Any]:
-        """Execute AI-generated SQL query safely"""
+        """Execute AI-generated SQL query safely
+
+        The query is wrapped as a subquery so the row cap holds whatever its own
+        LIMIT, trailing clauses or comments; one extra row is fetched to tell
+        whether the result was truncated.
+        """
         try:
-            result = db.execute(text(sql_query))
-            rows = result.fetchall()
-            columns = result.keys()
-            data = [dict(zip(columns, row)) for row in rows]
+            sql_query = f"SELECT * FROM (\n{sql_query.rstrip().rstrip(';')}\n) AS q LIMIT :n"
+
+            # RowMapping views give dict-style access without building a dict per row
+            result = db.execute(text(sql_query), {"n": _MAX_DYNAMIC_ROWS + 1})
+            data = result.mappings().all()
+            truncated = len(data) > _MAX_DYNAMIC_ROWS
+            data = data[:_MAX_DYNAMIC_ROWS]
 
             return {
                 "success": True,
                 "data": data,
                 "count": len(data),
+                "truncated": truncated,
                 "sql_executed": sql_query
             }
         except Exception as e:
@@ -108,10 +148,15 @@ Return only the SQL query, no explanation."""
 
     async def get_ai_response(self, user_message: str, data_context: Optional[str] = None, db: Session = None) -> Dict[str, Any]:
         """Enhanced AI response with dynamic SQL generation - JARVIS-like intelligence"""
+        rag_task = None
         try:
+            # Steps 1 and 4 are independent: generate SQL while RAG retrieval runs in a thread
+            rag_task = asyncio.create_task(self._retrieve_context(user_message)) if db else None
+
             # Step 1: Generate SQL from natural language
             sql_query = await self.natural_language_to_sql(user_message)
             dynamic_data = []
+            truncated = False
             enhanced_context = data_context or ""
 
             if sql_query and db:
@@ -120,6 +165,7 @@ Return only the SQL query, no explanation."""
 
                 if query_result["success"] and query_result["data"]:
                     dynamic_data = query_result["data"]
+                    truncated = query_result["truncated"]
 
                     # Step 3: Create enhanced context from dynamic results
                     if dynamic_data:
@@ -127,13 +173,7 @@ Return only the SQL query, no explanation."""
                         enhanced_context = f"Dynamic query results: {stats}"
 
             # Step 4: Get additional RAG context
-            rag_context = ""
-            if db:
-                try:
-                    retrieved_docs = retrieve(user_message, k=3)
-                    rag_context = "\n".join([doc.get('text', '') for doc in retrieved_docs])
-                except Exception as e:
-                    print(f"RAG retrieval error: {e}")
+            rag_context = await rag_task if rag_task else ""
 
             # Step 5: Generate intelligent AI response
             messages = [{"role": "system", "content": self.system_prompt}]
@@ -163,8 +203,9 @@ Return only the SQL query, no explanation."""
                 "answer": ai_answer,
                 "model_used": self.model,
                 "sql_generated": sql_query,
-                "dynamic_data": dynamic_data[:10] if dynamic_data else [],  # First 10 for frontend
+                "dynamic_data": [dict(row) for row in dynamic_data[:10]],  # First 10 for frontend
                 "total_records": len(dynamic_data) if dynamic_data else 0,
+                "truncated": truncated,
                 "context_used": bool(context_parts),
                 "jarvis_mode": True
             }
@@ -191,28 +232,71 @@ Return only the SQL query, no explanation."""
                 "error": str(e)
             }
 
+        finally:
+            # Don't leave retrieval running (or its result unretrieved) when an earlier step fails
+            if rag_task and not rag_task.done():
+                rag_task.cancel()
+
+    async def _retrieve_context(self, user_message: str) -> str:
+        """Retrieve knowledge base context off the event loop, joined into one string"""
+        try:
+            retrieved_docs = await asyncio.to_thread(retrieve, user_message, 3)
+            return "\n".join(doc.get('text', '') for doc in retrieved_docs)
+        except Exception as e:
+            print(f"RAG retrieval error: {e}")
+            return ""
+
     def _generate_data_insights(self, data: List[Dict]) -> str:
         """Generate insights from dynamic query results"""
         if not data:
             return "No data found"
 
         count = len(data)
-        temps = [float(row.get('temperature', 0)) for row in data if row.get('temperature') is not None]
-        sals = [float(row.get('salinity', 0)) for row in data if row.get('salinity') is not None]
-        depths = [float(row.get('depth', 0)) for row in data if row.get('depth') is not None]
+
+        # Single pass with running (n, sum, min, max) per column
+        inf = float('inf')
+        t_n = s_n = d_n = 0
+        t_sum = s_sum = 0.0
+        t_min = s_min = d_min = inf
+        t_max = s_max = d_max = -inf
+        for row in data:
+            temp = row.get('temperature')
+            if temp is not None:
+                temp = float(temp)
+                t_n += 1
+                t_sum += temp
+                if temp < t_min:
+                    t_min = temp
+                if temp > t_max:
+                    t_max = temp
+            sal = row.get('salinity')
+            if sal is not None:
+                sal = float(sal)
+                s_n += 1
+                s_sum += sal
+                if sal < s_min:
+                    s_min = sal
+                if sal > s_max:
+                    s_max = sal
+            depth = row.get('depth')
+            if depth is not None:
+                depth = float(depth)
+                d_n += 1
+                if depth < d_min:
+                    d_min = depth
+                if depth > d_max:
+                    d_max = depth
 
         insights = [f"Found {count} profiles"]
 
-        if temps:
-            avg_temp = sum(temps) / len(temps)
-            insights.append(f"Temperature: {avg_temp:.2f}°C avg (range: {min(temps):.2f}-{max(temps):.2f}°C)")
+        if t_n:
+            insights.append(f"Temperature: {t_sum / t_n:.2f}°C avg (range: {t_min:.2f}-{t_max:.2f}°C)")
 
-        if sals:
-            avg_sal = sum(sals) / len(sals)
-            insights.append(f"Salinity: {avg_sal:.2f} PSU avg (range: {min(sals):.2f}-{max(sals):.2f} PSU)")
+        if s_n:
+            insights.append(f"Salinity: {s_sum / s_n:.2f} PSU avg (range: {s_min:.2f}-{s_max:.2f} PSU)")
 
-        if depths:
-            insights.append(f"Depth range: {min(depths):.0f}-{max(depths):.0f}m")
+        if d_n:
+            insights.append(f"Depth range: {d_min:.0f}-{d_max:.0f}m")
 
         return ". ".join(insights)
 
@@ -237,23 +321,26 @@ Return only the SQL query, no explanation."""
     def get_data_context(self, intent: Dict[str, Any], db: Session) -> Optional[str]:
         """Get basic data context - enhanced by dynamic SQL queries"""
         try:
-            if not intent:
+            # Without a bounding box this would just sample arbitrary rows
+            if not intent or not any(key in intent for key in _BBOX_KEYS):
                 return None
 
-            params = {"skip": 0, "limit": 50}
-            for key in ['lat_min', 'lat_max', 'lon_min', 'lon_max']:
-                if key in intent:
-                    params[key] = intent[key]
-
-            profiles = get_profiles(db, **params)
-            if not profiles:
+            # Column-only query: no ORM hydration, rows already expose .get()
+            stmt = select(Profile.temperature, Profile.salinity, Profile.depth)
+            if 'lat_min' in intent:
+                stmt = stmt.where(Profile.lat >= intent['lat_min'])
+            if 'lat_max' in intent:
+                stmt = stmt.where(Profile.lat <= intent['lat_max'])
+            if 'lon_min' in intent:
+                stmt = stmt.where(Profile.lon >= intent['lon_min'])
+            if 'lon_max' in intent:
+                stmt = stmt.where(Profile.lon <= intent['lon_max'])
+
+            rows = db.execute(stmt.limit(50)).mappings().all()
+            if not rows:
                 return None
 
-            return self._generate_data_insights([{
-                'temperature': p.temperature,
-                'salinity': p.salinity,
-                'depth': p.depth
-            } for p in profiles])
+            return self._generate_data_insights(rows)
 
         except Exception as e:
             print(f"Data context error: {e}")
@@ -53,10 +53,8 @@ def get_profiles(
     
     return query.offset(skip).limit(limit).all()
 
-def get_nearest_profiles(db: Session, latitude: float, longitude: float, radius: float = 100, limit: int = 10) -> List[Profile]:
-    """Find nearest ARGO float profiles to given coordinates"""
-    profiles = db.query(Profile).all()
-    
+def _nearest_in(profiles: List[Profile], latitude: float, longitude: float, radius: float, limit: int) -> List[Profile]:
+    """Filter loaded profiles to the radius and return the closest ones"""
     # Calculate distances and filter by radius
     nearest = []
     for profile in profiles:
@@ -77,6 +75,21 @@ def get_nearest_profiles(db: Session, latitude: float, longitude: float, radius:
     
     return nearest[:limit]
 
+def get_nearest_profiles(db: Session, latitude: float, longitude: float, radius: float = 100, limit: int = 10) -> List[Profile]:
+    """Find nearest ARGO float profiles to given coordinates"""
+    return _nearest_in(db.query(Profile).all(), latitude, longitude, radius, limit)
+
+def get_nearest_profiles_batch(db: Session, queries: List[Dict]) -> List[List[Profile]]:
+    """Answer several nearest-profile lookups from a single table load
+
+    Each query is a dict with latitude, longitude, radius and limit.
+    """
+    profiles = db.query(Profile).all()
+    return [
+        _nearest_in(profiles, q["latitude"], q["longitude"], q["radius"], q["limit"])
+        for q in queries
+    ]
+
 def get_nearest_profiles_legacy(engine: Engine, lat: float, lon: float, limit: int = 10) -> List[Dict]:
     """Legacy function for backward compatibility"""
     # Haversine approximation via simple ordering by squared distance
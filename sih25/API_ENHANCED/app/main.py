@@ -3,12 +3,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 import asyncio
-import json
+import orjson
+from time import monotonic
 from dotenv import load_dotenv
 from .routers import chat_router, admin_router, data_router
 from .routes_argo import router as argo_router
 from .routes_natural_language import router as nl_router
-from .pipecat_router_simplified import router as pipecat_router, cleanup_sessions
+from .pipecat_router_simplified import router as pipecat_router, cleanup_sessions, start_session_sweeper
 from .startup import init_db
 from .realtime import manager, data_streamer, alert_system
 
@@ -24,6 +25,7 @@ async def lifespan(app: FastAPI):
     # Startup
     init_db()
     asyncio.create_task(data_streamer.start_streaming())
+    start_session_sweeper()
     yield
     # Shutdown
     data_streamer.stop_streaming()
@@ -67,11 +69,11 @@ async def data_stream_ws(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
             if message.get("type") == "subscribe_filters":
                 filters = message.get("filters", {})
                 await manager.send_personal_message(
-                    json.dumps({"type": "subscription_confirmed", "filters": filters}),
+                    orjson.dumps({"type": "subscription_confirmed", "filters": filters}).decode(),
                     websocket
                 )
     except WebSocketDisconnect:
@@ -101,20 +103,17 @@ async def alerts_ws(websocket: WebSocket):
 async def chat_ws(websocket: WebSocket):
     user_id = websocket.headers.get("user-id", "anonymous")
     await manager.connect(websocket, "chat", user_id)
-    chat_history = {}
-    chat_history.setdefault(user_id, [])
     try:
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
-            chat_history[user_id].append(message)
+            message = orjson.loads(data)
             response = {
                 "type": "chat_response",
                 "message": f"Received: {message.get('content', '')}",
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": monotonic(),
                 "user_id": user_id
             }
-            await websocket.send_text(json.dumps(response))
+            await websocket.send_text(orjson.dumps(response).decode())
     except WebSocketDisconnect:
         manager.disconnect(websocket, "chat", user_id)
 
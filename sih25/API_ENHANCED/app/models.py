@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, Float, String, Date, Index, BigInteger
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Float, String, Date, Index, BigInteger, SmallInteger
+from sqlalchemy.orm import relationship, synonym
 from .db import Base
 
 class Profile(Base):
@@ -9,30 +9,18 @@ class Profile(Base):
 	float_id = Column(String, index=True)
 	lat = Column(Float, index=True)  # Changed from latitude to match DB
 	lon = Column(Float, index=True)  # Changed from longitude to match DB
-	depth = Column(Integer)  # Changed from Float to Integer to match DB
+	depth = Column(SmallInteger)  # Whole meters; see migrations/001_profiles_smallint.sql
 	temperature = Column(Float)
 	salinity = Column(Float)
-	month = Column(BigInteger, index=True)  # Changed from Integer to BigInteger
-	year = Column(BigInteger, index=True)   # Changed from Integer to BigInteger
+	month = Column(SmallInteger, index=True)  # 1-12
+	year = Column(SmallInteger, index=True)
 	date = Column(Date, nullable=True)
 
-	# Add properties for backward compatibility
-	@property
-	def latitude(self):
-		return self.lat
-	
-	@latitude.setter
-	def latitude(self, value):
-		self.lat = value
-	
-	@property
-	def longitude(self):
-		return self.lon
-	
-	@longitude.setter
-	def longitude(self, value):
-		self.lon = value
+	# Backward-compatible names, mapped straight onto the lat/lon columns (usable in queries too)
+	latitude = synonym('lat')
+	longitude = synonym('lon')
 
 	__table_args__ = (
 		Index('idx_profiles_lat_lon', 'lat', 'lon'),  # Updated index names
+		Index('idx_profiles_ym_lat_lon', 'year', 'month', 'lat', 'lon'),  # Time-slab + bbox queries
 	)
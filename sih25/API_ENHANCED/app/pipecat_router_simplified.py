@@ -4,20 +4,39 @@ Uses Daily.co for WebRTC without full Pipecat SDK
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import os
+import asyncio
 import logging
 import httpx
 import json
+import orjson
 from datetime import datetime, timedelta
+from time import monotonic, time
 import uuid
 
-# Import MCP server from parent directory
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from mcp_server import FloatChatMCPServer
+# MCP server lives next to the app package: importable by its full name from the repo
+# root, or as a top-level module when the service is started from API_ENHANCED
+try:
+    from sih25.API_ENHANCED.mcp_server import FloatChatMCPServer
+except ImportError:
+    from mcp_server import FloatChatMCPServer
+
+# Optional Redis session store - falls back to in-process dicts when not installed
+try:
+    from redis.asyncio import Redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# HTTP/2 for the Daily client needs the h2 extra (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -25,6 +44,7 @@ logger = logging.getLogger(__name__)
 # Configuration from environment
 DAILY_API_KEY = os.getenv("DAILY_API_KEY")
 DAILY_ROOM_URL = os.getenv("DAILY_ROOM_URL", "https://pdv.daily.co/prada")
+REDIS_URL = os.getenv("REDIS_URL")
 
 class PipecatConnectRequest(BaseModel):
     """Request model for Pipecat connection"""
@@ -47,8 +67,243 @@ class PipecatActionRequest(BaseModel):
     params: Optional[Dict[str, Any]] = None
     sessionId: str
 
-# Active sessions storage
+# Active sessions storage, bounded and expired with the meeting token lifetime
+SESSION_TTL = 3600  # seconds, matches the meeting token exp
+MAX_SESSIONS = 100_000
+SESSION_SWEEP_INTERVAL = 60
 active_sessions = {}
+_session_deadlines: Dict[str, float] = {}  # session id -> monotonic expiry, oldest first
+_sessions_view: Dict[str, Dict[str, Any]] = {}  # session id -> /sessions payload entry
+_sweeper_task: Optional[asyncio.Task] = None
+
+# With REDIS_URL set, sessions are shared by all workers: one JSON value per session with
+# a native TTL, plus a sorted set of session ids scored by expiry for counting and listing
+SESSION_KEY_PREFIX = "pipecat:session:"
+SESSION_INDEX_KEY = "pipecat:sessions"
+_redis: Optional["Redis"] = None
+if REDIS_URL:
+    if REDIS_AVAILABLE:
+        _redis = Redis.from_url(REDIS_URL, decode_responses=True)
+    else:
+        logger.warning("REDIS_URL is set but redis is not installed; voice sessions stay in-process")
+
+# Meeting tokens per (room name, user id) -> (token, exp unix time)
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_REFRESH_MARGIN = 60  # seconds before exp at which a cached token is replaced
+_token_cache: Dict[Tuple[str, str], Tuple[str, int]] = {}
+_token_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+# MCP tool descriptions, filled on first getTools action
+_tool_descriptions: Optional[List[Dict[str, Any]]] = None
+
+# Last Daily API probe as (monotonic time, healthy)
+HEALTH_CACHE_TTL = 10.0
+_health_cache: Tuple[float, bool] = (float('-inf'), False)
+_health_lock = asyncio.Lock()
+
+# Shared Daily.co client: one connection pool (and TLS session) for all requests
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # Daily's API speaks HTTP/2: token minting and health probes multiplex on one connection
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0),
+            headers={"Authorization": f"Bearer {DAILY_API_KEY}"} if DAILY_API_KEY else None
+        )
+    return _http_client
+
+def _project_session(session_id: str, session: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a session for the /sessions listing"""
+    return {
+        "sessionId": session_id,
+        "botId": session["bot_id"],
+        "createdAt": session["created_at"],
+        "language": session["language"],
+        "userId": session.get("user_id", "anonymous")
+    }
+
+def _store_local_session(session_id: str, session: Dict[str, Any]) -> None:
+    """Add or replace an in-process session, evicting the oldest one when full"""
+    _drop_local_session(session_id)
+    while len(active_sessions) >= MAX_SESSIONS:
+        _drop_local_session(next(iter(_session_deadlines)))
+    active_sessions[session_id] = session
+    _session_deadlines[session_id] = monotonic() + SESSION_TTL
+    _sessions_view[session_id] = _project_session(session_id, session)
+
+def _drop_local_session(session_id: str) -> None:
+    """Remove an in-process session if present"""
+    active_sessions.pop(session_id, None)
+    _session_deadlines.pop(session_id, None)
+    _sessions_view.pop(session_id, None)
+
+def expire_sessions() -> int:
+    """Remove sessions past their TTL; returns the number removed"""
+    now = monotonic()
+    expired = 0
+    # Deadlines are in insertion order, so stop at the first live session
+    while _session_deadlines:
+        session_id, deadline = next(iter(_session_deadlines.items()))
+        if deadline > now:
+            break
+        _drop_local_session(session_id)
+        expired += 1
+    return expired
+
+async def _store_session(session_id: str, session: Dict[str, Any]) -> None:
+    """Add or replace a session"""
+    if _redis is None:
+        _store_local_session(session_id, session)
+        return
+
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.set(SESSION_KEY_PREFIX + session_id, orjson.dumps(session), ex=SESSION_TTL)
+        pipe.zadd(SESSION_INDEX_KEY, {session_id: time() + SESSION_TTL})
+        await pipe.execute()
+
+async def _get_session(session_id: str) -> Optional[Dict[str, Any]]:
+    """Get a live session, or None if missing or expired"""
+    if _redis is None:
+        session = active_sessions.get(session_id)
+        if session is None or _session_deadlines[session_id] <= monotonic():
+            return None
+        return session
+
+    value = await _redis.get(SESSION_KEY_PREFIX + session_id)
+    return orjson.loads(value) if value is not None else None
+
+async def _update_session(session_id: str, session: Dict[str, Any]) -> None:
+    """Persist changes to an existing session without extending its lifetime"""
+    if _redis is None:
+        _sessions_view[session_id] = _project_session(session_id, session)
+        return
+
+    await _redis.set(SESSION_KEY_PREFIX + session_id, orjson.dumps(session), keepttl=True)
+
+async def _drop_session(session_id: str) -> None:
+    """Remove a session if present"""
+    if _redis is None:
+        _drop_local_session(session_id)
+        return
+
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.delete(SESSION_KEY_PREFIX + session_id)
+        pipe.zrem(SESSION_INDEX_KEY, session_id)
+        await pipe.execute()
+
+async def _session_count() -> int:
+    """Number of live sessions"""
+    if _redis is None:
+        return len(_sessions_view)
+    return await _redis.zcount(SESSION_INDEX_KEY, time(), "+inf")
+
+async def _list_sessions() -> List[Dict[str, Any]]:
+    """/sessions payload entries for all live sessions"""
+    if _redis is None:
+        return list(_sessions_view.values())
+
+    session_ids = await _redis.zrangebyscore(SESSION_INDEX_KEY, time(), "+inf")
+    if not session_ids:
+        return []
+    values = await _redis.mget([SESSION_KEY_PREFIX + sid for sid in session_ids])
+    return [
+        _project_session(sid, orjson.loads(value))
+        for sid, value in zip(session_ids, values) if value is not None
+    ]
+
+async def _sweep_sessions():
+    """Periodically expire abandoned sessions"""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        if _redis is not None:
+            # Session values expire on their own; trim their ids from the index
+            try:
+                await _redis.zremrangebyscore(SESSION_INDEX_KEY, "-inf", time())
+            except Exception as e:
+                logger.error(f"Error trimming voice session index: {e}")
+            continue
+        expired = expire_sessions()
+        if expired:
+            logger.info(f"Expired {expired} idle voice sessions")
+
+def start_session_sweeper():
+    """Start the background session sweeper (call from app startup)"""
+    global _sweeper_task
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.create_task(_sweep_sessions())
+
+async def _mint_token(room_name: str, user_id: str) -> Optional[Tuple[str, int]]:
+    """Create a Daily meeting token, returning (token, exp) or None on failure"""
+    exp = int((datetime.now() + timedelta(hours=1)).timestamp())
+    token_response = await get_http_client().post(
+        "https://api.daily.co/v1/meeting-tokens",
+        json={
+            "properties": {
+                "room_name": room_name,
+                "user_name": f"User-{user_id}",
+                "is_owner": False,
+                "enable_recording": False,
+                "exp": exp
+            }
+        }
+    )
+
+    if token_response.status_code != 200:
+        logger.error(f"Failed to create meeting token: {token_response.text}")
+        return None
+
+    return token_response.json()["token"], exp
+
+async def get_or_mint_token(room_name: str, user_id: str) -> Optional[str]:
+    """
+    Get a cached meeting token for (room, user), minting a new one when missing or near expiry
+
+    Concurrent requests for the same key wait on one Daily call instead of each minting a token.
+    """
+    key = (room_name, user_id)
+    cached = _token_cache.get(key)
+    if cached and cached[1] - time() > TOKEN_REFRESH_MARGIN:
+        return cached[0]
+
+    lock = _token_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _token_cache.get(key)
+            if cached and cached[1] - time() > TOKEN_REFRESH_MARGIN:
+                return cached[0]
+
+            minted = await _mint_token(room_name, user_id)
+            if minted is None:
+                return None
+
+            if len(_token_cache) >= TOKEN_CACHE_SIZE:
+                now = time()
+                for stale in [k for k, (_, exp) in _token_cache.items() if exp - now <= TOKEN_REFRESH_MARGIN]:
+                    del _token_cache[stale]
+                if len(_token_cache) >= TOKEN_CACHE_SIZE:
+                    del _token_cache[next(iter(_token_cache))]
+
+            _token_cache[key] = minted
+            return minted[0]
+    finally:
+        if not lock.locked():
+            _token_locks.pop(key, None)
+
+async def get_tool_descriptions() -> List[Dict[str, Any]]:
+    """MCP tool descriptions, built once per process (the tool list is static)"""
+    global _tool_descriptions
+    if _tool_descriptions is None:
+        mcp_server = FloatChatMCPServer()
+        try:
+            _tool_descriptions = mcp_server.get_tool_descriptions()
+        finally:
+            await mcp_server.close()
+    return _tool_descriptions
 
 @router.post("/connect")
 async def connect_to_pipecat(request: PipecatConnectRequest):
@@ -71,55 +326,41 @@ async def connect_to_pipecat(request: PipecatConnectRequest):
                 detail="Voice service not configured. Please check Daily.co settings."
             )
 
-        # Create a meeting token for the user
-        async with httpx.AsyncClient() as client:
-            # Extract room name from URL
-            room_name = room_url.split('/')[-1]  # Gets 'prada' from 'https://pdv.daily.co/prada'
-
-            token_response = await client.post(
-                "https://api.daily.co/v1/meeting-tokens",
-                headers={
-                    "Authorization": f"Bearer {DAILY_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "properties": {
-                        "room_name": room_name,
-                        "user_name": f"User-{request.userId or 'anonymous'}",
-                        "is_owner": False,
-                        "enable_recording": False,
-                        "exp": int((datetime.now() + timedelta(hours=1)).timestamp())
-                    }
-                }
-            )
+        # Extract room name from URL
+        room_name = room_url.split('/')[-1]  # Gets 'prada' from 'https://pdv.daily.co/prada'
 
-            if token_response.status_code != 200:
-                logger.error(f"Failed to create meeting token: {token_response.text}")
-                # Return a simplified response for testing
-                return PipecatConnectResponse(
-                    roomUrl=room_url,
-                    token="test-token",  # This won't work for actual connection
-                    botId=bot_id,
-                    sessionId=session_id,
-                    config={
-                        "language": request.language,
-                        "sttProvider": "deepgram",
-                        "ttsProvider": "elevenlabs" if request.language == "en" else "sarvam",
-                        "llmModel": "groq/llama-3.1-70b-versatile",
-                        "warning": "Using test mode - voice features limited"
-                    }
-                )
-
-            token = token_response.json()["token"]
+        # Get a meeting token for the user (reused until shortly before it expires);
+        # the session entry and response config are built while the Daily call is in flight
+        token_task = asyncio.create_task(get_or_mint_token(room_name, request.userId or 'anonymous'))
 
-        # Store session info
-        active_sessions[session_id] = {
+        session = {
             "bot_id": bot_id,
             "room_url": room_url,
-            "created_at": datetime.now().isoformat(),
+            "created_at": datetime.now(),
             "language": request.language,
             "user_id": request.userId
         }
+        config = {
+            "language": request.language,
+            "sttProvider": "deepgram",
+            "ttsProvider": "elevenlabs" if request.language == "en" else "sarvam",
+            "llmModel": "groq/llama-3.1-70b-versatile"
+        }
+
+        token = await token_task
+
+        if token is None:
+            # Return a simplified response for testing
+            return PipecatConnectResponse(
+                roomUrl=room_url,
+                token="test-token",  # This won't work for actual connection
+                botId=bot_id,
+                sessionId=session_id,
+                config={**config, "warning": "Using test mode - voice features limited"}
+            )
+
+        # Store session info
+        await _store_session(session_id, session)
 
         logger.info(f"Created voice session {session_id} for language {request.language}")
 
@@ -128,12 +369,7 @@ async def connect_to_pipecat(request: PipecatConnectRequest):
             token=token,
             botId=bot_id,
             sessionId=session_id,
-            config={
-                "language": request.language,
-                "sttProvider": "deepgram",
-                "ttsProvider": "elevenlabs" if request.language == "en" else "sarvam",
-                "llmModel": "groq/llama-3.1-70b-versatile"
-            }
+            config=config
         )
 
     except httpx.RequestError as e:
@@ -151,7 +387,7 @@ async def perform_bot_action(request: PipecatActionRequest):
     """
     Perform an action on the bot (update config, disconnect, etc.)
     """
-    session = active_sessions.get(request.sessionId)
+    session = await _get_session(request.sessionId)
 
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -161,20 +397,17 @@ async def perform_bot_action(request: PipecatActionRequest):
             # Update session configuration
             if request.params:
                 session.update(request.params)
+                await _update_session(request.sessionId, session)
             return {"success": True, "message": "Configuration updated"}
 
         elif request.action == "disconnect":
             # Clean up session
-            if request.sessionId in active_sessions:
-                del active_sessions[request.sessionId]
+            await _drop_session(request.sessionId)
             return {"success": True, "message": "Disconnected"}
 
         elif request.action == "getTools":
             # Return available MCP tools
-            mcp_server = FloatChatMCPServer()
-            tools = mcp_server.get_tool_descriptions()
-            await mcp_server.close()
-            return {"success": True, "tools": tools}
+            return {"success": True, "tools": await get_tool_descriptions()}
 
         else:
             raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}")
@@ -183,47 +416,48 @@ async def perform_bot_action(request: PipecatActionRequest):
         logger.error(f"Error performing action: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/sessions")
+@router.get("/sessions", response_class=ORJSONResponse)
 async def get_active_sessions():
     """Get list of active voice sessions"""
+    sessions = await _list_sessions()
     return {
-        "count": len(active_sessions),
-        "sessions": [
-            {
-                "sessionId": sid,
-                "botId": session["bot_id"],
-                "createdAt": session["created_at"],
-                "language": session["language"],
-                "userId": session.get("user_id", "anonymous")
-            }
-            for sid, session in active_sessions.items()
-        ]
+        "count": len(sessions),
+        "sessions": sessions
     }
 
+async def _probe_daily_api() -> bool:
+    """Daily API reachability, cached for HEALTH_CACHE_TTL; concurrent probes share one request"""
+    global _health_cache
+    if monotonic() - _health_cache[0] < HEALTH_CACHE_TTL:
+        return _health_cache[1]
+
+    async with _health_lock:
+        if monotonic() - _health_cache[0] < HEALTH_CACHE_TTL:
+            return _health_cache[1]
+
+        api_healthy = False
+        try:
+            response = await get_http_client().get("https://api.daily.co/v1/", timeout=5.0)
+            api_healthy = response.status_code == 200
+        except:
+            pass
+
+        _health_cache = (monotonic(), api_healthy)
+        return api_healthy
+
 @router.get("/health")
 async def health_check():
     """Check if voice service is configured and healthy"""
     configured = bool(DAILY_API_KEY and DAILY_ROOM_URL)
 
     # Test Daily API connection if configured
-    api_healthy = False
-    if configured:
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.daily.co/v1/",
-                    headers={"Authorization": f"Bearer {DAILY_API_KEY}"},
-                    timeout=5.0
-                )
-                api_healthy = response.status_code == 200
-        except:
-            pass
+    api_healthy = await _probe_daily_api() if configured else False
 
     return {
         "status": "healthy" if configured and api_healthy else "degraded",
         "configured": configured,
         "api_connection": api_healthy,
-        "active_sessions": len(active_sessions),
+        "active_sessions": await _session_count(),
         "services": {
             "daily": configured,
             "groq": bool(os.getenv("GROQ_API_KEY")),
@@ -235,6 +469,19 @@ async def health_check():
 
 # Cleanup function for app shutdown
 async def cleanup_sessions():
-    """Clean up active sessions on shutdown"""
+    """Clean up active sessions and the shared HTTP client on shutdown"""
+    global _http_client, _sweeper_task, _redis
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        _sweeper_task = None
     active_sessions.clear()
+    _session_deadlines.clear()
+    _sessions_view.clear()
+    if _redis is not None:
+        # Shared sessions belong to every worker; only close this worker's connection
+        await _redis.aclose()
+        _redis = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
     logger.info("Cleaned up all voice sessions")
\ No newline at end of file
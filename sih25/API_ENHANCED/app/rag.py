@@ -51,13 +51,19 @@ def initialize_argo_knowledge():
 
 # Lightweight in-memory RAG store to avoid external dependencies during dev.
 _index: List[Dict] = []  # each item: {id: str, text: str, metadata?: dict}
+_index_version = 0  # bumped on every upsert so answer caches can tell when to drop entries
+
+def index_version() -> int:
+    """Current version of the in-memory index"""
+    return _index_version
 
 def index_metadata(docs: List[Dict]):
     """Upsert docs into an in-memory list by id.
 
     docs: list of {id, text, metadata?}
     """
-    global _index
+    global _index, _index_version
+    _index_version += 1
     existing = {str(d.get("id")): i for i, d in enumerate(_index)}
     for d in docs:
         doc_id = str(d.get("id"))
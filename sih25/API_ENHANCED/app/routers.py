@@ -16,6 +16,7 @@ from .db import get_db
 from .crud import (
     get_profiles,
     get_nearest_profiles,
+    get_nearest_profiles_batch,
     create_profile,
     get_profile_by_id,
     update_profile as crud_update_profile,
@@ -38,6 +39,15 @@ class CreateProfileRequest(BaseModel):
     year: int
     date: Optional[DateType] = None
 
+class NearestQuery(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    radius: float = Field(100, ge=1, le=1000)
+    limit: int = Field(10, ge=1, le=100)
+
+class NearestBatchRequest(BaseModel):
+    batch: List[NearestQuery] = Field(..., min_length=1, max_length=100)
+
 class UpdateProfileRequest(BaseModel):
     float_id: Optional[str] = None
     latitude: Optional[float] = None
@@ -122,6 +132,7 @@ async def chat_endpoint(req: ChatRequest, db: Session = Depends(get_db)):
         # Enhanced data insights with JARVIS mode info
         data_insights = {
             "total_records": ai_result.get("total_records", 0),
+            "truncated": ai_result.get("truncated", False),
             "model_used": ai_result.get("model_used", "unknown"),
             "jarvis_mode": ai_result.get("jarvis_mode", False),
             "sql_generated": bool(ai_result.get("sql_generated")),
@@ -452,6 +463,16 @@ async def get_nearest_profiles_endpoint(
     profiles = get_nearest_profiles(db, latitude, longitude, radius, limit)
     return {"results": profiles, "count": len(profiles), "center": {"latitude": latitude, "longitude": longitude}, "radius_km": radius}
 
+@data_router.post("/nearest/batch")
+async def get_nearest_profiles_batch_endpoint(request: NearestBatchRequest, db: Session = Depends(get_db)):
+    """Run several nearest-profile lookups in one request; results are in request order"""
+    queries = [q.model_dump() for q in request.batch]
+    batches = get_nearest_profiles_batch(db, queries)
+    return {"results": [
+        {"results": profiles, "count": len(profiles), "center": {"latitude": q["latitude"], "longitude": q["longitude"]}, "radius_km": q["radius"]}
+        for q, profiles in zip(queries, batches)
+    ]}
+
 @data_router.get("/statistics")
 async def get_statistics(db: Session = Depends(get_db)):
     """Get comprehensive statistics about the data"""
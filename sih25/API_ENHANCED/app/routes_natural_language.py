@@ -1,16 +1,74 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import re
 import json
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
+from operator import itemgetter
+from time import monotonic
+from types import MappingProxyType
 
 from .db import get_db
 from .models import Profile
-from .rag import retrieve, summarize
+from .rag import retrieve, summarize, index_version
 
 router = APIRouter()
 
+# Chart configs are shared, read-only templates; the response model copies them
+_TEMPERATURE_CONFIG = MappingProxyType({
+    "type": "line",
+    "title": "Temperature Profile",
+    "x_axis": "depth",
+    "y_axis": "temperature",
+    "x_label": "Depth (m)",
+    "y_label": "Temperature (°C)",
+    "color": "#FF6B6B"
+})
+
+_SALINITY_CONFIG = MappingProxyType({
+    "type": "line",
+    "title": "Salinity Profile",
+    "x_axis": "depth",
+    "y_axis": "salinity",
+    "x_label": "Depth (m)",
+    "y_label": "Salinity (PSU)",
+    "color": "#4ECDC4"
+})
+
+_MAP_CONFIG = MappingProxyType({
+    "type": "map",
+    "title": "Float Locations"
+})
+
+_SCATTER_CONFIG = MappingProxyType({
+    "type": "scatter",
+    "title": "Ocean Data Visualization",
+    "x_axis": "depth",
+    "y_axis": "value",
+    "x_label": "Depth (m)",
+    "y_label": "Value",
+    "color": "#95E1D3"
+})
+
+_get_lat_lon_temp = itemgetter("latitude", "longitude", "temperature")
+
+# Keyword rules in precedence order (substring, case-insensitive)
+_VIS_RULES = [
+    (re.compile(r"temp", re.IGNORECASE), _TEMPERATURE_CONFIG),
+    (re.compile(r"salinity|psal", re.IGNORECASE), _SALINITY_CONFIG),
+    (re.compile(r"map|location|float", re.IGNORECASE), _MAP_CONFIG),
+]
+
+# RAG answers by (index version, normalized query) -> (monotonic expiry, answer)
+RAG_CACHE_SIZE = 1024
+RAG_CACHE_TTL = 600.0
+_rag_cache: "OrderedDict[Tuple[int, str], Tuple[float, str]]" = OrderedDict()
+_rag_inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+
 class NaturalLanguageQuery(BaseModel):
     query: str
     language: Optional[str] = "en"
@@ -24,12 +82,46 @@ class QueryResponse(BaseModel):
     query_type: Optional[str] = None
     error: Optional[str] = None
 
+def _rag_answer(query: str) -> str:
+    """Retrieve context and summarize it in one worker-thread hop"""
+    return summarize(query, retrieve(query, k=3))
+
+async def _cached_rag_answer(query: str) -> str:
+    """
+    RAG answer for a query, served from a TTL + LRU cache
+
+    Answers only depend on the stripped, lowercased query and the index contents,
+    so the key is (index version, normalized query); concurrent misses for the same
+    key share one computation.
+    """
+    key = (index_version(), query.strip().lower())
+    entry = _rag_cache.get(key)
+    if entry is not None:
+        expires_at, answer = entry
+        if expires_at > monotonic():
+            _rag_cache.move_to_end(key)
+            return answer
+        del _rag_cache[key]
+
+    task = _rag_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(_rag_answer, query))
+        _rag_inflight[key] = task
+        task.add_done_callback(lambda _: _rag_inflight.pop(key, None))
+
+    answer = await asyncio.shield(task)
+
+    _rag_cache[key] = (monotonic() + RAG_CACHE_TTL, answer)
+    _rag_cache.move_to_end(key)
+    while len(_rag_cache) > RAG_CACHE_SIZE:
+        _rag_cache.popitem(last=False)
+    return answer
+
 async def rag_query(query: str, db: Session) -> Dict[str, Any]:
     """Process a natural language query using RAG and return structured results"""
     try:
-        # Use RAG to get context
-        context = retrieve(query, k=3)
-        answer = summarize(query, context)
+        # Use RAG to get context (cached; misses run off the event loop)
+        answer = await _cached_rag_answer(query)
 
         # Simple query processing - for now return basic response
         # In a full implementation, this would parse the query and fetch actual data
@@ -41,7 +133,9 @@ async def rag_query(query: str, db: Session) -> Dict[str, Any]:
     except Exception as e:
         raise Exception(f"RAG query failed: {str(e)}")
 
-@router.post("/query", response_model=QueryResponse)
+# Voice queries use the same handler, registered directly at both paths
+@router.post("/query", response_model=QueryResponse, response_class=ORJSONResponse)
+@router.post("/voice/query", response_model=QueryResponse, response_class=ORJSONResponse)
 async def natural_language_query(
     request: NaturalLanguageQuery,
     db: Session = Depends(get_db)
@@ -70,54 +164,24 @@ def generate_visualization_config(data: List[Dict], query: str) -> Dict[str, Any
     if not data or len(data) == 0:
         return None
 
-    query_lower = query.lower()
-
-    if "temperature" in query_lower or "temp" in query_lower:
-        return {
-            "type": "line",
-            "title": "Temperature Profile",
-            "x_axis": "depth",
-            "y_axis": "temperature",
-            "x_label": "Depth (m)",
-            "y_label": "Temperature (°C)",
-            "color": "#FF6B6B"
-        }
-
-    elif "salinity" in query_lower or "psal" in query_lower:
-        return {
-            "type": "line",
-            "title": "Salinity Profile",
-            "x_axis": "depth",
-            "y_axis": "salinity",
-            "x_label": "Depth (m)",
-            "y_label": "Salinity (PSU)",
-            "color": "#4ECDC4"
-        }
-
-    elif "map" in query_lower or "location" in query_lower or "float" in query_lower:
-        return {
-            "type": "map",
-            "title": "Float Locations",
-            "data_points": [
-                {"lat": d.get("latitude"), "lon": d.get("longitude"), "value": d.get("temperature", 0)}
-                for d in data if d.get("latitude") and d.get("longitude")
-            ]
-        }
-
+    for pattern, config in _VIS_RULES:
+        if pattern.search(query):
+            break
     else:
-        return {
-            "type": "scatter",
-            "title": "Ocean Data Visualization",
-            "x_axis": "depth",
-            "y_axis": "value",
-            "x_label": "Depth (m)",
-            "y_label": "Value",
-            "color": "#95E1D3"
-        }
+        return _SCATTER_CONFIG
 
-@router.post("/voice/query", response_model=QueryResponse)
-async def voice_query(
-    request: NaturalLanguageQuery,
-    db: Session = Depends(get_db)
-):
-    return await natural_language_query(request, db)
\ No newline at end of file
+    if config is not _MAP_CONFIG:
+        return config
+
+    try:
+        rows = list(map(_get_lat_lon_temp, data))
+    except KeyError:
+        rows = [(d.get("latitude"), d.get("longitude"), d.get("temperature")) for d in data]
+
+    return {
+        **_MAP_CONFIG,
+        "data_points": [
+            {"lat": lat, "lon": lon, "value": temp or 0}
+            for lat, lon, temp in rows if lat is not None and lon is not None
+        ]
+    }
@@ -3,16 +3,172 @@ MCP (Model Context Protocol) Server Wrapper for FloatChat
 Wraps existing FloatChat API endpoints as MCP tools for AI agents
 """
 
+import os
 import sys
+import stat
+import asyncio
 import logging
-from typing import Any, Dict, List
+from collections import OrderedDict
+from functools import lru_cache
+from time import monotonic, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import httpx
+import orjson
 from datetime import datetime
 
+# HTTP/2 needs the h2 extra (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Optional fastjsonschema compiles tool input schemas to Python code; without it a
+# minimal required/type/enum check is used
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+# uvloop (installed with uvicorn[standard]) gives a faster event loop for the stdio server
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Tools whose backend responses depend only on their arguments; natural-language
+# queries go through the chat endpoint and are never cached
+CACHEABLE_TOOLS = frozenset({"get_ocean_profiles", "analyze_ocean_trends", "get_data_statistics"})
+RESULT_CACHE_SIZE = 512
+RESULT_CACHE_TTL = 300.0
+
+# stdio transport: requests read ahead and handled concurrently
+STDIO_WORKERS = 8
+STDIO_QUEUE_SIZE = 64
+STDIO_LINE_LIMIT = 16 * 1024 * 1024  # bytes per JSON-RPC line
+
+# Backend resilience: transport errors are retried with exponential backoff, and an
+# endpoint that keeps failing is short-circuited until a probe succeeds
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_MIN = 0.2
+RETRY_BACKOFF_MAX = 2.0
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 15.0
+
+# Only these methods are retried on any transport error; other requests (e.g. the chat
+# POST, which runs the LLM) are retried only when the request never reached the backend
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Nearest-profile lookups arriving within this window go to the backend as one batch
+NEAREST_BATCH_WINDOW = 0.02
+NEAREST_BATCH_MAX = 32
+
+
+class BackendUnavailableError(Exception):
+    """Raised without contacting the backend while an endpoint's circuit is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def before_call(self) -> None:
+        """Raise BackendUnavailableError if calls should not reach the backend right now"""
+        if self.opened_at is None:
+            return
+        if self._probing or monotonic() - self.opened_at < self.reset_timeout:
+            raise BackendUnavailableError("Backend temporarily unavailable (circuit open)")
+        self._probing = True
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe that ended without an answer (e.g. a cancelled call)"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = monotonic()
+
+
+@lru_cache(maxsize=4)
+def _iso_second(second: int) -> str:
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO string at second resolution, formatted once per second"""
+    return _iso_second(int(time()))
+
+
+_JSON_TYPES = {
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict
+}
+
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+    """Compile a tool input schema into a validator that raises ValueError on bad arguments"""
+    if FASTJSONSCHEMA_AVAILABLE:
+        # use_default=False: validation must not write defaults into the caller's arguments
+        validate = fastjsonschema.compile(schema, use_default=False)
+
+        def validator(arguments: Dict[str, Any]) -> None:
+            try:
+                validate(arguments)
+            except fastjsonschema.JsonSchemaException as e:
+                raise ValueError(e.message) from None
+
+        return validator
+
+    required = tuple(schema.get("required", ()))
+    checks = tuple(
+        (name, _JSON_TYPES[spec["type"]], spec.get("enum"))
+        for name, spec in schema.get("properties", {}).items()
+        if spec.get("type") in _JSON_TYPES
+    )
+
+    def validator(arguments: Dict[str, Any]) -> None:
+        if not isinstance(arguments, dict):
+            raise ValueError("arguments must be an object")
+        for name in required:
+            if name not in arguments:
+                raise ValueError(f"missing required argument '{name}'")
+        for name, expected, enum in checks:
+            value = arguments.get(name)
+            if value is None:
+                continue
+            if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                raise ValueError(f"argument '{name}' has the wrong type")
+            if enum is not None and value not in enum:
+                raise ValueError(f"argument '{name}' must be one of {enum}")
+
+    return validator
+
+
+@dataclass(frozen=True)
 class MCPTool:
     """MCP Tool Specification"""
     name: str
@@ -22,165 +178,252 @@ class MCPTool:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
-class FloatChatMCPServer:
-    """
-    MCP Server that wraps FloatChat backend API endpoints
-    Provides oceanographic data query tools for AI agents
-    """
 
-    def __init__(self, backend_url: str = "http://localhost:8000"):
-        self.backend_url = backend_url
-        self.client = httpx.AsyncClient(timeout=30.0)
-        self.tools = self._register_tools()
-
-    def _register_tools(self) -> List[MCPTool]:
-        """Register available MCP tools"""
-        return [
-            MCPTool(
-                name="query_ocean_data",
-                description="Query ARGO float ocean data with natural language",
-                input_schema={
+# Tool registry, built once per process and shared by every server instance
+TOOLS: Tuple[MCPTool, ...] = (
+    MCPTool(
+        name="query_ocean_data",
+        description="Query ARGO float ocean data with natural language",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Natural language query about ocean data"
+                },
+                "language": {
+                    "type": "string",
+                    "enum": ["en", "hi", "ta", "te"],
+                    "default": "en",
+                    "description": "Response language"
+                },
+                "region": {
+                    "type": "string",
+                    "optional": True,
+                    "description": "Specific ocean region (Arabian Sea, Bay of Bengal, etc.)"
+                },
+                "parameters": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "optional": True,
+                    "description": "Specific parameters to query (TEMP, PSAL, DOXY, etc.)"
+                },
+                "date_range": {
                     "type": "object",
+                    "optional": True,
                     "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Natural language query about ocean data"
-                        },
-                        "language": {
-                            "type": "string",
-                            "enum": ["en", "hi", "ta", "te"],
-                            "default": "en",
-                            "description": "Response language"
-                        },
-                        "region": {
-                            "type": "string",
-                            "optional": True,
-                            "description": "Specific ocean region (Arabian Sea, Bay of Bengal, etc.)"
-                        },
-                        "parameters": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "optional": True,
-                            "description": "Specific parameters to query (TEMP, PSAL, DOXY, etc.)"
-                        },
-                        "date_range": {
-                            "type": "object",
-                            "optional": True,
-                            "properties": {
-                                "start": {"type": "string", "format": "date"},
-                                "end": {"type": "string", "format": "date"}
-                            },
-                            "description": "Date range for data query"
-                        }
+                        "start": {"type": "string", "format": "date"},
+                        "end": {"type": "string", "format": "date"}
                     },
-                    "required": ["query"]
+                    "description": "Date range for data query"
                 }
-            ),
-            MCPTool(
-                name="get_ocean_profiles",
-                description="Get detailed ocean profiles for specific locations",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "latitude": {
-                            "type": "number",
-                            "description": "Latitude coordinate"
-                        },
-                        "longitude": {
-                            "type": "number",
-                            "description": "Longitude coordinate"
-                        },
-                        "radius_km": {
-                            "type": "number",
-                            "default": 50,
-                            "description": "Search radius in kilometers"
-                        },
-                        "parameters": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "default": ["TEMP", "PSAL"],
-                            "description": "Parameters to include in profiles"
-                        },
-                        "depth_levels": {
-                            "type": "array",
-                            "items": {"type": "number"},
-                            "optional": True,
-                            "description": "Specific depth levels to query"
-                        }
-                    },
-                    "required": ["latitude", "longitude"]
+            },
+            "required": ["query"]
+        }
+    ),
+    MCPTool(
+        name="get_ocean_profiles",
+        description="Get detailed ocean profiles for specific locations",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "latitude": {
+                    "type": "number",
+                    "description": "Latitude coordinate"
+                },
+                "longitude": {
+                    "type": "number",
+                    "description": "Longitude coordinate"
+                },
+                "radius_km": {
+                    "type": "number",
+                    "default": 50,
+                    "description": "Search radius in kilometers"
+                },
+                "parameters": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "default": ["TEMP", "PSAL"],
+                    "description": "Parameters to include in profiles"
+                },
+                "depth_levels": {
+                    "type": "array",
+                    "items": {"type": "number"},
+                    "optional": True,
+                    "description": "Specific depth levels to query"
                 }
-            ),
-            MCPTool(
-                name="analyze_ocean_trends",
-                description="Analyze temporal trends in ocean parameters",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "region": {
-                            "type": "string",
-                            "description": "Ocean region to analyze"
-                        },
-                        "parameter": {
-                            "type": "string",
-                            "enum": ["TEMP", "PSAL", "DOXY", "CHLA"],
-                            "description": "Parameter to analyze"
-                        },
-                        "time_period": {
-                            "type": "string",
-                            "enum": ["daily", "weekly", "monthly", "yearly"],
-                            "default": "monthly",
-                            "description": "Time aggregation period"
-                        },
-                        "analysis_type": {
-                            "type": "string",
-                            "enum": ["mean", "anomaly", "trend", "variability"],
-                            "default": "mean",
-                            "description": "Type of analysis to perform"
-                        }
-                    },
-                    "required": ["region", "parameter"]
+            },
+            "required": ["latitude", "longitude"]
+        }
+    ),
+    MCPTool(
+        name="analyze_ocean_trends",
+        description="Analyze temporal trends in ocean parameters",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "region": {
+                    "type": "string",
+                    "description": "Ocean region to analyze"
+                },
+                "parameter": {
+                    "type": "string",
+                    "enum": ["TEMP", "PSAL", "DOXY", "CHLA"],
+                    "description": "Parameter to analyze"
+                },
+                "time_period": {
+                    "type": "string",
+                    "enum": ["daily", "weekly", "monthly", "yearly"],
+                    "default": "monthly",
+                    "description": "Time aggregation period"
+                },
+                "analysis_type": {
+                    "type": "string",
+                    "enum": ["mean", "anomaly", "trend", "variability"],
+                    "default": "mean",
+                    "description": "Type of analysis to perform"
                 }
-            ),
-            MCPTool(
-                name="get_data_statistics",
-                description="Get statistical summary of ocean data",
-                input_schema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Description of data to summarize"
-                        },
-                        "include_quality_info": {
-                            "type": "boolean",
-                            "default": True,
-                            "description": "Include data quality statistics"
-                        }
-                    },
-                    "required": ["query"]
+            },
+            "required": ["region", "parameter"]
+        }
+    ),
+    MCPTool(
+        name="get_data_statistics",
+        description="Get statistical summary of ocean data",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Description of data to summarize"
+                },
+                "include_quality_info": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Include data quality statistics"
                 }
+            },
+            "required": ["query"]
+        }
+    )
+)
+
+# Plain dicts (orjson can't serialize read-only mapping views); shared, do not mutate
+_TOOL_DESCRIPTIONS = [tool.to_dict() for tool in TOOLS]
+_VALIDATORS = {tool.name: _compile_validator(tool.input_schema) for tool in TOOLS}
+
+class FloatChatMCPServer:
+    """
+    MCP Server that wraps FloatChat backend API endpoints
+    Provides oceanographic data query tools for AI agents
+    """
+
+    def __init__(self, backend_url: str = "http://localhost:8000"):
+        self.backend_url = backend_url
+        # Pool sized for bursts of concurrent tool calls (retries happen in _request). HTTP/2 is
+        # used when the backend is served over TLS (plain http:// stays on HTTP/1.1 keep-alive)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=25, keepalive_expiry=120.0)
             )
-        ]
+        )
+        self.tools = TOOLS
+        self._dispatch = {
+            "query_ocean_data": self._query_ocean_data,
+            "get_ocean_profiles": self._get_ocean_profiles,
+            "analyze_ocean_trends": self._analyze_ocean_trends,
+            "get_data_statistics": self._get_data_statistics
+        }
+        self._result_cache: "OrderedDict[Tuple[str, bytes], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, bytes], asyncio.Future] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._nearest_pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._nearest_flush: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()  # Strong references so in-flight batches aren't garbage collected
+
+        # Open a pooled connection to the backend ahead of the first tool call. Skipped
+        # when constructed outside a running loop
+        try:
+            self._warmup_task = asyncio.get_running_loop().create_task(self._warmup())
+        except RuntimeError:
+            self._warmup_task = None
+
+    async def _warmup(self) -> None:
+        """Hit the backend health endpoint so the first tool call finds a warm connection"""
+        try:
+            await self.client.get(f"{self.backend_url}/health")
+        except httpx.HTTPError as e:
+            logger.debug(f"Backend warmup failed: {e}")
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send a backend request through the endpoint's circuit breaker
+
+        Transport errors are retried with exponential backoff, except read timeouts,
+        which would only stack further waits on a hung backend; non-idempotent requests
+        are retried only if they were never sent. 5xx responses, exhausted retries and
+        any other error count as failures for the breaker.
+        """
+        breaker = self._breakers.get(path)
+        if breaker is None:
+            breaker = self._breakers[path] = CircuitBreaker()
+        breaker.before_call()
+
+        retryable = httpx.TransportError if method in _IDEMPOTENT_METHODS else _NOT_SENT_ERRORS
+        delay = RETRY_BACKOFF_MIN
+        attempt = 1
+        try:
+            while True:
+                try:
+                    response = await self.client.request(method, f"{self.backend_url}{path}", **kwargs)
+                    break
+                except retryable as e:
+                    if attempt == RETRY_ATTEMPTS or isinstance(e, httpx.ReadTimeout):
+                        raise
+                    logger.warning(f"{method} {path} failed ({e!r}), retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, RETRY_BACKOFF_MAX)
+                    attempt += 1
+        except asyncio.CancelledError:
+            # The caller went away; that says nothing about the backend
+            breaker.release_probe()
+            raise
+        except BaseException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
 
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute an MCP tool by calling the appropriate backend endpoint
         """
+        handler = self._dispatch.get(tool_name)
+        if handler is None:
+            return {
+                "error": f"Unknown tool: {tool_name}",
+                "success": False
+            }
+
         try:
-            if tool_name == "query_ocean_data":
-                return await self._query_ocean_data(arguments)
-            elif tool_name == "get_ocean_profiles":
-                return await self._get_ocean_profiles(arguments)
-            elif tool_name == "analyze_ocean_trends":
-                return await self._analyze_ocean_trends(arguments)
-            elif tool_name == "get_data_statistics":
-                return await self._get_data_statistics(arguments)
-            else:
-                return {
-                    "error": f"Unknown tool: {tool_name}",
-                    "success": False
-                }
+            _VALIDATORS[tool_name](arguments)
+        except ValueError as e:
+            return {
+                "error": "Invalid arguments",
+                "details": str(e),
+                "success": False
+            }
+
+        try:
+            if tool_name in CACHEABLE_TOOLS:
+                return await self._cached_call(tool_name, handler, arguments)
+            return await handler(arguments)
         except Exception as e:
             logger.error(f"Error executing tool {tool_name}: {e}")
             return {
@@ -188,11 +431,106 @@ class FloatChatMCPServer:
                 "success": False
             }
 
+    async def _cached_call(self, tool_name: str, handler, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serve an idempotent tool call from the TTL + LRU result cache
+
+        Concurrent misses for the same (tool, arguments) share one backend call;
+        only successful results are cached.
+        """
+        key = (tool_name, orjson.dumps(arguments, default=str, option=orjson.OPT_SORT_KEYS))
+        entry = self._result_cache.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > monotonic():
+                self._result_cache.move_to_end(key)
+                return result
+            del self._result_cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(handler(arguments))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        result = await asyncio.shield(task)
+
+        if result.get("success"):
+            self._result_cache[key] = (monotonic() + RESULT_CACHE_TTL, result)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+
+    async def _fetch_nearest(self, params: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        Queue a /data/nearest lookup to go out with others arriving in the same window
+
+        Returns (status code, parsed body on 200 or response text otherwise).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._nearest_pending.append((params, future))
+
+        if len(self._nearest_pending) >= NEAREST_BATCH_MAX:
+            self._flush_nearest()
+        elif self._nearest_flush is None:
+            self._nearest_flush = loop.call_later(NEAREST_BATCH_WINDOW, self._flush_nearest)
+
+        return await future
+
+    def _flush_nearest(self) -> None:
+        """Dispatch every pending nearest-profile lookup as one batch"""
+        if self._nearest_flush is not None:
+            self._nearest_flush.cancel()
+            self._nearest_flush = None
+
+        pending, self._nearest_pending = self._nearest_pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run_nearest_batch(pending))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_nearest_batch(self, pending: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Send one batch request (or a plain GET for a lone lookup) and resolve each caller"""
+        try:
+            if len(pending) == 1:
+                outcomes = [await self._nearest_single(pending[0][0])]
+            else:
+                response = await self._request(
+                    "POST", "/data/nearest/batch",
+                    json={"batch": [params for params, _ in pending]}
+                )
+                if response.status_code in (404, 405, 422):
+                    # Backend without the batch route, or one invalid lookup rejecting the
+                    # whole batch: fall back to individual lookups
+                    outcomes = await asyncio.gather(*(self._nearest_single(params) for params, _ in pending))
+                elif response.status_code == 200:
+                    outcomes = [(200, data) for data in orjson.loads(response.content)["results"]]
+                else:
+                    outcomes = [(response.status_code, response.text)] * len(pending)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), outcome in zip(pending, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+    async def _nearest_single(self, params: Dict[str, Any]) -> Tuple[int, Any]:
+        """Plain GET /data/nearest for one lookup"""
+        response = await self._request("GET", "/data/nearest", params=params)
+        if response.status_code == 200:
+            return 200, orjson.loads(response.content)
+        return response.status_code, response.text
+
     async def _query_ocean_data(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute natural language query against ocean data"""
         # Use the chat endpoint for natural language queries
-        response = await self.client.post(
-            f"{self.backend_url}/chat/",
+        response = await self._request(
+            "POST", "/chat/",
             json={
                 "message": args["query"],
                 "latitude": args.get("latitude"),
@@ -201,14 +539,14 @@ class FloatChatMCPServer:
         )
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             return {
                 "success": True,
                 "answer": data.get("answer"),
                 "suggestions": data.get("suggestions", []),
                 "data_insights": data.get("data_insights", {}),
                 "metadata": {
-                    "query_time": datetime.now().isoformat(),
+                    "query_time": _now_iso(),
                     "language": args.get("language", "en"),
                     "region": args.get("region")
                 }
@@ -222,19 +560,15 @@ class FloatChatMCPServer:
 
     async def _get_ocean_profiles(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Get ocean profiles for specific location"""
-        # Use the data/nearest endpoint
-        response = await self.client.get(
-            f"{self.backend_url}/data/nearest",
-            params={
-                "latitude": args["latitude"],
-                "longitude": args["longitude"],
-                "radius": args.get("radius_km", 50),
-                "limit": 100
-            }
-        )
-
-        if response.status_code == 200:
-            data = response.json()
+        # Use the data/nearest endpoint, batched with concurrent lookups
+        status_code, data = await self._fetch_nearest({
+            "latitude": args["latitude"],
+            "longitude": args["longitude"],
+            "radius": args.get("radius_km", 50),
+            "limit": 100
+        })
+
+        if status_code == 200:
             return {
                 "success": True,
                 "profiles": data.get("results", []),
@@ -252,19 +586,17 @@ class FloatChatMCPServer:
         else:
             return {
                 "success": False,
-                "error": f"API error: {response.status_code}",
-                "details": response.text
+                "error": f"API error: {status_code}",
+                "details": data
             }
 
     async def _analyze_ocean_trends(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze temporal trends in ocean data"""
         # Use the analytics endpoints
-        response = await self.client.get(
-            f"{self.backend_url}/data/analytics/temporal"
-        )
+        response = await self._request("GET", "/data/analytics/temporal")
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             return {
                 "success": True,
                 "trends": data,
@@ -272,7 +604,7 @@ class FloatChatMCPServer:
                 "parameter": args["parameter"],
                 "region": args["region"],
                 "metadata": {
-                    "analysis_time": datetime.now().isoformat(),
+                    "analysis_time": _now_iso(),
                     "time_period": args.get("time_period", "monthly")
                 }
             }
@@ -286,19 +618,17 @@ class FloatChatMCPServer:
     async def _get_data_statistics(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Get statistical summary of ocean data"""
         # Use the statistics endpoint
-        response = await self.client.get(
-            f"{self.backend_url}/data/statistics"
-        )
+        response = await self._request("GET", "/data/statistics")
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             return {
                 "success": True,
                 "statistics": data,
                 "query": args["query"],
                 "include_quality_info": args.get("include_quality_info", True),
                 "metadata": {
-                    "stats_time": datetime.now().isoformat()
+                    "stats_time": _now_iso()
                 }
             }
         else:
@@ -309,11 +639,13 @@ class FloatChatMCPServer:
             }
 
     def get_tool_descriptions(self) -> List[Dict[str, Any]]:
-        """Get all tool descriptions for LLM configuration"""
-        return [tool.to_dict() for tool in self.tools]
+        """Get all tool descriptions for LLM configuration (shared, do not mutate)"""
+        return _TOOL_DESCRIPTIONS
 
     async def close(self):
         """Clean up resources"""
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
         await self.client.aclose()
 
 
@@ -325,15 +657,14 @@ class MCPProtocolHandler:
 
     def __init__(self, mcp_server: FloatChatMCPServer):
         self.mcp_server = mcp_server
+        self._tools_list = {"tools": mcp_server.get_tool_descriptions()}
 
     async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming MCP request"""
         method = request.get("method")
 
         if method == "tools/list":
-            return {
-                "tools": self.mcp_server.get_tool_descriptions()
-            }
+            return self._tools_list
         elif method == "tools/call":
             tool_name = request.get("params", {}).get("name")
             arguments = request.get("params", {}).get("arguments", {})
@@ -342,7 +673,7 @@ class MCPProtocolHandler:
                 "content": [
                     {
                         "type": "text",
-                        "text": json.dumps(result, indent=2)
+                        "text": orjson.dumps(result, default=str, option=orjson.OPT_INDENT_2).decode()
                     }
                 ]
             }
@@ -356,75 +687,113 @@ class MCPProtocolHandler:
 
 
 # Add stdin/stdout handling for MCP protocol
-async def handle_mcp_stdio():
-    """Handle MCP protocol over stdin/stdout"""
-    server = FloatChatMCPServer()
-    handler = MCPProtocolHandler(server)
-
+async def _read_stdin_lines(queue: asyncio.Queue) -> None:
+    """Read JSON-RPC lines from stdin into the queue until EOF"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=STDIO_LINE_LIMIT)
     try:
-        while True:
-            # Read JSON-RPC message from stdin
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
-            if not line:
-                break
+        # Regular files (redirected input) can't be watched by the loop; uvloop aborts
+        # outright instead of raising, so check before connecting
+        if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+            raise ValueError("stdin is a regular file")
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except (OSError, ValueError):
+        while line := await loop.run_in_executor(None, sys.stdin.buffer.readline):
+            await queue.put(line)
+        return
 
-            try:
-                request = json.loads(line.strip())
-
-                # Handle initialization
-                if request.get("method") == "initialize":
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "result": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {
-                                "tools": {"listChanged": False},
-                                "resources": {"subscribe": False, "listChanged": False},
-                                "prompts": {"listChanged": False},
-                                "logging": {}
-                            },
-                            "serverInfo": {
-                                "name": "floatchat-mcp-server",
-                                "version": "1.0.0",
-                                "description": "MCP server for ARGO oceanographic data"
-                            }
-                        }
+    while line := await reader.readline():
+        await queue.put(line)
+
+
+def _write_message(message: Dict[str, Any]) -> None:
+    """Write one JSON-RPC message to stdout (synchronous, so messages never interleave)"""
+    sys.stdout.buffer.write(orjson.dumps(message) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+async def _process_message(handler: MCPProtocolHandler, line: bytes) -> None:
+    """Handle one JSON-RPC request line and write its response"""
+    try:
+        request = orjson.loads(line)
+
+        # Handle initialization
+        if request.get("method") == "initialize":
+            response = {
+                "jsonrpc": "2.0",
+                "id": request.get("id"),
+                "result": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {
+                        "tools": {"listChanged": False},
+                        "resources": {"subscribe": False, "listChanged": False},
+                        "prompts": {"listChanged": False},
+                        "logging": {}
+                    },
+                    "serverInfo": {
+                        "name": "floatchat-mcp-server",
+                        "version": "1.0.0",
+                        "description": "MCP server for ARGO oceanographic data"
                     }
-                    print(json.dumps(response))
-                    sys.stdout.flush()
-                    continue
-
-                # Handle other requests
-                result = await handler.handle_request(request)
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": result if "error" not in result else None,
-                    "error": result.get("error") if "error" in result else None
                 }
+            }
+            _write_message(response)
+            return
 
-                print(json.dumps(response))
-                sys.stdout.flush()
+        # Handle other requests
+        result = await handler.handle_request(request)
+        response = {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "result": result if "error" not in result else None,
+            "error": result.get("error") if "error" in result else None
+        }
 
-            except json.JSONDecodeError:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {"code": -32700, "message": "Parse error"}
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+        _write_message(response)
 
+    except orjson.JSONDecodeError:
+        error_response = {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32700, "message": "Parse error"}
+        }
+        _write_message(error_response)
+
+
+async def handle_mcp_stdio():
+    """
+    Handle MCP protocol over stdin/stdout
+
+    A reader task keeps pulling requests into a bounded queue while a pool of workers
+    handles them, so a slow tool call doesn't hold up the requests behind it.
+    Responses are written as they complete and carry their request id.
+    """
+    server = FloatChatMCPServer()
+    handler = MCPProtocolHandler(server)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STDIO_QUEUE_SIZE)
+
+    async def worker():
+        while True:
+            line = await queue.get()
+            try:
+                await _process_message(handler, line)
+            except Exception as e:
+                logger.error(f"Error handling MCP request: {e}")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(STDIO_WORKERS)]
+    try:
+        await _read_stdin_lines(queue)
+        await queue.join()
     except KeyboardInterrupt:
         pass
     finally:
+        for task in workers:
+            task.cancel()
         await server.close()
 
 if __name__ == "__main__":
-    import asyncio
-    import json
-
     # Set up logging to stderr so it doesn't interfere with MCP protocol
     logging.basicConfig(
         level=logging.INFO,
@@ -432,4 +801,5 @@ if __name__ == "__main__":
         stream=sys.stderr
     )
 
-    asyncio.run(handle_mcp_stdio())
\ No newline at end of file
+    run = uvloop.run if UVLOOP_AVAILABLE else asyncio.run
+    run(handle_mcp_stdio())
\ No newline at end of file
@@ -0,0 +1,27 @@
+-- Narrow profiles.depth/month/year to SMALLINT and add the (year, month, lat, lon) index
+--
+-- Matches app/models.py. New databases get both from init_db (create_all); run this once
+-- on PostgreSQL databases created before them:
+--
+--   psql "$DATABASE_URL" -f sih25/API_ENHANCED/migrations/001_profiles_smallint.sql
+--
+-- SQLite needs nothing: its INTEGER affinity covers every integer width.
+--
+-- The type change rewrites the table and all of its indexes under an ACCESS EXCLUSIVE
+-- lock, which reclaims the freed bytes without a separate VACUUM FULL. It fails, and
+-- changes nothing, if any value is outside -32768..32767.
+
+BEGIN;
+
+ALTER TABLE profiles
+    ALTER COLUMN depth TYPE smallint USING depth::smallint,
+    ALTER COLUMN month TYPE smallint USING month::smallint,
+    ALTER COLUMN year  TYPE smallint USING year::smallint;
+
+-- Built after the rewrite so its leaves hold the narrow keys
+CREATE INDEX IF NOT EXISTS idx_profiles_ym_lat_lon ON profiles (year, month, lat, lon);
+
+COMMIT;
+
+-- Refresh planner statistics for the rewritten table
+ANALYZE profiles;
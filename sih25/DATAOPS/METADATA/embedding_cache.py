@@ -0,0 +1,75 @@
+"""
+Embedding Cache
+Persistent SQLite cache of text embeddings keyed by (model, content hash), so
+re-ingesting unchanged profile summaries never calls the embedding model again
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+# Keys per IN (...) lookup, below SQLite's bound-parameter limit
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """Thread-safe SQLite map from (model, text) to a float32 embedding"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embed_cache (key BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, text: str) -> bytes:
+        """SHA-256 of the model name and text"""
+        return hashlib.sha256(f"{model}|{text}".encode()).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """Return the cached embeddings found among keys"""
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(unique_keys), _LOOKUP_BATCH):
+                batch = unique_keys[start:start + _LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embed_cache WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32).tolist()
+
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+        return found
+
+    def put_many(self, embeddings: Dict[bytes, Sequence[float]]) -> None:
+        """Store embeddings as float32 blobs, replacing existing entries"""
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in embeddings.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embed_cache (key, vec) VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM embed_cache").fetchone()[0]
+            return {
+                "size": size,
+                "path": self.path,
+                "hits": self.hits,
+                "misses": self.misses
+            }
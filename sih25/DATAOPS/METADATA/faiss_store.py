@@ -0,0 +1,389 @@
+"""
+FAISS Vector Store Backend
+GPU-capable FAISS index with columnar (pyarrow) metadata filtering,
+exposing the same search contract as the ChromaDB VectorStore
+"""
+
+import os
+import json
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+import numpy as np
+import faiss
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .vector_store import VectorStore, parameter_flags, stale_parameter_flags
+
+logger = logging.getLogger(__name__)
+
+# IVF indexes need roughly 39 training points per centroid
+_TRAINING_POINTS_PER_LIST = 39
+
+# Index factory strings for the supported quantization modes
+_QUANTIZATION_FACTORIES = {
+    "pq8": "OPQ64,IVF4096,PQ64x8",  # 64 bytes per vector
+    "sq8": "IVF4096,SQ8",  # int8 scalar quantization, 1 byte per dimension
+    "none": "IVF4096,Flat",
+}
+
+# ChromaDB where-operators mapped to pyarrow compute functions
+_COMPARISONS = {
+    "$eq": pc.equal,
+    "$ne": pc.not_equal,
+    "$gt": pc.greater,
+    "$gte": pc.greater_equal,
+    "$lt": pc.less,
+    "$lte": pc.less_equal,
+}
+
+
+def _nlist_from_factory(factory: str) -> int:
+    """Number of IVF lists declared in an index factory string (0 if not IVF)"""
+    for component in factory.split(","):
+        if component.startswith("IVF"):
+            digits = "".join(ch for ch in component[3:] if ch.isdigit())
+            return int(digits) if digits else 0
+    return 0
+
+
+def _where_mask(table: pa.Table, where: Dict[str, Any]) -> pa.ChunkedArray:
+    """Evaluate a ChromaDB-style where filter to a boolean mask over the metadata table"""
+    masks = []
+    for key, condition in where.items():
+        if key == "$and":
+            masks.append(_combine(pc.and_kleene, [_where_mask(table, c) for c in condition]))
+        elif key == "$or":
+            masks.append(_combine(pc.or_kleene, [_where_mask(table, c) for c in condition]))
+        elif key not in table.column_names:
+            # Missing metadata never matches, mirroring ChromaDB
+            masks.append(pa.chunked_array([pa.array(np.zeros(table.num_rows, dtype=bool))]))
+        else:
+            column = table.column(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, value in condition.items():
+                if op in _COMPARISONS:
+                    masks.append(_COMPARISONS[op](column, value))
+                elif op == "$in":
+                    masks.append(pc.is_in(column, value_set=pa.array(value)))
+                elif op == "$nin":
+                    masks.append(pc.invert(pc.is_in(column, value_set=pa.array(value))))
+                else:
+                    raise ValueError(f"Unsupported where operator: {op}")
+    return _combine(pc.and_kleene, masks)
+
+
+def _combine(op, masks: List[pa.ChunkedArray]) -> pa.ChunkedArray:
+    result = masks[0]
+    for mask in masks[1:]:
+        result = op(result, mask)
+    return result
+
+
+class FaissVectorStore(VectorStore):
+    """FAISS-backed vector store for ARGO metadata
+
+    Vectors are L2-normalized and searched by inner product, so similarity is
+    cosine similarity. Until enough vectors exist to train the configured IVF
+    index, an exact flat index is used instead.
+    """
+
+    def __init__(self, persist_directory: str = "sih25_vector_db", quantization: Optional[str] = None):
+        super().__init__(persist_directory)
+        self.index_directory = os.path.join(persist_directory, "faiss")
+        if quantization is not None:
+            if quantization not in _QUANTIZATION_FACTORIES:
+                raise ValueError(f"Unknown quantization '{quantization}', expected one of {list(_QUANTIZATION_FACTORIES)}")
+            self.index_factory = _QUANTIZATION_FACTORIES[quantization]
+        else:
+            self.index_factory = os.getenv("FAISS_INDEX_FACTORY", "IVF4096,PQ32")
+        self.training_sample_size = int(os.getenv("FAISS_TRAINING_SAMPLE", "100000"))
+        self.use_gpu = os.getenv("FAISS_USE_GPU", "true").lower() == "true"
+        self.over_fetch = int(os.getenv("FAISS_OVER_FETCH", "4"))
+        self.nprobe = int(os.getenv("FAISS_NPROBE", "32"))
+
+        self.index = None
+        self._gpu_resources = None
+        self._trained = False
+
+        # Row i of the metadata table describes vector i of the index
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._table: Optional[pa.Table] = None
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.index_directory, "index.faiss")
+
+    @property
+    def _metadata_path(self) -> str:
+        return os.path.join(self.index_directory, "metadata.parquet")
+
+    async def initialize(self):
+        """Load a persisted index and metadata, if present"""
+        try:
+            os.makedirs(self.index_directory, exist_ok=True)
+            if os.path.exists(self._index_path) and os.path.exists(self._metadata_path):
+                table = pq.read_table(self._metadata_path)
+                self._ids = table.column("id").to_pylist()
+                self._documents = table.column("document").to_pylist()
+                self._metadatas = table.drop(["id", "document"]).to_pylist()
+                self._rows = {profile_id: i for i, profile_id in enumerate(self._ids)}
+                self._set_index(faiss.read_index(self._index_path))
+            else:
+                self.index = None
+
+            logger.info(f"FAISS initialized with {len(self._ids)} embeddings (gpu={self._on_gpu()})")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize FAISS: {e}")
+            raise
+
+    def _on_gpu(self) -> bool:
+        return self._gpu_resources is not None
+
+    def _set_index(self, cpu_index) -> None:
+        """Install a CPU index, moving it to the GPU when available"""
+        self._trained = not isinstance(cpu_index, faiss.IndexFlat)
+        try:
+            faiss.extract_index_ivf(cpu_index).nprobe = self.nprobe
+        except RuntimeError:
+            pass  # Not an IVF index
+
+        if self.use_gpu and faiss.get_num_gpus() > 0:
+            if self._gpu_resources is None:
+                self._gpu_resources = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, cpu_index)
+        else:
+            self.index = cpu_index
+
+    def _cpu_index(self):
+        return faiss.index_gpu_to_cpu(self.index) if self._on_gpu() else self.index
+
+    @staticmethod
+    def _as_matrix(embeddings: List[List[float]]) -> np.ndarray:
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(matrix)
+        return matrix
+
+    def _maybe_train(self) -> None:
+        """Rebuild the flat index as the configured IVF index once there is enough data"""
+        if self._trained:
+            return
+        if self.index_factory == "Flat":
+            self._trained = True
+            return
+
+        nlist = _nlist_from_factory(self.index_factory)
+        if self.index.ntotal < max(nlist * _TRAINING_POINTS_PER_LIST, 1):
+            return
+
+        vectors = self._cpu_index().reconstruct_n(0, self.index.ntotal)
+        trained = faiss.index_factory(vectors.shape[1], self.index_factory, faiss.METRIC_INNER_PRODUCT)
+
+        # Quantizers only need a representative sample, not the whole corpus
+        sample = vectors
+        if len(vectors) > self.training_sample_size:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(len(vectors), self.training_sample_size, replace=False)]
+
+        logger.info(f"Training FAISS index '{self.index_factory}' on {len(sample)} of {len(vectors)} vectors")
+        trained.train(sample)
+        trained.add(vectors)
+        self._set_index(trained)
+
+    def _persist(self) -> None:
+        faiss.write_index(self._cpu_index(), self._index_path)
+        pq.write_table(self._metadata_table().append_column(
+            "id", pa.array(self._ids, pa.string())
+        ).append_column(
+            "document", pa.array(self._documents, pa.string())
+        ), self._metadata_path)
+
+    def _metadata_table(self) -> pa.Table:
+        if self._table is None:
+            # Rows carry different has_<PARAM> keys; from_pylist would take the schema from
+            # the first row only, so build columns over the union of keys (absent -> null)
+            keys = dict.fromkeys(key for metadata in self._metadatas for key in metadata)
+            self._table = pa.Table.from_pydict({
+                key: [metadata.get(key) for metadata in self._metadatas] for key in keys
+            })
+        return self._table
+
+    async def add_profiles(self, profiles: List[Dict[str, Any]]) -> bool:
+        """Add profile embeddings to the FAISS index"""
+        try:
+            # Skip profiles already indexed; the index is append-only
+            new_profiles = []
+            for i, profile in enumerate(profiles):
+                profile_id = profile.get('profile_id', f"profile_{i}")
+                if profile_id not in self._rows:
+                    new_profiles.append((profile_id, profile))
+            if not new_profiles:
+                return True
+            profiles = [profile for _, profile in new_profiles]
+
+            summaries = [self._create_profile_summary(profile) for profile in profiles]
+            vectors = self._as_matrix(await self._get_embeddings(summaries))
+
+            if self.index is None:
+                self._set_index(faiss.IndexFlatIP(vectors.shape[1]))
+            self.index.add(vectors)
+
+            for i, (profile_id, profile) in enumerate(new_profiles):
+                self._rows[profile_id] = len(self._ids)
+                self._ids.append(profile_id)
+                self._documents.append(summaries[i])
+                self._metadatas.append({
+                    "profile_id": profile_id,
+                    "float_id": profile.get('float_id', 'unknown'),
+                    "timestamp": profile.get('timestamp', ''),
+                    "latitude": float(profile.get('latitude', 0.0)),
+                    "longitude": float(profile.get('longitude', 0.0)),
+                    # Canonicalized to lowercase once here so filters and matches compare directly
+                    "region": profile.get('region', 'unknown').lower(),
+                    "season": profile.get('season', 'unknown').lower(),
+                    "parameters": json.dumps(profile.get('parameters', [])),
+                    "added_at": datetime.now().isoformat(),
+                    **parameter_flags(profile.get('parameters', []))
+                })
+            self._table = None
+
+            self._maybe_train()
+            self._persist()
+            self._notify_change([profile_id for profile_id, _ in new_profiles])
+
+            logger.info(f"Added {len(profiles)} profiles to FAISS vector store")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to add profiles to FAISS vector store: {e}")
+            return False
+
+    async def backfill_parameter_flags(self) -> int:
+        """Add has_<PARAM> keys to profiles ingested before add_profiles wrote them"""
+        updated = []
+        for profile_id, metadata in zip(self._ids, self._metadatas):
+            flags = stale_parameter_flags(metadata)
+            if flags:
+                metadata.update(flags)
+                updated.append(profile_id)
+
+        if updated:
+            self._table = None
+            self._persist()
+            self._notify_change(updated)
+        logger.info(f"Backfilled parameter flags on {len(updated)} profiles")
+        return len(updated)
+
+    async def batch_search(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        where_filters: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[Optional[List[float]]]] = None,
+        distance_threshold: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several semantic searches sharing the same filters in one FAISS search
+
+        With filters, limit * over_fetch candidates are retrieved and filtered
+        against the columnar metadata.
+        """
+        if self.index is None or self.index.ntotal == 0:
+            return [[] for _ in queries]
+
+        try:
+            embeddings = list(query_embeddings) if query_embeddings else [None] * len(queries)
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            if missing:
+                computed = await asyncio.gather(*(self._embed_batcher.embed(queries[i]) for i in missing))
+                for i, embedding in zip(missing, computed):
+                    embeddings[i] = embedding
+
+            allowed = None
+            if where_filters:
+                mask = _where_mask(self._metadata_table(), where_filters)
+                allowed = np.asarray(pc.fill_null(mask, False).to_numpy(zero_copy_only=False), dtype=bool)
+
+            k = min(limit * self.over_fetch if allowed is not None else limit, self.index.ntotal)
+            # FAISS releases the GIL during search, so run it off the event loop
+            scores, rows = await asyncio.to_thread(self.index.search, self._as_matrix(embeddings), k)
+
+            batch_matches = []
+            for q in range(len(queries)):
+                matches = []
+                for score, row in zip(scores[q], rows[q]):
+                    if row < 0 or (allowed is not None and not allowed[row]):
+                        continue
+                    # Results are nearest-first, so stop at the first one too far away
+                    if distance_threshold is not None and 1 - score > distance_threshold:
+                        break
+                    matches.append({
+                        "profile_id": self._ids[row],
+                        "similarity": float(score),
+                        "metadata": self._metadatas[row],
+                        "summary": self._documents[row]
+                    })
+                    if len(matches) == limit:
+                        break
+                batch_matches.append(matches)
+
+            return batch_matches
+
+        except Exception as e:
+            logger.error(f"Semantic search failed: {e}")
+            return [[] for _ in queries]
+
+    async def find_similar_profiles(
+        self,
+        profile_id: str,
+        similarity_threshold: float = 0.7,
+        limit: int = 10,
+        exclude_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Find profiles similar to a given profile, skipping any in exclude_ids"""
+        row = self._rows.get(profile_id)
+        if row is None:
+            return []
+
+        return await self.semantic_search(
+            query=self._documents[row],
+            limit=limit,
+            where_filters={"profile_id": {"$nin": exclude_ids}} if exclude_ids else None
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get vector store statistics"""
+        return {
+            "status": "active",
+            "total_embeddings": len(self._ids),
+            "collection_name": "argo_profiles",
+            "backend": "faiss-gpu" if self._on_gpu() else "faiss",
+            "index_type": self.index_factory if self._trained else "Flat",
+            "embedding_model": "mistral-embed" if self.use_mistral else "sentence-transformers",
+            "last_updated": datetime.now().isoformat()
+        }
+
+    async def reset_collection(self) -> bool:
+        """Reset the FAISS index and metadata"""
+        try:
+            self.index = None
+            self._trained = False
+            self._ids, self._rows, self._documents, self._metadatas = [], {}, [], []
+            self._table = None
+            for path in (self._index_path, self._metadata_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._notify_change([])
+            logger.info("FAISS vector store reset")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to reset FAISS vector store: {e}")
+            return False
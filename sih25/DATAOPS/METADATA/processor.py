@@ -7,7 +7,7 @@ import os
 import json
 import csv
 import logging
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 import asyncio
@@ -20,6 +20,60 @@ from .vector_store import get_vector_store, ProfileSummary
 
 logger = logging.getLogger(__name__)
 
+# Map common field variations to standard names; the first variation present wins
+_FIELD_MAPPINGS = {
+    'profile_id': ['profile_id', 'id', 'profile', 'cycle_number'],
+    'float_id': ['float_id', 'wmo', 'wmo_id', 'platform_number'],
+    'latitude': ['latitude', 'lat', 'y', 'juld_lat'],
+    'longitude': ['longitude', 'lon', 'x', 'juld_lon'],
+    'timestamp': ['timestamp', 'time', 'date', 'juld', 'date_creation'],
+    'parameters': ['parameters', 'params', 'variables', 'measurements'],
+    'depth_min': ['depth_min', 'min_depth', 'pres_min'],
+    'depth_max': ['depth_max', 'max_depth', 'pres_max'],
+    'qc_flag': ['qc_flag', 'quality', 'data_mode'],
+    'region': ['region', 'ocean', 'basin'],
+    'season': ['season', 'month']
+}
+
+_SEASONS = {1: "winter", 4: "spring", 7: "summer", 10: "autumn"}
+
+
+def _season_of(timestamp: str) -> str:
+    """Season of an ISO timestamp string, 'unknown' if it doesn't parse"""
+    try:
+        month = datetime.fromisoformat(timestamp.replace('Z', '')).month
+    except ValueError:
+        return 'unknown'
+    return _SEASONS.get(((month - 1) // 3) * 3 + 1, "unknown")
+
+
+def _resolve_fields(keys) -> Tuple[Tuple[str, Any], ...]:
+    """(standard name, source field) pairs for a record or table with these keys"""
+    resolved = []
+    for standard_field, possible_fields in _FIELD_MAPPINGS.items():
+        for field in possible_fields:
+            if field in keys:
+                resolved.append((standard_field, field))
+                break
+    return tuple(resolved)
+
+
+def _classify_latitudes(latitudes: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Region per latitude, plus a mask of values the scalar float() path must decide
+
+    NaN latitudes compare false everywhere and fall through to 'temperate', as with
+    the per-record comparisons.
+    """
+    lat = pd.to_numeric(latitudes, errors='coerce').to_numpy(dtype=np.float64)
+    regions = np.select(
+        [(lat >= -30) & (lat <= 30), (lat > 60) | (lat < -60)],
+        ['tropical', 'polar'],
+        'temperate'
+    )
+    is_float = latitudes.map(lambda value: isinstance(value, float)).to_numpy(dtype=bool)
+    return regions, np.isnan(lat) & ~is_float
+
 
 class MetadataFile(BaseModel):
     """Metadata file representation"""
@@ -115,43 +169,27 @@ class MetadataProcessor:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        profiles = []
-
         # Handle different JSON structures
         if isinstance(data, list):
             # List of profiles
-            for item in data:
-                profile = self._extract_profile_data(item)
-                if profile:
-                    profiles.append(profile)
+            return self._extract_profiles_bulk(data)
 
         elif isinstance(data, dict):
             if 'profiles' in data:
                 # JSON with profiles key
-                for item in data['profiles']:
-                    profile = self._extract_profile_data(item)
-                    if profile:
-                        profiles.append(profile)
+                return self._extract_profiles_bulk(data['profiles'])
             else:
                 # Single profile
                 profile = self._extract_profile_data(data)
-                if profile:
-                    profiles.append(profile)
+                return [profile] if profile else []
 
-        return profiles
+        return []
 
     async def _parse_csv_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Parse CSV metadata file"""
         try:
             df = pd.read_csv(file_path)
-            profiles = []
-
-            for _, row in df.iterrows():
-                profile = self._extract_profile_data(row.to_dict())
-                if profile:
-                    profiles.append(profile)
-
-            return profiles
+            return self._extract_profiles_frame(df)
 
         except Exception as e:
             logger.error(f"CSV parsing error: {e}")
@@ -159,20 +197,17 @@ class MetadataProcessor:
 
     async def _parse_jsonl_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Parse JSONL metadata file"""
-        profiles = []
+        records = []
 
         with open(file_path, 'r', encoding='utf-8') as f:
             for line_num, line in enumerate(f):
                 try:
-                    data = json.loads(line.strip())
-                    profile = self._extract_profile_data(data)
-                    if profile:
-                        profiles.append(profile)
+                    records.append(json.loads(line.strip()))
                 except json.JSONDecodeError as e:
                     logger.warning(f"Invalid JSON on line {line_num + 1}: {e}")
                     continue
 
-        return profiles
+        return self._extract_profiles_bulk(records)
 
     async def _parse_text_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Parse text metadata file (custom format)"""
@@ -223,43 +258,148 @@ class MetadataProcessor:
 
         return profiles
 
+    def _extract_profiles_frame(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Column-wise equivalent of _extract_profile_data for a whole table
+
+        Every row shares the table's columns, so field variations resolve once per file,
+        and region, season and parameter lists are computed per column rather than
+        building a Series per row. Rows whose latitude isn't numeric take the per-record
+        path.
+        """
+        n = len(df)
+        if n == 0:
+            return []
+
+        columns: Dict[str, Any] = {
+            standard_field: df[field] for standard_field, field in _resolve_fields(df.columns)
+        }
+
+        # Ensure required fields have defaults
+        if 'profile_id' not in columns:
+            columns['profile_id'] = [f"profile_{datetime.now().timestamp()}" for _ in range(n)]
+        if 'parameters' not in columns:
+            columns['parameters'] = [['temperature', 'salinity'] for _ in range(n)]
+        columns.setdefault('float_id', 'unknown')
+        columns.setdefault('timestamp', datetime.now().isoformat())
+        columns.setdefault('latitude', 0.0)
+        columns.setdefault('longitude', 0.0)
+        columns['min_depth'] = 0
+        columns['max_depth'] = 2000
+        columns['qc_summary'] = 'quality controlled data'
+        frame = pd.DataFrame(columns, index=df.index)
+
+        # Determine region based on coordinates
+        frame['region'], unparsed_lat = _classify_latitudes(frame['latitude'])
+
+        # Ensure parameters is a list
+        params = frame['parameters']
+        params_str = params.map(lambda value: isinstance(value, str))
+        if params_str.any():
+            frame['parameters'] = params.astype(object).mask(
+                params_str, params.str.strip().str.split(r'\s*,\s*', regex=True)
+            )
+
+        records = frame.to_dict(orient='records')
+
+        # Determine season for string timestamps, parsing each distinct value once
+        timestamps = frame['timestamp']
+        ts_str = timestamps.map(lambda value: isinstance(value, str)).to_numpy()
+        if ts_str.any():
+            season_rows = np.flatnonzero(ts_str).tolist()
+            seasons = {value: _season_of(value) for value in timestamps.iloc[season_rows].unique()}
+            for i in season_rows:
+                records[i]['season'] = seasons[records[i]['timestamp']]
+
+        # Latitudes pandas couldn't coerce go through the per-record float() check as before
+        if unparsed_lat.any():
+            for i in np.flatnonzero(unparsed_lat).tolist():
+                records[i] = self._extract_profile_data(df.iloc[i].to_dict())
+            records = [record for record in records if record]
+
+        return records
+
+    def _map_profile_fields(self, raw_data: Dict[str, Any], fields=None) -> Dict[str, Any]:
+        """
+        Map field variations to standard names and fill in defaults
+
+        fields: (standard name, source field) pairs from _resolve_fields, when the
+        caller has already resolved them for raw_data's keys
+        """
+        if fields is None:
+            fields = _resolve_fields(raw_data)
+
+        # Extract mapped fields
+        profile = {standard_field: raw_data[field] for standard_field, field in fields}
+
+        # Ensure required fields have defaults (clock reads only when a default is needed)
+        if 'profile_id' not in profile:
+            profile['profile_id'] = f"profile_{datetime.now().timestamp()}"
+        profile.setdefault('float_id', 'unknown')
+        if 'timestamp' not in profile:
+            profile['timestamp'] = datetime.now().isoformat()
+        profile.setdefault('latitude', 0.0)
+        profile.setdefault('longitude', 0.0)
+        if 'parameters' not in profile:
+            profile['parameters'] = ['temperature', 'salinity']
+        profile.setdefault('min_depth', 0)
+        profile.setdefault('max_depth', 2000)
+        profile.setdefault('qc_summary', 'quality controlled data')
+
+        # Ensure parameters is a list
+        if isinstance(profile['parameters'], str):
+            profile['parameters'] = [p.strip() for p in profile['parameters'].split(',')]
+
+        return profile
+
+    def _extract_profiles_bulk(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Batch equivalent of _extract_profile_data for parsed JSON records
+
+        Field variations resolve once per distinct key layout (records in a file usually
+        share one), region is assigned in one vectorized pass and each distinct
+        timestamp is parsed once.
+        """
+        profiles: List[Optional[Dict[str, Any]]] = []
+        batch = []  # Positions of mapped profiles still needing region and season
+        layouts: Dict[Tuple[str, ...], Tuple[Tuple[str, Any], ...]] = {}
+        for raw_data in rows:
+            if isinstance(raw_data, dict):
+                keys = tuple(raw_data)
+                fields = layouts.get(keys)
+                if fields is None:
+                    fields = layouts[keys] = _resolve_fields(raw_data)
+                batch.append(len(profiles))
+                profiles.append(self._map_profile_fields(raw_data, fields))
+            else:
+                profiles.append(self._extract_profile_data(raw_data))
+
+        if batch:
+            regions, unparsed_lat = _classify_latitudes(
+                pd.Series([profiles[i]['latitude'] for i in batch], dtype=object)
+            )
+            seasons: Dict[str, str] = {}
+            for i, region, unparsed in zip(batch, regions.tolist(), unparsed_lat.tolist()):
+                if unparsed:
+                    # Let float() accept or reject the latitude exactly as before
+                    profiles[i] = self._extract_profile_data(rows[i])
+                    continue
+
+                profile = profiles[i]
+                profile['region'] = region
+                timestamp = profile['timestamp']
+                if isinstance(timestamp, str):
+                    season = seasons.get(timestamp)
+                    if season is None:
+                        season = seasons[timestamp] = _season_of(timestamp)
+                    profile['season'] = season
+
+        return [profile for profile in profiles if profile]
+
     def _extract_profile_data(self, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract and standardize profile data from raw input"""
         try:
-            # Map common field variations to standard names
-            field_mappings = {
-                'profile_id': ['profile_id', 'id', 'profile', 'cycle_number'],
-                'float_id': ['float_id', 'wmo', 'wmo_id', 'platform_number'],
-                'latitude': ['latitude', 'lat', 'y', 'juld_lat'],
-                'longitude': ['longitude', 'lon', 'x', 'juld_lon'],
-                'timestamp': ['timestamp', 'time', 'date', 'juld', 'date_creation'],
-                'parameters': ['parameters', 'params', 'variables', 'measurements'],
-                'depth_min': ['depth_min', 'min_depth', 'pres_min'],
-                'depth_max': ['depth_max', 'max_depth', 'pres_max'],
-                'qc_flag': ['qc_flag', 'quality', 'data_mode'],
-                'region': ['region', 'ocean', 'basin'],
-                'season': ['season', 'month']
-            }
-
-            profile = {}
-
-            # Extract mapped fields
-            for standard_field, possible_fields in field_mappings.items():
-                for field in possible_fields:
-                    if field in raw_data:
-                        profile[standard_field] = raw_data[field]
-                        break
-
-            # Ensure required fields have defaults
-            profile.setdefault('profile_id', f"profile_{datetime.now().timestamp()}")
-            profile.setdefault('float_id', 'unknown')
-            profile.setdefault('timestamp', datetime.now().isoformat())
-            profile.setdefault('latitude', 0.0)
-            profile.setdefault('longitude', 0.0)
-            profile.setdefault('parameters', ['temperature', 'salinity'])
-            profile.setdefault('min_depth', 0)
-            profile.setdefault('max_depth', 2000)
-            profile.setdefault('qc_summary', 'quality controlled data')
+            profile = self._map_profile_fields(raw_data)
 
             # Determine region based on coordinates
             lat = float(profile['latitude'])
@@ -271,18 +411,8 @@ class MetadataProcessor:
                 profile['region'] = 'temperate'
 
             # Determine season if timestamp is available
-            try:
-                if isinstance(profile['timestamp'], str):
-                    dt = datetime.fromisoformat(profile['timestamp'].replace('Z', ''))
-                    month = dt.month
-                    seasons = {1: "winter", 4: "spring", 7: "summer", 10: "autumn"}
-                    profile['season'] = seasons.get(((month-1)//3)*3 + 1, "unknown")
-            except:
-                profile['season'] = 'unknown'
-
-            # Ensure parameters is a list
-            if isinstance(profile['parameters'], str):
-                profile['parameters'] = [p.strip() for p in profile['parameters'].split(',')]
+            if isinstance(profile['timestamp'], str):
+                profile['season'] = _season_of(profile['timestamp'])
 
             return profile
 
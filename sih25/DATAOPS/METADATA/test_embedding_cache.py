@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent embedding cache
+Covers the SQLite store itself and VectorStore._cached_embeddings on top of it
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from sih25.DATAOPS.METADATA import embedding_cache
+from sih25.DATAOPS.METADATA.embedding_cache import EmbeddingCache
+from sih25.DATAOPS.METADATA.vector_store import VectorStore
+
+
+def vector(i, dim=8):
+    return (np.arange(dim, dtype=np.float64) * 0.1 + i).tolist()
+
+
+def test_make_key_depends_on_model_and_text():
+    key = EmbeddingCache.make_key("mistral-embed", "profile summary")
+
+    assert key == EmbeddingCache.make_key("mistral-embed", "profile summary")
+    assert len(key) == 32
+    assert key != EmbeddingCache.make_key("all-MiniLM-L6-v2", "profile summary")
+    assert key != EmbeddingCache.make_key("mistral-embed", "profile summary ")
+
+
+def test_round_trip_and_stats(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "nested" / "cache.sqlite3"))
+    keys = [EmbeddingCache.make_key("m", f"text {i}") for i in range(3)]
+
+    cache.put_many({keys[0]: vector(0), keys[1]: vector(1)})
+    found = cache.get_many([keys[0], keys[2], keys[0], keys[1]])
+
+    assert set(found) == {keys[0], keys[1]}
+    # Stored as float32, so values come back at float32 precision
+    np.testing.assert_array_equal(found[keys[1]], np.float32(vector(1)))
+    # Duplicate keys are looked up (and counted) once
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (2, 2, 1)
+
+
+def test_put_many_replaces_existing(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    key = EmbeddingCache.make_key("m", "text")
+
+    cache.put_many({key: vector(0)})
+    cache.put_many({key: vector(5)})
+
+    assert cache.get_many([key])[key] == pytest.approx(vector(5))
+    assert cache.stats()["size"] == 1
+
+
+def test_lookups_span_several_batches(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    count = embedding_cache._LOOKUP_BATCH * 2 + 7
+    stored = {EmbeddingCache.make_key("m", str(i)): vector(i, dim=2) for i in range(count)}
+    cache.put_many(stored)
+
+    found = cache.get_many(list(stored) + [EmbeddingCache.make_key("m", "absent")])
+
+    assert len(found) == count
+    assert all(found[key] == pytest.approx(value) for key, value in stored.items())
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    key = EmbeddingCache.make_key("m", "text")
+    EmbeddingCache(path).put_many({key: vector(3)})
+
+    reopened = EmbeddingCache(path)
+
+    assert reopened.get_many([key])[key] == pytest.approx(vector(3))
+
+
+def test_concurrent_access(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(offset, offset + 50):
+                key = EmbeddingCache.make_key("m", str(i))
+                cache.put_many({key: vector(i)})
+                assert cache.get_many([key])[key] == pytest.approx(vector(i))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(0, 400, 50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert cache.stats()["size"] == 400
+
+
+def make_store(monkeypatch, tmp_path):
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    return VectorStore(persist_directory=str(tmp_path))
+
+
+class RecordingEmbedder:
+    """Embed function that records every batch it is asked for"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            return []
+        return [vector(len(text)) for text in texts]
+
+
+def test_cached_embeddings_only_embeds_new_texts(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+        embed = RecordingEmbedder()
+
+        first = await store._cached_embeddings("m", ["a", "bb", "a"], embed)
+        second = await store._cached_embeddings("m", ["bb", "ccc", "a"], embed)
+        other_model = await store._cached_embeddings("other", ["a"], embed)
+
+        assert embed.batches == [["a", "bb"], ["ccc"], ["a"]]
+        assert first == [pytest.approx(vector(1)), pytest.approx(vector(2)), pytest.approx(vector(1))]
+        assert second == [pytest.approx(vector(2)), pytest.approx(vector(3)), pytest.approx(vector(1))]
+        assert other_model == [pytest.approx(vector(1))]
+
+    asyncio.run(run())
+
+
+def test_cached_embeddings_failure_caches_nothing(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+
+        assert await store._cached_embeddings("m", ["a"], RecordingEmbedder(fail=True)) is None
+
+        embed = RecordingEmbedder()
+        assert await store._cached_embeddings("m", ["a"], embed) == [pytest.approx(vector(1))]
+        assert embed.batches == [["a"]]
+
+    asyncio.run(run())
+
+
+def test_cached_embeddings_without_cache(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+        # A directory where the database file should be makes the cache unavailable
+        (tmp_path / "cache.sqlite3").mkdir()
+        embed = RecordingEmbedder()
+
+        await store._cached_embeddings("m", ["a"], embed)
+        await store._cached_embeddings("m", ["a"], embed)
+
+        assert store._embedding_cache_failed
+        assert embed.batches == [["a"], ["a"]]
+
+    asyncio.run(run())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Tests for the FAISS vector store backend
+Covers the columnar where-filter against a reference evaluator and the
+add / search / persist / reset cycle with deterministic embeddings
+"""
+
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+pa = pytest.importorskip("pyarrow")
+pc = pytest.importorskip("pyarrow.compute")
+
+from sih25.DATAOPS.METADATA.faiss_store import FaissVectorStore, _where_mask
+
+EMBEDDING_DIM = 16
+
+# Rows with ragged has_<PARAM> keys, as add_profiles produces them
+METADATAS = [
+    {"profile_id": "p0", "region": "tropical", "latitude": 5.0, "has_TEMP": True},
+    {"profile_id": "p1", "region": "polar", "latitude": 75.0, "has_TEMP": True, "has_DOXY": True},
+    {"profile_id": "p2", "region": "temperate", "latitude": -45.0},
+    {"profile_id": "p3", "region": "tropical", "latitude": -10.0, "has_DOXY": True, "has_CHLA": True},
+    {"profile_id": "p4", "region": "polar", "latitude": -70.0, "has_PSAL": True},
+]
+
+REFERENCE_OPERATORS = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a > b,
+    "$gte": lambda a, b: a >= b,
+    "$lt": lambda a, b: a < b,
+    "$lte": lambda a, b: a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def reference_match(metadata, where):
+    """ChromaDB semantics: every clause must hold and missing keys never match"""
+    for key, condition in where.items():
+        if key == "$and":
+            ok = all(reference_match(metadata, c) for c in condition)
+        elif key == "$or":
+            ok = any(reference_match(metadata, c) for c in condition)
+        elif key not in metadata:
+            ok = False
+        else:
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            ok = all(REFERENCE_OPERATORS[op](metadata[key], value) for op, value in condition.items())
+        if not ok:
+            return False
+    return True
+
+
+def metadata_table(metadatas):
+    store = FaissVectorStore.__new__(FaissVectorStore)
+    store._metadatas, store._table = metadatas, None
+    return store._metadata_table()
+
+
+@pytest.mark.parametrize("where", [
+    {"region": "polar"},
+    {"region": {"$ne": "polar"}},
+    {"latitude": {"$gt": 0.0}},
+    {"latitude": {"$gte": -10.0, "$lt": 75.0}},
+    {"latitude": {"$lte": -45.0}},
+    {"region": {"$in": ["tropical", "temperate"]}},
+    {"profile_id": {"$nin": ["p0", "p4"]}},
+    {"has_DOXY": True},
+    {"has_CHLA": {"$ne": False}},
+    {"has_NITRATE": True},
+    {"$and": [{"has_TEMP": True}, {"has_DOXY": True}]},
+    {"$or": [{"has_PSAL": True}, {"region": "temperate"}]},
+    {"$or": [{"has_DOXY": True}, {"$and": [{"region": "polar"}, {"latitude": {"$lt": 0.0}}]}]},
+    {"region": "tropical", "has_DOXY": True},
+])
+def test_where_mask_matches_reference(where):
+    table = metadata_table(METADATAS)
+
+    mask = pc.fill_null(_where_mask(table, where), False).to_pylist()
+
+    assert mask == [reference_match(metadata, where) for metadata in METADATAS]
+
+
+def test_metadata_table_keeps_keys_missing_from_first_row():
+    table = metadata_table(METADATAS)
+
+    assert {"has_TEMP", "has_DOXY", "has_CHLA", "has_PSAL"} <= set(table.column_names)
+    assert table.column("has_DOXY").to_pylist() == [None, True, None, True, None]
+
+
+def test_where_mask_rejects_unknown_operator():
+    with pytest.raises(ValueError, match="Unsupported where operator"):
+        _where_mask(metadata_table(METADATAS), {"latitude": {"$near": 0.0}})
+
+
+def fake_embedding(text):
+    """Deterministic pseudo-random embedding of a text"""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    return np.random.default_rng(seed).normal(size=EMBEDDING_DIM).tolist()
+
+
+def make_profiles(count):
+    parameters = [["TEMP", "PSAL"], ["TEMP", "PSAL", "DOXY"], ["TEMP", "CHLA"]]
+    return [
+        {
+            "profile_id": f"profile_{i}",
+            "float_id": f"59{i:05d}",
+            "timestamp": f"2023-{i % 12 + 1:02d}-15T00:00:00Z",
+            "latitude": float(i % 150 - 75),
+            "longitude": float(i * 7 % 360 - 180),
+            "region": ["Tropical", "Polar", "Temperate"][i % 3],
+            "season": "Winter",
+            "parameters": parameters[i % len(parameters)],
+        }
+        for i in range(count)
+    ]
+
+
+def make_store(monkeypatch, directory, index_factory="Flat"):
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+    monkeypatch.setenv("FAISS_USE_GPU", "false")
+    monkeypatch.setenv("FAISS_INDEX_FACTORY", index_factory)
+    store = FaissVectorStore(persist_directory=str(directory))
+
+    async def get_embeddings(texts):
+        return [fake_embedding(text) for text in texts]
+
+    monkeypatch.setattr(store, "_get_embeddings", get_embeddings)
+    return store
+
+
+async def search_for(store, profile_id, **kwargs):
+    """Search with the stored embedding of a profile's own summary"""
+    summary = store._documents[store._rows[profile_id]]
+    return await store.semantic_search(summary, query_embedding=fake_embedding(summary), **kwargs)
+
+
+def test_add_search_and_filter(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+        await store.initialize()
+        assert await store.add_profiles(make_profiles(30))
+
+        matches = await search_for(store, "profile_4", limit=5)
+        assert matches[0]["profile_id"] == "profile_4"
+        assert matches[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+        assert len(matches) == 5
+        assert [m["similarity"] for m in matches] == sorted((m["similarity"] for m in matches), reverse=True)
+
+        doxy = await search_for(store, "profile_4", limit=50, where_filters={"has_DOXY": True})
+        assert {m["profile_id"] for m in doxy} == {f"profile_{i}" for i in range(1, 30, 3)}
+
+        temperate_chla = await search_for(
+            store, "profile_5", limit=50,
+            where_filters={"$and": [{"region": "temperate"}, {"has_CHLA": True}]}
+        )
+        assert {m["profile_id"] for m in temperate_chla} == {f"profile_{i}" for i in range(2, 30, 3)}
+
+        excluded = await store.find_similar_profiles("profile_4", exclude_ids=["profile_4"])
+        assert "profile_4" not in {m["profile_id"] for m in excluded}
+
+        close = await search_for(store, "profile_4", limit=10, distance_threshold=1e-3)
+        assert [m["profile_id"] for m in close] == ["profile_4"]
+
+    asyncio.run(run())
+
+
+def test_add_profiles_skips_existing_ids(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+        await store.initialize()
+        changes = []
+        store.on_change.append(changes.append)
+
+        profiles = make_profiles(6)
+        assert await store.add_profiles(profiles[:4])
+        assert await store.add_profiles(profiles[2:])
+        assert await store.add_profiles(profiles)
+
+        assert store.index.ntotal == len(store._ids) == 6
+        assert changes == [[p["profile_id"] for p in profiles[:4]], [p["profile_id"] for p in profiles[4:]]]
+
+    asyncio.run(run())
+
+
+def test_persist_and_reload(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+        await store.initialize()
+        await store.add_profiles(make_profiles(12))
+        before = await search_for(store, "profile_7", limit=12, where_filters={"has_DOXY": True})
+
+        reloaded = make_store(monkeypatch, tmp_path)
+        await reloaded.initialize()
+        after = await search_for(reloaded, "profile_7", limit=12, where_filters={"has_DOXY": True})
+
+        assert reloaded._ids == store._ids
+        assert [m["profile_id"] for m in after] == [m["profile_id"] for m in before]
+        assert [m["similarity"] for m in after] == pytest.approx([m["similarity"] for m in before])
+
+        assert await reloaded.reset_collection()
+        assert await reloaded.semantic_search("anything", query_embedding=fake_embedding("anything")) == []
+        assert (await reloaded.get_stats())["total_embeddings"] == 0
+
+    asyncio.run(run())
+
+
+def test_trains_ivf_index_once_large_enough(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path, index_factory="IVF2,Flat")
+        await store.initialize()
+        profiles = make_profiles(120)
+
+        await store.add_profiles(profiles[:40])
+        assert (await store.get_stats())["index_type"] == "Flat"
+
+        await store.add_profiles(profiles[40:])
+        assert (await store.get_stats())["index_type"] == "IVF2,Flat"
+
+        store.index.nprobe = 2  # Probe every list so search stays exact
+        matches = await search_for(store, "profile_100", limit=3)
+        assert matches[0]["profile_id"] == "profile_100"
+
+    asyncio.run(run())
+
+
+def test_backfill_parameter_flags(monkeypatch, tmp_path):
+    async def run():
+        store = make_store(monkeypatch, tmp_path)
+        await store.initialize()
+        await store.add_profiles(make_profiles(9))
+
+        # Simulate profiles ingested before has_<PARAM> keys existed
+        for metadata in store._metadatas[:6]:
+            for key in [key for key in metadata if key.startswith("has_")]:
+                del metadata[key]
+        store._table = None
+        store._persist()
+
+        legacy = make_store(monkeypatch, tmp_path)
+        await legacy.initialize()
+        doxy = {"has_DOXY": True}
+        assert {m["profile_id"] for m in await search_for(legacy, "profile_1", limit=9, where_filters=doxy)} == {"profile_7"}
+
+        changes = []
+        legacy.on_change.append(changes.append)
+        assert await legacy.backfill_parameter_flags() == 6
+        assert await legacy.backfill_parameter_flags() == 0
+        assert changes == [[f"profile_{i}" for i in range(6)]]
+
+        expected = {"profile_1", "profile_4", "profile_7"}
+        assert {m["profile_id"] for m in await search_for(legacy, "profile_1", limit=9, where_filters=doxy)} == expected
+
+        # The backfill is persisted
+        reloaded = make_store(monkeypatch, tmp_path)
+        await reloaded.initialize()
+        assert {m["profile_id"] for m in await search_for(reloaded, "profile_1", limit=9, where_filters=doxy)} == expected
+
+    asyncio.run(run())
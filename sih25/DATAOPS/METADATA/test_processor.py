@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for metadata profile extraction
+The column-wise CSV path and the bulk JSON path must produce exactly what the
+per-record _extract_profile_data produces for the same input
+"""
+
+import io
+import json
+import math
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from sih25.DATAOPS.METADATA import processor
+from sih25.DATAOPS.METADATA.processor import MetadataProcessor
+
+
+class FrozenDatetime(datetime):
+    """datetime with a fixed now(), so generated defaults are comparable"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def metadata_processor(monkeypatch, tmp_path):
+    monkeypatch.setattr(processor, "datetime", FrozenDatetime)
+    return MetadataProcessor(upload_dir=str(tmp_path / "uploads"))
+
+
+def normalized(profiles):
+    """Make profiles comparable: NaN equals NaN and NumPy scalars equal Python ones"""
+    def value(v):
+        if isinstance(v, np.generic):
+            v = v.item()
+        if isinstance(v, float) and math.isnan(v):
+            return "NaN"
+        if isinstance(v, list):
+            return [value(item) for item in v]
+        return v
+    return [{key: value(v) for key, v in profile.items()} for profile in profiles]
+
+
+def per_record_frame(metadata_processor, df):
+    """The original row-by-row CSV extraction"""
+    profiles = []
+    for _, row in df.iterrows():
+        profile = metadata_processor._extract_profile_data(row.to_dict())
+        if profile:
+            profiles.append(profile)
+    return profiles
+
+
+def per_record_bulk(metadata_processor, rows):
+    profiles = (metadata_processor._extract_profile_data(raw_data) for raw_data in rows)
+    return [profile for profile in profiles if profile]
+
+
+CSV_FILES = {
+    "standard": (
+        "profile_id,float_id,latitude,longitude,timestamp,parameters\n"
+        "p1,5901,10.5,-30.0,2023-01-15T00:00:00Z,\"TEMP, PSAL\"\n"
+        "p2,5902,65.0,20.0,2023-07-01T06:00:00,TEMP\n"
+        "p3,5903,-75.5,120.0,2023-10-31,\"TEMP,PSAL , DOXY\"\n"
+        "p4,5904,-30.0,0.0,not a date,\n"
+        "p5,5905,30.0001,0.0,2023-04-01T00:00:00Z,CHLA\n"
+    ),
+    "aliases": (
+        "id,wmo,lat,lon,time,variables,min_depth,pres_max,ocean,data_mode\n"
+        "1,5901,-60.0,1.0,2023-02-01T00:00:00Z,\"TEMP,PSAL\",5,1800,atlantic,R\n"
+        "2,5902,60.0001,2.0,2023-12-01T00:00:00Z,TEMP,10,1000,arctic,D\n"
+        "3,5903,,3.0,2023-05-01T00:00:00Z,TEMP,0,2000,pacific,A\n"
+    ),
+    "defaults": (
+        "lat,lon\n"
+        "0.0,0.0\n"
+        "45.0,90.0\n"
+    ),
+    "numeric_time": (
+        "profile_id,lat,juld,params\n"
+        "a,12.0,27000.5,TEMP\n"
+        "b,-45.0,27001.25,PSAL\n"
+    ),
+    "text_latitudes": (
+        "profile_id,latitude,timestamp\n"
+        "a,12.5,2023-01-01\n"
+        "b,north,2023-02-01\n"
+        "c, -70 ,2023-03-01\n"
+        "d,,2023-04-01\n"
+        "e,inf,2023-05-01\n"
+    ),
+    "empty": "profile_id,latitude\n",
+}
+
+
+@pytest.mark.parametrize("name", CSV_FILES)
+def test_frame_extraction_matches_per_record(metadata_processor, name):
+    df = pd.read_csv(io.StringIO(CSV_FILES[name]))
+
+    expected = per_record_frame(metadata_processor, df)
+    actual = metadata_processor._extract_profiles_frame(df)
+
+    assert normalized(actual) == normalized(expected)
+
+
+def test_frame_extraction_mixed_object_columns(metadata_processor):
+    # Missing values are NaN, as read_csv produces them; iterrows() re-infers each row's
+    # dtype, so how it treats None differs between pandas versions
+    nan = float("nan")
+    df = pd.DataFrame({
+        "profile_id": ["a", "b", "c", "d", "e", "f"],
+        "latitude": [12.0, "15.5", nan, nan, "bad", 80],
+        "timestamp": ["2023-08-01", 1690848000, nan, "2023-11-30T00:00:00Z", "2023-01-01", "garbage"],
+        "parameters": [["TEMP"], "TEMP,PSAL", "", ["DOXY", "CHLA"], " TEMP , PSAL ", None],
+    })
+
+    expected = per_record_frame(metadata_processor, df)
+    actual = metadata_processor._extract_profiles_frame(df)
+
+    assert normalized(actual) == normalized(expected)
+
+
+BULK_ROWS = [
+    {"profile_id": "p1", "float_id": "5901", "latitude": 10.0, "longitude": 5.0,
+     "timestamp": "2023-01-15T00:00:00Z", "parameters": ["TEMP", "PSAL"]},
+    {"profile_id": "p2", "float_id": "5902", "latitude": 70.0, "longitude": 5.0,
+     "timestamp": "2023-07-15T00:00:00Z", "parameters": "TEMP, PSAL,DOXY"},
+    # Alias layout, repeated so the resolved fields are reused
+    {"id": "p3", "wmo": "5903", "lat": -45.0, "lon": 100.0, "time": "2023-04-02", "params": "TEMP"},
+    {"id": "p4", "wmo": "5904", "lat": -65.0, "lon": 101.0, "time": "2023-04-02", "params": "PSAL"},
+    # Same keys in a different order
+    {"lat": 0.0, "id": "p5", "time": "2023-09-09", "lon": 0.0, "wmo": "5905", "params": "TEMP"},
+    # Defaults only
+    {},
+    # Latitudes float() accepts or rejects differently from pandas
+    {"profile_id": "s1", "latitude": "12.5"},
+    {"profile_id": "s2", "latitude": " -70 "},
+    {"profile_id": "s3", "latitude": "north"},
+    {"profile_id": "s4", "latitude": None},
+    {"profile_id": "s5", "latitude": True},
+    {"profile_id": "s6", "latitude": float("nan")},
+    {"profile_id": "s7", "latitude": "1e1"},
+    {"profile_id": "s8", "latitude": [1.0]},
+    # Timestamps that aren't strings or don't parse
+    {"profile_id": "t1", "latitude": 1.0, "timestamp": 1690848000},
+    {"profile_id": "t2", "latitude": 1.0, "timestamp": "soon"},
+    {"profile_id": "t3", "latitude": 1.0, "timestamp": None, "season": "summer"},
+    # Records that aren't objects at all
+    "not a record",
+    None,
+    42,
+]
+
+
+def test_bulk_extraction_matches_per_record(metadata_processor):
+    expected = per_record_bulk(metadata_processor, BULK_ROWS)
+    actual = metadata_processor._extract_profiles_bulk(BULK_ROWS)
+
+    assert normalized(actual) == normalized(expected)
+
+
+def test_bulk_extraction_empty(metadata_processor):
+    assert metadata_processor._extract_profiles_bulk([]) == []
+
+
+def test_bulk_extraction_does_not_share_parameter_lists(metadata_processor):
+    profiles = metadata_processor._extract_profiles_bulk([{"profile_id": "a"}, {"profile_id": "b"}])
+
+    profiles[0]["parameters"].append("DOXY")
+
+    assert profiles[1]["parameters"] == ["temperature", "salinity"]
+
+
+@pytest.mark.parametrize("suffix, encode", [
+    (".json", lambda rows: json.dumps(rows)),
+    (".json", lambda rows: json.dumps({"profiles": rows})),
+    (".jsonl", lambda rows: "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"),
+])
+def test_json_files_use_bulk_path(metadata_processor, tmp_path, suffix, encode):
+    rows = [row for row in BULK_ROWS if isinstance(row, dict) and not any(
+        isinstance(value, float) and math.isnan(value) for value in row.values()
+    )]
+    path = tmp_path / f"metadata{suffix}"
+    path.write_text(encode(rows))
+
+    profiles = asyncio.run(metadata_processor._parse_file(str(path), suffix))
+
+    assert normalized(profiles) == normalized(per_record_bulk(metadata_processor, rows))
+
+
+def test_csv_file_uses_frame_path(metadata_processor, tmp_path):
+    path = tmp_path / "metadata.csv"
+    path.write_text(CSV_FILES["standard"])
+
+    profiles = asyncio.run(metadata_processor._parse_file(str(path), ".csv"))
+
+    expected = per_record_frame(metadata_processor, pd.read_csv(path))
+    assert normalized(profiles) == normalized(expected)
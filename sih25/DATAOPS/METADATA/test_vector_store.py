@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the ChromaDB vector store
+Covers the has_<PARAM> backfill for collections ingested before those keys existed
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from sih25.DATAOPS.METADATA import vector_store
+from sih25.DATAOPS.METADATA.vector_store import VectorStore, stale_parameter_flags
+
+
+@pytest.mark.parametrize("metadata, expected", [
+    ({"parameters": json.dumps(["TEMP", "DOXY"])}, {"has_TEMP": True, "has_DOXY": True}),
+    ({"parameters": json.dumps(["TEMP", "DOXY"]), "has_TEMP": True}, {"has_DOXY": True}),
+    ({"parameters": json.dumps(["TEMP"]), "has_TEMP": True}, {}),
+    # Columnar stores report absent keys as None
+    ({"parameters": json.dumps(["TEMP"]), "has_TEMP": None}, {"has_TEMP": True}),
+    ({"parameters": "[]"}, {}),
+    ({"parameters": "not json"}, {}),
+    ({"parameters": json.dumps({"TEMP": 1})}, {}),
+    ({}, {}),
+])
+def test_stale_parameter_flags(metadata, expected):
+    assert stale_parameter_flags(metadata) == expected
+
+
+def test_backfill_parameter_flags(monkeypatch, tmp_path):
+    monkeypatch.delenv("CHROMA_HOST", raising=False)
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+    monkeypatch.setattr(vector_store, "BACKFILL_BATCH_SIZE", 4)
+
+    async def run():
+        store = VectorStore(persist_directory=str(tmp_path))
+        await store.initialize()
+
+        # Profiles as the old add_profiles stored them: parameters only as a JSON string
+        parameters = [["TEMP", "PSAL"], ["TEMP", "DOXY"], []]
+        ids = [f"profile_{i}" for i in range(10)]
+        store.collection.add(
+            ids=ids,
+            embeddings=[[float(i), 1.0, 0.0] for i in range(10)],
+            documents=[f"summary {i}" for i in range(10)],
+            metadatas=[
+                {"profile_id": profile_id, "region": "polar", "parameters": json.dumps(parameters[i % 3])}
+                for i, profile_id in enumerate(ids)
+            ]
+        )
+
+        changes = []
+        store.on_change.append(changes.append)
+        assert await store.backfill_parameter_flags() == 7
+        assert await store.backfill_parameter_flags() == 0
+        assert changes == [[profile_id for i, profile_id in enumerate(ids) if i % 3 != 2]]
+
+        doxy = store.collection.get(where={"has_DOXY": True})
+        assert sorted(doxy["ids"]) == ["profile_1", "profile_4", "profile_7"]
+
+        # Existing metadata is kept alongside the new keys
+        stored = store.collection.get(ids=["profile_1"])["metadatas"][0]
+        assert stored == {
+            "profile_id": "profile_1", "region": "polar", "parameters": json.dumps(["TEMP", "DOXY"]),
+            "has_TEMP": True, "has_DOXY": True
+        }
+
+    asyncio.run(run())
@@ -6,7 +6,7 @@ Handles embeddings generation and storage for semantic search
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime
 import asyncio
 import hashlib
@@ -16,8 +16,42 @@ from chromadb.config import Settings
 import httpx
 from pydantic import BaseModel
 
+from .embedding_cache import EmbeddingCache
+
+# HTTP/2 needs the h2 extra (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Texts per Mistral embeddings request; larger inputs are split and sent concurrently
+MISTRAL_BATCH_SIZE = 64
+
+MISTRAL_EMBED_MODEL = "mistral-embed"
+SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"
+
+# Stored profiles read per page when backfilling metadata
+BACKFILL_BATCH_SIZE = 1000
+
+
+def parameter_flags(parameters: List[str]) -> Dict[str, bool]:
+    """One boolean has_<PARAM> metadata key per parameter, so filters can require parameters natively"""
+    return {f"has_{param}": True for param in parameters}
+
+
+def stale_parameter_flags(metadata: Dict[str, Any]) -> Dict[str, bool]:
+    """has_<PARAM> keys a stored profile's metadata is missing, from its JSON parameters list"""
+    try:
+        parameters = json.loads(metadata.get("parameters") or "[]")
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(parameters, list):
+        return {}
+    return {key: True for key in parameter_flags(parameters) if metadata.get(key) is not True}
+
 
 class ProfileSummary(BaseModel):
     """Profile summary for embedding generation"""
@@ -34,6 +68,45 @@ class ProfileSummary(BaseModel):
     data_quality: str
 
 
+class _EmbedBatcher:
+    """Coalesces query embeddings requested within a short window into one model call"""
+
+    def __init__(self, embed_fn, window_seconds: float = 0.003):
+        self.embed_fn = embed_fn
+        self.window_seconds = window_seconds
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._tasks: set = set()  # Strong references so in-flight batches aren't garbage collected
+
+    async def embed(self, query: str) -> List[float]:
+        """Queue a query and wait for its embedding from the shared batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+        if len(self._pending) == 1:
+            loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        items, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, items: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            embeddings = await self.embed_fn([query for query, _ in items])
+        except Exception as e:
+            logger.error(f"Batched embedding failed: {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(items, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
 class VectorStore:
     """ChromaDB-based vector store for ARGO metadata"""
 
@@ -42,6 +115,11 @@ class VectorStore:
         self.client = None
         self.collection = None
 
+        # Remote ChromaDB server (AsyncHttpClient); in-process PersistentClient when unset
+        self.chroma_host = os.getenv("CHROMA_HOST")
+        self.chroma_port = int(os.getenv("CHROMA_PORT", "8000"))
+        self.async_client = False
+
         # Mistral API configuration
         self.mistral_api_key = os.getenv("MISTRAL_API_KEY")
         if not self.mistral_api_key:
@@ -51,84 +129,183 @@ class VectorStore:
             self.use_mistral = True
 
         self.mistral_url = "https://api.mistral.ai/v1/embeddings"
+        self._http: Optional[httpx.AsyncClient] = None
 
         # Fallback embedding model
         self._sentence_transformer = None
 
+        # Embeddings of previously seen texts, persisted across runs
+        self.embedding_cache_path = os.getenv(
+            "EMBEDDING_CACHE_PATH", os.path.join(persist_directory, "embedding_cache.sqlite3")
+        )
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._embedding_cache_failed = False
+
+        # Query embeddings from concurrent searches share one model call
+        self._embed_batcher = _EmbedBatcher(self._get_embeddings)
+
+        # Called with the affected profile IDs whenever stored embeddings change
+        # (an empty list means the whole collection was reset)
+        self.on_change: List[Callable[[List[str]], None]] = []
+
+    def _notify_change(self, profile_ids: List[str]) -> None:
+        """Run change callbacks, e.g. to invalidate search caches"""
+        for callback in self.on_change:
+            try:
+                callback(profile_ids)
+            except Exception as e:
+                logger.error(f"Vector store change callback failed: {e}")
+
     async def initialize(self):
         """Initialize ChromaDB client and collection"""
         try:
-            # Create persistent ChromaDB client
-            self.client = chromadb.PersistentClient(
-                path=self.persist_directory,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
+            settings = Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
             )
+            if self.chroma_host:
+                # Async HTTP client to a ChromaDB server - queries never block the event loop
+                self.client = await chromadb.AsyncHttpClient(
+                    host=self.chroma_host,
+                    port=self.chroma_port,
+                    settings=settings
+                )
+                self.async_client = True
+            else:
+                # Create persistent ChromaDB client
+                self.client = chromadb.PersistentClient(
+                    path=self.persist_directory,
+                    settings=settings
+                )
 
             # Get or create collection for ARGO profiles
-            self.collection = self.client.get_or_create_collection(
+            self.collection = await self._run(
+                self.client.get_or_create_collection,
                 name="argo_profiles",
                 metadata={"description": "ARGO profile metadata and summaries"}
             )
 
-            logger.info(f"ChromaDB initialized with {self.collection.count()} embeddings")
+            count = await self._run(self.collection.count)
+            logger.info(f"ChromaDB initialized with {count} embeddings")
 
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
 
+    async def _run(self, method, *args, **kwargs):
+        """Call a ChromaDB client/collection method without blocking the event loop
+
+        AsyncHttpClient methods are awaited directly; the in-process client's
+        synchronous methods run in a worker thread.
+        """
+        if self.async_client:
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+
     def _get_sentence_transformer(self):
         """Lazy load sentence transformer as fallback"""
         if self._sentence_transformer is None:
             try:
                 from sentence_transformers import SentenceTransformer
-                self._sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
+                self._sentence_transformer = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL)
             except ImportError:
                 logger.error("sentence-transformers not available")
                 raise
         return self._sentence_transformer
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client for the Mistral API, so requests reuse pooled TLS connections"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                headers={"Authorization": f"Bearer {self.mistral_api_key}"}
+            )
+        return self._http
+
     async def _get_mistral_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings from Mistral API"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.mistral_url,
-                    headers={
-                        "Authorization": f"Bearer {self.mistral_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "mistral-embed",
-                        "input": texts
-                    },
-                    timeout=30.0
-                )
+        """Get embeddings from Mistral API
 
-                if response.status_code == 200:
-                    result = response.json()
-                    return [item["embedding"] for item in result["data"]]
-                else:
+        Texts are sent in chunks of MISTRAL_BATCH_SIZE, concurrently. If any chunk fails
+        the whole call returns None so callers never mix embedding models.
+        """
+        try:
+            client = self._get_http_client()
+            chunks = [texts[i:i + MISTRAL_BATCH_SIZE] for i in range(0, len(texts), MISTRAL_BATCH_SIZE)]
+            responses = await asyncio.gather(*(
+                client.post(self.mistral_url, json={"model": MISTRAL_EMBED_MODEL, "input": chunk})
+                for chunk in chunks
+            ), return_exceptions=True)
+
+            embeddings = []
+            for response in responses:
+                if isinstance(response, Exception):
+                    raise response
+                if response.status_code != 200:
                     logger.error(f"Mistral API error: {response.status_code}")
                     return None
+                embeddings.extend(item["embedding"] for item in response.json()["data"])
+            return embeddings
 
         except Exception as e:
             logger.error(f"Mistral embedding failed: {e}")
             return None
 
+    async def _get_sentence_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings from the local sentence-transformers model"""
+        model = self._get_sentence_transformer()
+        embeddings = await asyncio.to_thread(model.encode, texts, batch_size=64, convert_to_numpy=True)
+        return embeddings.tolist()
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Open the embedding cache on first use; embeddings are uncached if it can't be opened"""
+        if self._embedding_cache is None and not self._embedding_cache_failed:
+            try:
+                self._embedding_cache = EmbeddingCache(self.embedding_cache_path)
+            except Exception as e:
+                logger.warning(f"Embedding cache unavailable ({e}), embeddings will not be cached")
+                self._embedding_cache_failed = True
+        return self._embedding_cache
+
+    async def _cached_embeddings(self, model: str, texts: List[str], embed_fn) -> Optional[List[List[float]]]:
+        """
+        Embed texts with embed_fn, reusing stored vectors for texts this model has seen
+
+        Only the distinct uncached texts reach embed_fn. Returns None if embed_fn fails.
+        """
+        cache = self._get_embedding_cache()
+        if cache is None:
+            return await embed_fn(texts)
+
+        keys = [cache.make_key(model, text) for text in texts]
+        found = await asyncio.to_thread(cache.get_many, keys)
+
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        if missing:
+            embeddings = await embed_fn(list(missing.values()))
+            if not embeddings:
+                return None
+            fresh = dict(zip(missing, embeddings))
+            await asyncio.to_thread(cache.put_many, fresh)
+            found.update(fresh)
+
+        return [found[key] for key in keys]
+
     async def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Get embeddings using Mistral API or fallback"""
         if self.use_mistral:
-            embeddings = await self._get_mistral_embeddings(texts)
+            embeddings = await self._cached_embeddings(MISTRAL_EMBED_MODEL, texts, self._get_mistral_embeddings)
             if embeddings:
                 return embeddings
 
-        # Fallback to sentence transformers
+        # Fallback to sentence transformers (re-embeds every text, so models never mix)
         logger.info("Using sentence-transformers fallback")
-        model = self._get_sentence_transformer()
-        return model.encode(texts).tolist()
+        return await self._cached_embeddings(SENTENCE_TRANSFORMER_MODEL, texts, self._get_sentence_embeddings)
 
     def _create_profile_summary(self, profile_data: Dict[str, Any]) -> str:
         """Create comprehensive profile summary for embedding"""
@@ -191,21 +368,25 @@ class VectorStore:
                     "timestamp": profile.get('timestamp', ''),
                     "latitude": float(profile.get('latitude', 0.0)),
                     "longitude": float(profile.get('longitude', 0.0)),
-                    "region": profile.get('region', 'unknown'),
-                    "season": profile.get('season', 'unknown'),
+                    # Canonicalized to lowercase once here so filters and matches compare directly
+                    "region": profile.get('region', 'unknown').lower(),
+                    "season": profile.get('season', 'unknown').lower(),
                     "parameters": json.dumps(profile.get('parameters', [])),
-                    "added_at": datetime.now().isoformat()
+                    "added_at": datetime.now().isoformat(),
+                    **parameter_flags(profile.get('parameters', []))
                 })
 
                 documents.append(summaries[i])
 
             # Add to collection
-            self.collection.add(
+            await self._run(
+                self.collection.add,
                 embeddings=embeddings,
                 documents=documents,
                 metadatas=metadatas,
                 ids=ids
             )
+            self._notify_change(ids)
 
             logger.info(f"Added {len(profiles)} profiles to vector store")
             return True
@@ -214,63 +395,145 @@ class VectorStore:
             logger.error(f"Failed to add profiles to vector store: {e}")
             return False
 
+    async def backfill_parameter_flags(self) -> int:
+        """
+        Add has_<PARAM> keys to profiles ingested before add_profiles wrote them
+
+        Parameter-filtered searches match on these keys only, so a collection
+        ingested earlier returns nothing for them until it is backfilled (or
+        re-ingested). Profiles that already carry their keys are left alone, so
+        this is safe to re-run.
+
+        Returns:
+            Number of profiles updated
+        """
+        if not self.collection:
+            await self.initialize()
+
+        updated = []
+        offset = 0
+        while True:
+            page = await self._run(
+                self.collection.get, include=["metadatas"], limit=BACKFILL_BATCH_SIZE, offset=offset
+            )
+            if not page["ids"]:
+                break
+            offset += len(page["ids"])
+
+            ids, metadatas = [], []
+            for profile_id, metadata in zip(page["ids"], page["metadatas"]):
+                flags = stale_parameter_flags(metadata)
+                if flags:
+                    ids.append(profile_id)
+                    metadatas.append({**metadata, **flags})
+            if ids:
+                await self._run(self.collection.update, ids=ids, metadatas=metadatas)
+                updated.extend(ids)
+
+        if updated:
+            self._notify_change(updated)
+        logger.info(f"Backfilled parameter flags on {len(updated)} profiles")
+        return len(updated)
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Get the embedding vector for a single search query"""
+        return await self._embed_batcher.embed(query)
+
     async def semantic_search(
         self,
         query: str,
         limit: int = 10,
-        where_filters: Optional[Dict[str, Any]] = None
+        where_filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        distance_threshold: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """Perform semantic search with optional metadata filtering"""
+        results = await self.batch_search(
+            queries=[query],
+            limit=limit,
+            where_filters=where_filters,
+            query_embeddings=[query_embedding],
+            distance_threshold=distance_threshold
+        )
+        return results[0]
+
+    async def batch_search(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        where_filters: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[Optional[List[float]]]] = None,
+        distance_threshold: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several semantic searches sharing the same filters in one ChromaDB query
+
+        Matches farther than distance_threshold are dropped before formatting.
+        """
         if not self.collection:
             await self.initialize()
 
         try:
-            # Get query embedding
-            query_embeddings = await self._get_embeddings([query])
+            # Embed only the queries the caller didn't already embed
+            embeddings = list(query_embeddings) if query_embeddings else [None] * len(queries)
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            if missing:
+                computed = await asyncio.gather(*(self._embed_batcher.embed(queries[i]) for i in missing))
+                for i, embedding in zip(missing, computed):
+                    embeddings[i] = embedding
 
             # Search in ChromaDB
-            results = self.collection.query(
-                query_embeddings=query_embeddings,
+            results = await self._run(
+                self.collection.query,
+                query_embeddings=embeddings,
                 n_results=limit,
                 where=where_filters
             )
 
-            # Format results
-            matches = []
-            for i in range(len(results['ids'][0])):
-                matches.append({
-                    "profile_id": results['ids'][0][i],
-                    "similarity": 1 - results['distances'][0][i],  # Convert distance to similarity
-                    "metadata": results['metadatas'][0][i],
-                    "summary": results['documents'][0][i]
-                })
-
-            return matches
+            # Format results, one match list per query
+            batch_matches = []
+            for q in range(len(queries)):
+                matches = []
+                for i in range(len(results['ids'][q])):
+                    distance = results['distances'][q][i]
+                    # ChromaDB returns matches nearest-first, so stop at the first one too far away
+                    if distance_threshold is not None and distance > distance_threshold:
+                        break
+                    matches.append({
+                        "profile_id": results['ids'][q][i],
+                        "similarity": 1 - distance,  # Convert distance to similarity
+                        "metadata": results['metadatas'][q][i],
+                        "summary": results['documents'][q][i]
+                    })
+                batch_matches.append(matches)
+
+            return batch_matches
 
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
-            return []
+            return [[] for _ in queries]
 
     async def find_similar_profiles(
         self,
         profile_id: str,
         similarity_threshold: float = 0.7,
-        limit: int = 10
+        limit: int = 10,
+        exclude_ids: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Find profiles similar to a given profile"""
+        """Find profiles similar to a given profile, skipping any in exclude_ids"""
         if not self.collection:
             await self.initialize()
 
         try:
             # Get the target profile's embedding
-            result = self.collection.get(ids=[profile_id])
+            result = await self._run(self.collection.get, ids=[profile_id])
             if not result['documents']:
                 return []
 
             # Use the profile's document text for similarity search
             return await self.semantic_search(
                 query=result['documents'][0],
-                limit=limit + 1  # +1 to exclude the original profile
+                limit=limit,
+                where_filters={"profile_id": {"$nin": exclude_ids}} if exclude_ids else None
             )
 
         except Exception as e:
@@ -283,7 +546,7 @@ class VectorStore:
             await self.initialize()
 
         try:
-            count = self.collection.count()
+            count = await self._run(self.collection.count)
             return {
                 "status": "active",
                 "total_embeddings": count,
@@ -298,11 +561,13 @@ class VectorStore:
         """Reset the vector store collection"""
         try:
             if self.collection:
-                self.client.delete_collection("argo_profiles")
-                self.collection = self.client.create_collection(
+                await self._run(self.client.delete_collection, "argo_profiles")
+                self.collection = await self._run(
+                    self.client.create_collection,
                     name="argo_profiles",
                     metadata={"description": "ARGO profile metadata and summaries"}
                 )
+            self._notify_change([])
             logger.info("Vector store collection reset")
             return True
         except Exception as e:
@@ -314,10 +579,46 @@ class VectorStore:
 _vector_store = None
 
 
-async def get_vector_store() -> VectorStore:
-    """Get or create the global vector store instance"""
+async def get_vector_store(quantization: Optional[str] = None) -> VectorStore:
+    """Get or create the global vector store instance
+
+    quantization ("pq8", "sq8" or "none") selects the FAISS index encoding; it
+    only applies to the FAISS backend and only when the store is first created.
+    """
     global _vector_store
     if _vector_store is None:
-        _vector_store = VectorStore()
+        backend = os.getenv("VECTOR_STORE_BACKEND", "chroma").lower()
+        quantization = quantization or os.getenv("VECTOR_STORE_QUANTIZATION") or None
+        if backend == "faiss":
+            try:
+                from .faiss_store import FaissVectorStore
+                _vector_store = FaissVectorStore(quantization=quantization)
+            except ImportError as e:
+                logger.warning(f"FAISS backend unavailable ({e}), falling back to ChromaDB")
+        if _vector_store is None:
+            _vector_store = VectorStore()
         await _vector_store.initialize()
-    return _vector_store
\ No newline at end of file
+    return _vector_store
+
+
+async def main():
+    """Main function for CLI usage"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain the ARGO profile vector store")
+    parser.add_argument(
+        'command',
+        choices=['backfill-parameter-flags'],
+        help='Command to execute'
+    )
+
+    args = parser.parse_args()
+    vector_store = await get_vector_store()
+
+    if args.command == 'backfill-parameter-flags':
+        updated = await vector_store.backfill_parameter_flags()
+        print(f"Added has_<PARAM> keys to {updated} profiles")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
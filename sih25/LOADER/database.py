@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 from pathlib import Path
 
 import asyncpg
+import numpy as np
 from prefect import get_run_logger
 
 # Load environment variables from .env file
@@ -176,6 +177,88 @@ class DatabaseManager:
 
         raise last_exception
 
+    async def fetch_stream_with_retry(
+        self, query: str, *args, prefetch: int = 64, max_retries: int = 3
+    ) -> AsyncGenerator[asyncpg.Record, None]:
+        """Stream query results through a server-side cursor with retry logic
+
+        Only failures before the first row is yielded are retried, so callers
+        never see duplicate rows.
+        """
+        last_exception = None
+
+        for attempt in range(max_retries):
+            yielded = False
+            try:
+                async with self.get_transaction() as conn:
+                    async for record in conn.cursor(query, *args, prefetch=prefetch):
+                        yielded = True
+                        yield record
+                return
+            except Exception as e:
+                if yielded:
+                    raise
+                last_exception = e
+                self.logger.warning(f"Query stream attempt {attempt + 1} failed: {e}")
+
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(0.5 * (2 ** attempt))  # Exponential backoff
+
+        raise last_exception
+
+    async def copy_query_to_numpy(
+        self, query: str, *args, columns: Dict[str, str], max_retries: int = 3
+    ) -> Dict[str, np.ndarray]:
+        """Fetch fixed-width columns through binary COPY straight into NumPy arrays
+
+        Args:
+            query: SELECT returning exactly `columns`, in order. Nullable columns
+                must be wrapped in COALESCE since NULLs break the fixed row width.
+            columns: Ordered mapping of column name to NumPy dtype matching the
+                Postgres type ('f8' for FLOAT, 'i4' for INTEGER, 'i2' for SMALLINT)
+
+        Returns:
+            Dict of column name to native-endian NumPy array
+        """
+        last_exception = None
+
+        for attempt in range(max_retries):
+            chunks = []
+
+            async def collect(data: bytes) -> None:
+                chunks.append(data)
+
+            try:
+                async with self.get_connection() as conn:
+                    await conn.copy_from_query(query, *args, output=collect, format='binary')
+                break
+            except Exception as e:
+                last_exception = e
+                self.logger.warning(f"Binary COPY attempt {attempt + 1} failed: {e}")
+
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(0.5 * (2 ** attempt))  # Exponential backoff
+        else:
+            raise last_exception
+
+        buffer = b"".join(chunks)
+
+        # Header: 11-byte signature, int32 flags, int32 extension length; trailer: int16 -1
+        extension_length = int.from_bytes(buffer[15:19], "big")
+        body = memoryview(buffer)[19 + extension_length:-2]
+
+        # Every tuple is an int16 field count followed by (int32 length, value) per column
+        fields = [("field_count", ">i2")]
+        for name, dtype in columns.items():
+            fields.extend([(f"{name}_length", ">i4"), (name, ">" + dtype)])
+        row_dtype = np.dtype(fields)
+
+        if len(body) % row_dtype.itemsize:
+            raise ValueError("Binary COPY result has NULL or variable-width columns")
+
+        rows = np.frombuffer(body, dtype=row_dtype)
+        return {name: rows[name].astype(dtype) for name, dtype in columns.items()}
+
     async def create_tables_if_not_exist(self) -> None:
         """Create the three-table schema if it doesn't exist"""
         create_floats_table = """